@@ -0,0 +1,49 @@
+# arrow_client.py
+"""
+Client side of POST /predict/arrow.
+
+    from arrow_client import predict_arrow
+    results, model_version = predict_arrow("http://localhost:8000", df)
+    df["predicted_price"] = results.column("predicted_price").to_numpy(zero_copy_only=False)
+
+`rows` can be a pandas DataFrame, a pyarrow Table or a list of /predict dicts,
+with one column per /predict field. The results come back as a pyarrow Table
+(predicted_price, lower, upper, error), one row per input row in order.
+"""
+import httpx
+import pyarrow as pa
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+
+def to_table(rows):
+    if isinstance(rows, pa.Table):
+        return rows
+    if isinstance(rows, list):
+        return pa.Table.from_pylist(rows)
+    return pa.Table.from_pandas(rows, preserve_index=False)
+
+
+def encode_request(rows):
+    """Arrow IPC stream body for a batch of rows."""
+    table = to_table(rows)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def decode_response(content):
+    return pa.ipc.open_stream(pa.py_buffer(content)).read_all()
+
+
+def predict_arrow(url, rows, client=None, timeout=60.0):
+    """Score rows through /predict/arrow. Returns (results table, model version)."""
+    body = encode_request(rows)
+    headers = {"Content-Type": ARROW_STREAM}
+    if client is None:
+        response = httpx.post(f"{url}/predict/arrow", content=body, headers=headers, timeout=timeout)
+    else:
+        response = client.post(f"{url}/predict/arrow", content=body, headers=headers, timeout=timeout)
+    response.raise_for_status()
+    return decode_response(response.content), response.headers.get("X-Model-Version")
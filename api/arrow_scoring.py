@@ -0,0 +1,120 @@
+# arrow_scoring.py
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+# Input columns and the types they are cast to; casts are "safe", so 1990.5 is not a build_year
+NUMERIC_COLUMNS = {
+    "build_year": pa.int64(),
+    "size_sqft": pa.float64(),
+    "n_bedrooms": pa.int64(),
+    "n_bathrooms": pa.int64(),
+}
+CATEGORICAL_COLUMNS = ["area", "district", "region", "n_rooms"]
+
+RESULT_SCHEMA = pa.schema([
+    ("predicted_price", pa.float64()),
+    ("lower", pa.float64()),
+    ("upper", pa.float64()),
+    ("error", pa.string()),
+])
+
+
+class ArrowInputError(ValueError):
+    """The Arrow body can't be scored at all: malformed stream, missing column or uncastable type."""
+
+
+def is_arrow(content_type):
+    return (content_type or "").split(";")[0].strip().lower() == ARROW_STREAM
+
+
+def read_table(body):
+    """Table from an Arrow IPC stream body; the column buffers point into body, nothing is copied."""
+    try:
+        return pa.ipc.open_stream(pa.py_buffer(body)).read_all()
+    except (pa.ArrowInvalid, OSError) as e:
+        raise ArrowInputError(f"Malformed Arrow IPC stream: {e}") from e
+
+
+def check_columns(table):
+    missing = [name for name in [*NUMERIC_COLUMNS, *CATEGORICAL_COLUMNS] if name not in table.column_names]
+    if missing:
+        raise ArrowInputError(f"Missing column(s): {', '.join(missing)}")
+
+
+def null_errors(table):
+    """
+    Boolean mask of complete rows, and an error message per row (None where
+    complete), or errors=None when every row is complete.
+    """
+    valid = np.ones(table.num_rows, dtype=bool)
+    missing = {}
+    for name in [*NUMERIC_COLUMNS, *CATEGORICAL_COLUMNS]:
+        column = table.column(name)
+        if column.null_count:
+            is_null = column.is_null().to_numpy(zero_copy_only=False)
+            valid &= ~is_null
+            missing[name] = is_null
+    if not missing:
+        return valid, None
+    errors = [None] * table.num_rows
+    for row in np.flatnonzero(~valid):
+        fields = [name for name, is_null in missing.items() if is_null[row]]
+        errors[row] = f"Missing value for {', '.join(fields)}"
+    return valid, errors
+
+
+def _single_array(column):
+    return column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+
+
+def encoder_columns(table):
+    """
+    The columns FeatureEncoder.encode_columns takes, from a table with no nulls.
+    Numeric columns come out as numpy views of the Arrow buffers when they already
+    have the target type; categoricals are dictionary-encoded by Arrow, so only
+    the distinct values ever become Python strings.
+    """
+    # Chunks of a dictionary column can carry different dictionaries; give them one each
+    table = table.unify_dictionaries()
+    columns = {}
+    for name, target in NUMERIC_COLUMNS.items():
+        try:
+            array = _single_array(pc.cast(table.column(name), target))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise ArrowInputError(f"Column '{name}' can't be read as {target}: {e}") from e
+        columns[name] = array.to_numpy(zero_copy_only=False)
+    for name in CATEGORICAL_COLUMNS:
+        array = _single_array(table.column(name))
+        if not pa.types.is_dictionary(array.type):
+            try:
+                array = pc.dictionary_encode(pc.cast(array, pa.string()))
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                raise ArrowInputError(f"Column '{name}' can't be read as string: {e}") from e
+        columns[name] = (array.indices.to_numpy(zero_copy_only=False), array.dictionary.to_pylist())
+    return columns
+
+
+def result_table(predictions, valid, errors):
+    """
+    One result row per input row, in input order; failed rows have null prices and an error.
+    Prices and bounds are rounded to cents like the JSON endpoints.
+    """
+    prices = np.zeros(len(valid), dtype=np.float64)
+    prices[valid] = predictions
+    mask = ~valid
+    return pa.Table.from_arrays([
+        pa.array(np.round(prices, 2), mask=mask),
+        pa.array(np.round(prices * 0.95, 2), mask=mask),
+        pa.array(np.round(prices * 1.05, 2), mask=mask),
+        pa.nulls(len(valid), pa.string()) if errors is None else pa.array(errors, type=pa.string()),
+    ], schema=RESULT_SCHEMA)
+
+
+def write_table(table):
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return memoryview(sink.getvalue())
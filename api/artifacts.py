@@ -0,0 +1,295 @@
+# artifacts.py
+import hashlib
+import io
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+
+from encoder import FeatureEncoder, ONE_HOT_COLS, CENTRAL_AREAS, MATURE_TOWNS
+
+MODEL_NAME = "lightgbm_model"
+TRACKING_URI = os.environ.get("MLFLOW_TRACKING_URI", "http://127.0.0.1:5000")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SELECTED_FEATURES_PATH = os.path.join(BASE_DIR, "models_dump_for_Registry/selected_features.joblib")
+SCALER_PATH = os.path.join(BASE_DIR, "models_dump_for_Registry/scaler.joblib")
+
+# Local model bundle (see model_bundle.py) to serve instead of the registry. When
+# set, the API never imports mlflow or contacts the tracking server.
+MODEL_BUNDLE_DIR = os.environ.get("MODEL_BUNDLE_DIR")
+
+
+def _mlflow(tracking_uri):
+    # Imported on first registry access only: mlflow adds seconds to cold start
+    import mlflow.artifacts
+    import mlflow.pyfunc
+
+    mlflow.set_tracking_uri(tracking_uri)
+    return mlflow
+
+
+def read_files(*paths):
+    """Raw bytes of each file, read once so checksum and load see the same content."""
+    contents = []
+    for path in paths:
+        with open(path, "rb") as f:
+            contents.append(f.read())
+    return contents
+
+
+def checksum(*contents):
+    """sha256 over the given byte strings, in order."""
+    digest = hashlib.sha256()
+    for content in contents:
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def native_booster(model):
+    """
+    Underlying lightgbm.Booster of a pyfunc model logged with mlflow.lightgbm
+    (as models/alternative_model_2.py does), or None for any other flavor.
+    """
+    if "lightgbm" not in model.metadata.flavors:
+        return None
+    raw_model = model.get_raw_model()
+    return getattr(raw_model, "booster_", raw_model)
+
+
+def run_compiled_model(mlflow, model_uri, booster):
+    """
+    The compiled model logged next to a runs:/ model by register_best_model.py,
+    or None if there is none or it can't be used here.
+    """
+    if booster is None or not model_uri.startswith("runs:/"):
+        return None
+    from compiled_model import load_compiled
+
+    run_id = model_uri[len("runs:/"):].split("/")[0]
+    try:
+        path = mlflow.artifacts.download_artifacts(artifact_uri=f"runs:/{run_id}/compiled")
+    except Exception:
+        return None
+    return load_compiled(path, booster)
+
+
+class ArtifactsNotLoadedError(RuntimeError):
+    """No model has been loaded yet (e.g. the registry has not been reachable since startup)."""
+
+
+class ModelArtifacts:
+    """
+    One consistent snapshot of everything needed to serve a prediction.
+
+    Instances are never mutated after construction: a reload builds a new
+    snapshot and swaps the reference, so a request that grabbed a snapshot
+    keeps using the same model, scaler, feature list and encoder throughout.
+    """
+
+    def __init__(self, version, checksum, model_uri, model, scaler, selected_features, compiled=None):
+        self.version = version
+        self.checksum = checksum
+        self.model_uri = model_uri
+        self.model = model
+        self.scaler = scaler
+        self.selected_features = list(selected_features)
+        # StandardScaler as a precomputed affine step on contiguous arrays
+        self.scaler_mean = np.ascontiguousarray(scaler.mean_, dtype=np.float64)
+        self.scaler_scale = np.ascontiguousarray(scaler.scale_, dtype=np.float64)
+        # Native LightGBM booster for the fast path; None means pyfunc only
+        self.booster = native_booster(model)
+        # compiled_model.CompiledModel of the booster, preferred over it when present
+        self.compiled = compiled
+        self.encoder = FeatureEncoder(self.selected_features, ONE_HOT_COLS, CENTRAL_AREAS, MATURE_TOWNS)
+        self.loaded_at = time.time()
+
+    @property
+    def key(self):
+        return (self.version, self.checksum)
+
+
+class ArtifactCache:
+    """
+    Process-wide cache of ModelArtifacts keyed by (registry version, file checksum).
+
+    get() only returns the current snapshot; disk and registry access happen in
+    refresh(), which is meant to be called at startup or from a background
+    refresher (registry_poller.RegistryPoller), never per request.
+
+    If set, warmup(artifacts) is run on every new snapshot before it is swapped
+    in, so the first requests on a new model don't pay for lazy initialisation.
+    `ready` is True once the current snapshot has been through it.
+
+    With bundle_dir set, the first refresh() loads that local bundle instead of
+    the registry and pins it.
+    """
+
+    def __init__(self, model_name=MODEL_NAME, tracking_uri=TRACKING_URI,
+                 selected_features_path=SELECTED_FEATURES_PATH, scaler_path=SCALER_PATH, warmup=None,
+                 bundle_dir=MODEL_BUNDLE_DIR):
+        self.model_name = model_name
+        self.tracking_uri = tracking_uri
+        self.bundle_dir = bundle_dir
+        self.selected_features_path = selected_features_path
+        self.scaler_path = scaler_path
+        self.warmup = warmup
+        self.warmup_seconds = None
+        self._warmed_key = None
+        self._current = None
+        self._pinned = False
+        self._loaded = threading.Event()
+        self._lock = threading.Lock()
+
+    def get(self, wait=None):
+        """
+        Current snapshot. If nothing is loaded yet: with wait=None, load it inline
+        (scripts and tests); otherwise wait up to `wait` seconds for a background
+        refresh and raise ArtifactsNotLoadedError if none arrives.
+        """
+        current = self._current
+        if current is None:
+            if wait is None:
+                self.refresh()
+            elif not self._loaded.wait(wait):
+                raise ArtifactsNotLoadedError(f"Model '{self.model_name}' is not loaded yet")
+            current = self._current
+        return current
+
+    @property
+    def current(self):
+        """Current snapshot, or None if nothing has loaded yet. Never loads."""
+        return self._current
+
+    @property
+    def loaded(self):
+        return self._current is not None
+
+    @property
+    def ready(self):
+        """A snapshot is loaded and was warmed up before it was swapped in."""
+        current = self._current
+        return current is not None and current.key == self._warmed_key
+
+    @property
+    def pinned(self):
+        return self._pinned
+
+    def install(self, artifacts, pin=True):
+        """
+        Swap in a snapshot built elsewhere (e.g. a stub model for offline
+        benchmarks). While pinned, refresh() leaves it in place and never
+        contacts the registry.
+        """
+        with self._lock:
+            self._warm_up(artifacts)
+            self._current = artifacts
+            self._pinned = pin
+            self._loaded.set()
+
+    def latest_version(self):
+        """Highest registered version of the model and its runs:/ URI."""
+        versions = _mlflow(self.tracking_uri).MlflowClient().search_model_versions(f"name='{self.model_name}'")
+        if not versions:
+            raise ValueError(f"No model versions found for model '{self.model_name}'.")
+        latest = sorted(versions, key=lambda v: int(v.version), reverse=True)[0]
+        return latest.version, f"runs:/{latest.run_id}/{latest.source.split('/')[-1]}"
+
+    def version_uri(self, version):
+        """runs:/ URI of one registered version of the model."""
+        found = _mlflow(self.tracking_uri).MlflowClient().get_model_version(self.model_name, str(version))
+        return f"runs:/{found.run_id}/{found.source.split('/')[-1]}"
+
+    def load(self, version, model_uri):
+        """
+        Build a snapshot of one registry version with the current local files,
+        without installing it (e.g. batch scoring pinned to a single version).
+        """
+        mlflow = _mlflow(self.tracking_uri)
+        model = mlflow.pyfunc.load_model(model_uri)
+        features_bytes, scaler_bytes = read_files(self.selected_features_path, self.scaler_path)
+        return ModelArtifacts(
+            version=version,
+            checksum=checksum(features_bytes, scaler_bytes),
+            model_uri=model_uri,
+            model=model,
+            scaler=joblib.load(io.BytesIO(scaler_bytes)),
+            selected_features=joblib.load(io.BytesIO(features_bytes)),
+            compiled=run_compiled_model(mlflow, model_uri, native_booster(model)),
+        )
+
+    def refresh(self, force=False):
+        """
+        Reload artifacts if the registry version or the joblib files changed.
+
+        Returns True if a new snapshot was swapped in. Concurrent callers are
+        serialised; readers are never blocked and see either the old or the new
+        snapshot, never a mix of both.
+        """
+        with self._lock:
+            if self._pinned:
+                return False
+            if self.bundle_dir:
+                return self._load_bundle()
+            version, model_uri = self.latest_version()
+            features_bytes, scaler_bytes = read_files(self.selected_features_path, self.scaler_path)
+            files_checksum = checksum(features_bytes, scaler_bytes)
+            current = self._current
+            if current is not None and current.key == (version, files_checksum) and not force:
+                return False
+
+            # Reuse the loaded model when only the local files changed
+            if current is not None and current.version == version and not force:
+                model, compiled = current.model, current.compiled
+            else:
+                mlflow = _mlflow(self.tracking_uri)
+                model = mlflow.pyfunc.load_model(model_uri)
+                compiled = run_compiled_model(mlflow, model_uri, native_booster(model))
+
+            candidate = ModelArtifacts(
+                version=version,
+                checksum=files_checksum,
+                model_uri=model_uri,
+                model=model,
+                scaler=joblib.load(io.BytesIO(scaler_bytes)),
+                selected_features=joblib.load(io.BytesIO(features_bytes)),
+                compiled=compiled,
+            )
+            self._warm_up(candidate)
+
+            # Single reference assignment: readers see the old or the new snapshot
+            self._current = candidate
+            self._loaded.set()
+            print(f"✅ Loaded '{self.model_name}' version {version} (artifacts {files_checksum[:12]}"
+                  f"{', compiled' if compiled is not None else ''})")
+            return True
+
+    def _warm_up(self, candidate):
+        # Raises on failure, before the candidate is swapped in: the cache keeps serving (or waiting
+        # for) the previous snapshot
+        if self.warmup is not None:
+            start = time.perf_counter()
+            self.warmup(candidate)
+            self.warmup_seconds = time.perf_counter() - start
+        self._warmed_key = candidate.key
+
+    def _load_bundle(self):
+        from model_bundle import load_bundle
+
+        candidate = load_bundle(self.bundle_dir)
+        self._warm_up(candidate)
+        self._current = candidate
+        self._pinned = True
+        self._loaded.set()
+        print(f"✅ Loaded '{self.model_name}' version {candidate.version} from bundle {candidate.model_uri}")
+        return True
+
+
+artifact_cache = ArtifactCache()
+
+
+def get_artifacts(wait=None):
+    """Current ModelArtifacts snapshot shared by preprocessing and predictor."""
+    return artifact_cache.get(wait)
@@ -0,0 +1,253 @@
+# batch_score.py
+"""
+Re-score every listing in housing_data with one registered model version and
+write the results to the predictions table:
+
+    cd api && python batch_score.py                      # latest version, all cores
+    cd api && python batch_score.py --model-version 3 --workers 4 --chunk-rows 5000
+    cd api && python batch_score.py --rescore            # ignore earlier progress
+
+housing_data is split into chunks of --chunk-rows rows in key order. Worker
+processes each load the model once, then read, encode and score whole chunks
+and write each chunk's predictions together with its prediction_chunks
+checkpoint row in one transaction. A rerun for the same version skips the
+chunks already recorded there, so an interrupted run resumes where it stopped.
+"""
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import mysql.connector
+
+from artifacts import artifact_cache
+from predictor import predict_encoded, warm_up
+
+TARGET_DB_CONFIG = {
+    "host": "localhost",
+    "user": "root",
+    "password": "root",
+    "database": "housing_db",
+    "port": 3307  # Specify the port if it's different from the default
+}
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PREDICTIONS_DDL_PATH = os.path.join(ROOT_DIR, 'housing_loader_package', 'create_predictions_table.sql')
+
+# housing_data columns the encoder needs (same fields as the API's InputData)
+INPUT_FIELDS = ["build_year", "size_sqft", "n_bedrooms", "n_bathrooms", "area", "district", "region", "n_rooms"]
+
+CHUNK_BOUNDS_SQL = (
+    "SELECT MIN(id), MAX(id) FROM "
+    "(SELECT id FROM housing_data WHERE id > %s ORDER BY id LIMIT %s) AS chunk"
+)
+SELECT_CHUNK_SQL = (
+    f"SELECT id, {', '.join(INPUT_FIELDS)} FROM housing_data "
+    f"WHERE id >= %s AND id <= %s ORDER BY id"
+)
+INSERT_PREDICTIONS_SQL = (
+    "INSERT INTO predictions (housing_id, model_version, predicted_price, scored_at) "
+    "VALUES (%s, %s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE predicted_price = VALUES(predicted_price), scored_at = VALUES(scored_at)"
+)
+INSERT_CHUNK_SQL = (
+    "INSERT INTO prediction_chunks (model_version, first_id, last_id, scored, skipped, completed_at) "
+    "VALUES (%s, %s, %s, %s, %s, %s) "
+    "ON DUPLICATE KEY UPDATE last_id = VALUES(last_id), scored = VALUES(scored), "
+    "skipped = VALUES(skipped), completed_at = VALUES(completed_at)"
+)
+
+
+class MySQLScoringStore:
+    """
+    housing_data reads and predictions writes for batch scoring. Picklable: the
+    connection is opened lazily and never pickled, so each worker process
+    opens its own.
+    """
+
+    def __init__(self, db_config=TARGET_DB_CONFIG, ddl_path=PREDICTIONS_DDL_PATH):
+        self.db_config = db_config
+        self.ddl_path = ddl_path
+        self._connection = None
+
+    def __getstate__(self):
+        return {"db_config": self.db_config, "ddl_path": self.ddl_path, "_connection": None}
+
+    def connection(self):
+        if self._connection is None or not self._connection.is_connected():
+            self._connection = mysql.connector.connect(**self.db_config)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def ensure_tables(self):
+        with open(self.ddl_path) as f:
+            statements = [s.strip() for s in f.read().split(";") if s.strip()]
+        connection = self.connection()
+        cursor = connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        connection.commit()
+        cursor.close()
+
+    def plan_chunks(self, chunk_rows):
+        """(first_id, last_id) ranges of chunk_rows rows each, walked along the primary key."""
+        cursor = self.connection().cursor()
+        chunks, after = [], 0
+        while True:
+            # Boundaries only: an index-only range scan, no row data leaves the server
+            cursor.execute(CHUNK_BOUNDS_SQL, (after, chunk_rows))
+            first_id, last_id = cursor.fetchone()
+            if first_id is None:
+                break
+            chunks.append((first_id, last_id))
+            after = last_id
+        cursor.close()
+        return chunks
+
+    def completed_chunks(self, model_version):
+        cursor = self.connection().cursor()
+        cursor.execute("SELECT first_id, last_id FROM prediction_chunks WHERE model_version = %s", (model_version,))
+        found = [tuple(row) for row in cursor.fetchall()]
+        cursor.close()
+        return found
+
+    def reset(self, model_version):
+        """Forget recorded progress for a version (its predictions are overwritten on rescore)."""
+        connection = self.connection()
+        cursor = connection.cursor()
+        cursor.execute("DELETE FROM prediction_chunks WHERE model_version = %s", (model_version,))
+        connection.commit()
+        cursor.close()
+
+    def read_chunk(self, first_id, last_id):
+        cursor = self.connection().cursor(dictionary=True)
+        cursor.execute(SELECT_CHUNK_SQL, (first_id, last_id))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+
+    def write_chunk(self, model_version, first_id, last_id, predictions, skipped):
+        """Predictions and the chunk's checkpoint row, committed together."""
+        connection = self.connection()
+        cursor = connection.cursor()
+        try:
+            if predictions:
+                cursor.executemany(INSERT_PREDICTIONS_SQL, predictions)
+            cursor.execute(INSERT_CHUNK_SQL, (model_version, first_id, last_id, len(predictions), skipped,
+                                              datetime.now()))
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+
+def pending_chunks(chunks, completed):
+    """Chunks not already covered by a completed range (a changed --chunk-rows still resumes)."""
+    return [(first, last) for first, last in chunks
+            if not any(done_first <= first and last <= done_last for done_first, done_last in completed)]
+
+
+# Per-process state, set once by init_worker
+_worker = {}
+
+
+def init_worker(store, version, model_uri, artifacts=None):
+    """Load and warm the model once per worker process."""
+    if artifacts is None:
+        artifacts = artifact_cache.load(version, model_uri)
+        warm_up(artifacts)
+    _worker["store"] = store
+    _worker["artifacts"] = artifacts
+
+
+def score_chunk(first_id, last_id):
+    """Read, encode, score and write one chunk. Rows with a NULL input field are skipped."""
+    store, artifacts = _worker["store"], _worker["artifacts"]
+    rows = store.read_chunk(first_id, last_id)
+    inputs = [row for row in rows if all(row[field] is not None for field in INPUT_FIELDS)]
+    skipped = len(rows) - len(inputs)
+
+    predictions = []
+    if inputs:
+        prices = predict_encoded(artifacts.encoder.encode_batch(inputs), artifacts)
+        scored_at = datetime.now()
+        predictions = [(row["id"], artifacts.version, float(price), scored_at) for row, price in zip(inputs, prices)]
+    store.write_chunk(artifacts.version, first_id, last_id, predictions, skipped)
+    return first_id, last_id, len(predictions), skipped
+
+
+def score_table(store, version, model_uri=None, chunk_rows=5000, workers=1, rescore=False, artifacts=None):
+    """
+    Score every pending chunk of housing_data with one model version. workers=1
+    scores in this process (artifacts may then be passed in directly); more
+    workers use a process pool. Returns a summary dict.
+
+    The pool spawns its workers rather than forking them: a forked child would
+    inherit the planning connection's socket (initargs are not pickled under
+    fork) and LightGBM's OpenMP state, which can deadlock after a fork. The
+    planning connection is closed first, as workers open their own.
+    """
+    start = time.perf_counter()
+    store.ensure_tables()
+    if rescore:
+        store.reset(version)
+    chunks = store.plan_chunks(chunk_rows)
+    todo = pending_chunks(chunks, store.completed_chunks(version))
+    print(f"Scoring housing_data with version {version}: {len(todo)} of {len(chunks)} chunks to do")
+
+    summary = {"model_version": version, "chunks": len(chunks), "resumed_chunks": len(chunks) - len(todo),
+               "scored": 0, "skipped": 0}
+
+    def record(first_id, last_id, scored, skipped):
+        summary["scored"] += scored
+        summary["skipped"] += skipped
+        print(f"✅ Rows {first_id}-{last_id}: {scored} scored, {skipped} skipped")
+
+    if workers <= 1:
+        init_worker(store, version, model_uri, artifacts)
+        for first_id, last_id in todo:
+            record(*score_chunk(first_id, last_id))
+    elif todo:
+        store.close()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=init_worker, initargs=(store, version, model_uri)) as pool:
+            futures = [pool.submit(score_chunk, first_id, last_id) for first_id, last_id in todo]
+            for future in as_completed(futures):
+                record(*future.result())
+
+    summary["duration_s"] = round(time.perf_counter() - start, 3)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-version", help="Registered version to score with; default the latest")
+    parser.add_argument("--chunk-rows", type=int, default=5000, help="housing_data rows per chunk")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Scoring processes")
+    parser.add_argument("--rescore", action="store_true", help="Ignore recorded progress for this version")
+    args = parser.parse_args()
+
+    if args.model_version:
+        version, model_uri = args.model_version, artifact_cache.version_uri(args.model_version)
+    else:
+        version, model_uri = artifact_cache.latest_version()
+
+    try:
+        summary = score_table(MySQLScoringStore(), version, model_uri, args.chunk_rows, args.workers, args.rescore)
+    except mysql.connector.Error as e:
+        print(f"❌ Batch scoring failed: {e}")
+        raise SystemExit(1)
+    print(f"Done in {summary['duration_s']}s: {summary['scored']} scored, {summary['skipped']} skipped, "
+          f"{summary['resumed_chunks']} chunks already done")
+
+
+if __name__ == "__main__":
+    main()
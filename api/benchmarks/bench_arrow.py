@@ -0,0 +1,107 @@
+# benchmarks/bench_arrow.py
+"""
+End-to-end batch scoring over JSON (/predict/batch) against Arrow IPC
+(/predict/arrow), for several batch sizes.
+
+Both clients start from the same pandas DataFrame and end with a numpy array of
+predicted prices, so the timings include client-side encoding and decoding as
+well as the request. The app runs with the real LightGBM model in a uvicorn
+subprocess, with the prediction cache off and the input log in a temp dir.
+
+    cd api && python benchmarks/bench_arrow.py
+    cd api && python benchmarks/bench_arrow.py --rows 1000 10000 100000 --repeats 5
+    cd api && python benchmarks/bench_arrow.py --bundle bundles/lightgbm_model   # no registry needed
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arrow_client import encode_request, predict_arrow
+from loadtest import wait_until_ready
+from sample_inputs import sample_inputs
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# main.MAX_BATCH_SIZE: larger JSON batches are sent as several requests
+JSON_MAX_ROWS = 10000
+
+
+def start_server(port, bundle):
+    env = dict(os.environ, PREDICTION_CACHE_SIZE="0", INPUT_LOG_DIR=tempfile.mkdtemp())
+    if bundle:
+        env["MODEL_BUNDLE_DIR"] = os.path.abspath(bundle)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def score_json(client, url, df):
+    response = client.post(f"{url}/predict/batch", json={"inputs": df.to_dict("records")}, timeout=300)
+    response.raise_for_status()
+    return np.array([row["predicted_price"] for row in response.json()["results"]])
+
+
+def score_arrow(client, url, df):
+    results, _ = predict_arrow(url, df, client=client, timeout=300)
+    return results.column("predicted_price").to_numpy(zero_copy_only=False)
+
+
+def median_ms(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--bundle", help="Serve from a local model bundle instead of the registry")
+    parser.add_argument("--port", type=int, default=8042)
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}"
+    server = start_server(args.port, args.bundle)
+    try:
+        wait_until_ready(url)
+        with httpx.Client() as client:
+            print(f"{'rows':>8} {'json ms':>10} {'arrow ms':>10} {'speedup':>8} {'json rows/s':>12} "
+                  f"{'arrow rows/s':>13} {'json KB':>9} {'arrow KB':>9}")
+            for n in args.rows:
+                df = pd.DataFrame(sample_inputs(n, seed=n))
+                score_arrow(client, url, df)
+                arrow_ms = median_ms(lambda: score_arrow(client, url, df), args.repeats)
+                if n > JSON_MAX_ROWS:
+                    # /predict/batch would reject it: time it as consecutive full-size requests
+                    json_ms = sum(median_ms(lambda: score_json(client, url, df.iloc[i:i + JSON_MAX_ROWS]), args.repeats)
+                                  for i in range(0, n, JSON_MAX_ROWS))
+                else:
+                    assert np.allclose(score_json(client, url, df), score_arrow(client, url, df), atol=0.01)
+                    json_ms = median_ms(lambda: score_json(client, url, df), args.repeats)
+                json_kb = len(json.dumps({"inputs": df.to_dict("records")})) / 1024
+                arrow_kb = len(encode_request(df)) / 1024
+                print(f"{n:>8} {json_ms:>10.1f} {arrow_ms:>10.1f} {json_ms / arrow_ms:>7.1f}x "
+                      f"{n / json_ms * 1e3:>12,.0f} {n / arrow_ms * 1e3:>13,.0f} {json_kb:>9,.0f} {arrow_kb:>9,.0f}")
+    finally:
+        server.terminate()
+        server.wait(30)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_async.py
+"""
+Sync /predict (FastAPI threadpool) against async /predict/async (bounded
+inference executor) at several client concurrencies.
+
+Every endpoint runs against the real app with the real LightGBM model in one
+fresh uvicorn process, with the prediction cache off and the input log in a temp
+dir. For each run, alongside the closed-loop load, a probe requests /live every
+20 ms. Its p99 shows how responsive the event loop stays under that load.
+Non-2xx answers (503 shed, 504 timeout) are counted as errors.
+
+    cd api && python benchmarks/bench_async.py
+    cd api && python benchmarks/bench_async.py --concurrency 1 16 64 256 --requests 3000
+    cd api && python benchmarks/bench_async.py --bundle bundles/lightgbm_model   # no registry needed
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadtest import request_bodies, run_load, summarize, wait_until_ready
+from sample_inputs import sample_inputs
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = ["/predict", "/predict/async"]
+
+
+def start_server(port, bundle, workers, max_pending):
+    env = dict(os.environ, PREDICTION_CACHE_SIZE="0", INPUT_LOG_DIR=tempfile.mkdtemp())
+    if workers:
+        env["INFERENCE_WORKERS"] = str(workers)
+    if max_pending:
+        env["INFERENCE_MAX_PENDING"] = str(max_pending)
+    if bundle:
+        env["MODEL_BUNDLE_DIR"] = os.path.abspath(bundle)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def probe_live(url, stop, interval=0.02):
+    latencies = []
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        while not stop.is_set():
+            start = time.perf_counter()
+            await client.get("/live")
+            latencies.append((time.perf_counter() - start) * 1e3)
+            await asyncio.sleep(interval)
+    return latencies
+
+
+async def load_with_probe(url, endpoint, bodies, concurrency):
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_live(url, stop))
+    results, elapsed = await run_load(url, endpoint, bodies, concurrency, 0)
+    stop.set()
+    return results, elapsed, await probe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--inference-workers", type=int, help="INFERENCE_WORKERS for the server")
+    parser.add_argument("--max-pending", type=int, help="INFERENCE_MAX_PENDING for the server")
+    parser.add_argument("--bundle", help="Serve from a local model bundle instead of the registry")
+    parser.add_argument("--port", type=int, default=8043)
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}"
+    payloads = sample_inputs(args.requests, seed=11)
+
+    print(f"{'endpoint':<15} {'clients':>8} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7} {'/live p99 ms':>13}")
+    server = start_server(args.port, args.bundle, args.inference_workers, args.max_pending)
+    try:
+        wait_until_ready(url)
+        for endpoint in ENDPOINTS:
+            bodies = request_bodies(payloads, endpoint, 1)
+            asyncio.run(run_load(url, endpoint, bodies[:200], 8, 0))
+            for concurrency in args.concurrency:
+                results, elapsed, live = asyncio.run(load_with_probe(url, endpoint, bodies, concurrency))
+                summary = summarize(results, elapsed, len(bodies))
+                live_p99 = float(np.percentile(live, 99)) if live else 0.0
+                print(f"{endpoint:<15} {concurrency:>8} {summary['throughput_rps']:>8} {summary['p50_ms']:>9} "
+                      f"{summary['p99_ms']:>9} {summary['errors']:>7} {live_p99:>13.1f}")
+    finally:
+        server.terminate()
+        server.wait(30)
+
+
+if __name__ == "__main__":
+    main()
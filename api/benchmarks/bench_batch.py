@@ -0,0 +1,59 @@
+# benchmarks/bench_batch.py
+"""
+Rows/sec of the single-row /predict path against the vectorized /predict/batch path.
+
+Runs the same encode -> scale -> predict steps the endpoints serve through
+(encoder.FeatureEncoder, predictor.scale_encoded / predict_scaled) directly, with
+no HTTP and no MySQL, so it needs the same MLflow registry as the API itself:
+
+    cd api && python benchmarks/bench_batch.py --rows 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from artifacts import get_artifacts
+from predictor import scale_encoded, predict_scaled
+from sample_inputs import sample_inputs
+
+
+def bench_single(rows, artifacts):
+    start = time.perf_counter()
+    for row in rows:
+        X = artifacts.encoder.encode(row)
+        float(predict_scaled(scale_encoded(X, artifacts), artifacts)[0])
+    return time.perf_counter() - start
+
+
+def bench_batch(rows, batch_size, artifacts):
+    start = time.perf_counter()
+    for i in range(0, len(rows), batch_size):
+        X = artifacts.encoder.encode_batch(rows[i:i + batch_size])
+        predict_scaled(scale_encoded(X, artifacts), artifacts)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[64, 1000, 10000])
+    args = parser.parse_args()
+
+    rows = sample_inputs(args.rows)
+    artifacts = get_artifacts()
+    # Warm up LightGBM before timing
+    predict_scaled(scale_encoded(artifacts.encoder.encode_batch(rows[:10]), artifacts), artifacts)
+
+    single = bench_single(rows, artifacts)
+    print(f"{'path':<20}{'seconds':>10}{'rows/sec':>14}{'speedup':>10}")
+    print(f"{'single-row':<20}{single:>10.3f}{args.rows / single:>14,.0f}{1.0:>10.1f}")
+    for batch_size in args.batch_sizes:
+        elapsed = bench_batch(rows, batch_size, artifacts)
+        print(f"{f'batch={batch_size}':<20}{elapsed:>10.3f}{args.rows / elapsed:>14,.0f}{single / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
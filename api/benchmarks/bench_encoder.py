@@ -0,0 +1,50 @@
+# benchmarks/bench_encoder.py
+"""
+Microbenchmark: DataFrame preprocessing (preprocess_user_input / preprocess_batch) against
+the compiled FeatureEncoder. Both read the feature list from the shared artifact cache,
+so the MLflow registry must be reachable, as for the API:
+
+    cd api && python benchmarks/bench_encoder.py
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preprocessing import preprocess_user_input, preprocess_batch, encode_user_input, encode_batch, get_encoder
+from sample_inputs import sample_inputs
+
+
+def per_call_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    rows = sample_inputs(args.batch_size)
+    row = rows[0]
+    assert encode_batch(rows).tobytes() == preprocess_batch(rows).to_numpy(dtype=np.float64).tobytes()
+    buffer = np.empty((args.batch_size, get_encoder().n_features))
+
+    print(f"{'case':<34}{'us/call':>12}{'us/row':>10}")
+    cases = [
+        ("single: preprocess_user_input", lambda: preprocess_user_input(row), 200, 1),
+        ("single: encode_user_input", lambda: encode_user_input(row), 5000, 1),
+        (f"batch {args.batch_size}: preprocess_batch", lambda: preprocess_batch(rows), 20, args.batch_size),
+        (f"batch {args.batch_size}: encode_batch", lambda: encode_batch(rows), 50, args.batch_size),
+        (f"batch {args.batch_size}: encode_batch(out=)", lambda: get_encoder().encode_batch(rows, out=buffer), 50, args.batch_size),
+    ]
+    for name, fn, number, n_rows in cases:
+        us = per_call_us(fn, number)
+        print(f"{name:<34}{us:>12,.1f}{us / n_rows:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_metrics.py
+"""
+Cost of the /predict instrumentation (metrics.py) against the work it measures.
+Times an empty stage timer, a full set of /predict stage timers plus the request
+tracker, the uninstrumented encode + scale + model path for one row, and the
+whole instrumented /predict handler (prediction cache off, no HTTP). Needs the
+MLflow registry:
+
+    cd api && python benchmarks/bench_metrics.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Every call should reach the model, not the prediction cache
+os.environ["PREDICTION_CACHE_SIZE"] = "0"
+
+from artifacts import get_artifacts
+from main import InputData, predict, stage_timer, track_request
+from predictor import scale_encoded, predict_scaled
+from sample_inputs import sample_inputs
+
+STAGES = ("encode", "cache_lookup", "scale", "model", "log")
+
+
+def per_call_us(fn, number=20000):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    artifacts = get_artifacts()
+    row = sample_inputs(1)[0]
+
+    def one_stage():
+        with stage_timer("/predict", artifacts, "encode"):
+            pass
+
+    def instrumentation():
+        with track_request("/predict") as labels:
+            labels["model_version"] = artifacts.version
+            for stage in STAGES:
+                with stage_timer("/predict", artifacts, stage):
+                    pass
+
+    def predict_path():
+        X = artifacts.encoder.encode(row)
+        predict_scaled(scale_encoded(X, artifacts), artifacts)
+
+    def handler():
+        predict(InputData(**row))
+
+    stage_us = per_call_us(one_stage)
+    overhead_us = per_call_us(instrumentation)
+    predict_us = per_call_us(predict_path, number=2000)
+    handler_us = per_call_us(handler, number=2000)
+    print(f"one stage timer            {stage_us:8.2f} us")
+    print(f"request tracker + stages   {overhead_us:8.2f} us")
+    print(f"encode + scale + model     {predict_us:8.2f} us")
+    print(f"/predict handler           {handler_us:8.2f} us")
+    print(f"overhead share of handler  {overhead_us / handler_us:8.1%}")
+
+
+if __name__ == "__main__":
+    main()
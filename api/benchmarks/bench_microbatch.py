@@ -0,0 +1,81 @@
+# benchmarks/bench_microbatch.py
+"""
+Throughput vs. p99 latency of /predict with and without the micro-batcher
+(micro_batcher.py), for several batching windows and client concurrencies.
+
+Every configuration runs the real app with the real LightGBM model in a fresh
+uvicorn subprocess, prediction cache off and the input log in a temp dir, then
+drives it closed loop with loadtest.py's client.
+
+    cd api && python benchmarks/bench_microbatch.py
+    cd api && python benchmarks/bench_microbatch.py --windows 0 1 2 5 --concurrency 1 16 64 --requests 3000
+    cd api && python benchmarks/bench_microbatch.py --bundle bundles/lightgbm_model   # no registry needed
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadtest import request_bodies, run_load, summarize, wait_until_ready
+from sample_inputs import sample_inputs
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_server(port, window_ms, max_batch, adaptive, bundle):
+    env = dict(os.environ, PREDICTION_CACHE_SIZE="0", INPUT_LOG_DIR=tempfile.mkdtemp(),
+               PREDICT_BATCH_WINDOW_MS=str(window_ms), PREDICT_BATCH_MAX_SIZE=str(max_batch),
+               PREDICT_BATCH_ADAPTIVE="1" if adaptive else "0")
+    if bundle:
+        env["MODEL_BUNDLE_DIR"] = os.path.abspath(bundle)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 1, 2, 5], help="Windows in ms; 0 = off")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--fixed-window", action="store_true", help="Always wait out the window (not adaptive)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--bundle", help="Serve from a local model bundle instead of the registry")
+    parser.add_argument("--port", type=int, default=8041)
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}"
+    bodies = request_bodies(sample_inputs(args.requests, seed=7), "/predict", 1)
+
+    print(f"{'window ms':>9} {'clients':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'mean batch':>11}")
+    for window_ms in args.windows:
+        server = start_server(args.port, window_ms, args.max_batch, not args.fixed_window, args.bundle)
+        try:
+            wait_until_ready(url)
+            for concurrency in args.concurrency:
+                asyncio.run(run_load(url, "/predict", bodies[:200], concurrency, 0))
+                before = httpx.get(f"{url}/micro-batcher/stats").json()
+                results, elapsed = asyncio.run(run_load(url, "/predict", bodies, concurrency, 0))
+                after = httpx.get(f"{url}/micro-batcher/stats").json()
+                summary = summarize(results, elapsed, len(bodies))
+                mean_batch = "-"
+                if after["enabled"] and after["batches"] > before["batches"]:
+                    mean_batch = f"{(after['requests'] - before['requests']) / (after['batches'] - before['batches']):.1f}"
+                label = f"{window_ms:g}" if window_ms > 0 else "off"
+                print(f"{label:>9} {concurrency:>8} {summary['throughput_rps']:>8} {summary['p50_ms']:>8} "
+                      f"{summary['p99_ms']:>8} {mean_batch:>11}")
+        finally:
+            server.terminate()
+            server.wait(30)
+
+
+if __name__ == "__main__":
+    main()
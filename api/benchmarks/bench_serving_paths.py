@@ -0,0 +1,51 @@
+# benchmarks/bench_serving_paths.py
+"""
+Latency of predict_encoded through the mlflow.pyfunc wrapper against the native
+LightGBM booster fast path and, when the version has one, the compiled model
+(compiled_model.py), at several batch sizes. Needs the MLflow registry:
+
+    cd api && python benchmarks/bench_serving_paths.py
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from artifacts import get_artifacts
+from predictor import predict_encoded
+from sample_inputs import sample_inputs
+
+
+def per_call_ms(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 64, 4096])
+    args = parser.parse_args()
+
+    artifacts = get_artifacts()
+    if artifacts.booster is None:
+        sys.exit(f"Model version {artifacts.version} has no LightGBM booster; nothing to compare.")
+
+    modes = ["pyfunc", "booster"] + (["native"] if artifacts.compiled is not None else [])
+    print(f"model version {artifacts.version}, compiled model {'loaded' if artifacts.compiled else 'not available'}")
+    header = "".join(f"{'compiled' if mode == 'native' else mode:>12}" for mode in modes)
+    print(f"{'batch':>6}{header}   (ms per call)")
+    for batch_size in args.batch_sizes:
+        X = artifacts.encoder.encode_batch(sample_inputs(batch_size))
+        expected = predict_encoded(X, artifacts, "pyfunc")
+        for mode in modes[1:]:
+            assert np.array_equal(expected, predict_encoded(X, artifacts, mode))
+        number = max(5, 2000 // batch_size)
+        timings = [per_call_ms(lambda: predict_encoded(X, artifacts, mode), number) for mode in modes]
+        print(f"{batch_size:>6}" + "".join(f"{ms:>12.3f}" for ms in timings))
+
+
+if __name__ == "__main__":
+    main()
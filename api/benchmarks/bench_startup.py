@@ -0,0 +1,93 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start benchmark: wall time from launching uvicorn to the first successful
+/predict, loading the model from the MLflow registry vs. from a local bundle
+(model_bundle.py).
+
+    cd api && python benchmarks/bench_startup.py --runs 5
+    cd api && python benchmarks/bench_startup.py --bundle bundles/lightgbm_model
+
+Without --bundle, the latest registry version is exported to a temporary bundle
+first. The bundle runs are started with an unreachable MLFLOW_TRACKING_URI, so
+they also check that startup no longer depends on the tracking server.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAYLOAD = {"build_year": 1990, "size_sqft": 1000.0, "n_bedrooms": 3, "n_bathrooms": 2, "area": "Queenstown",
+           "district": "Queenstown, Tiong Bahru", "region": "Central", "n_rooms": "HDB 4-Room"}
+
+
+def time_to_first_predict(env, port, timeout=120):
+    """Seconds from spawning the server until /predict first answers 200."""
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = start + timeout
+        while time.perf_counter() < deadline:
+            try:
+                if httpx.post(f"http://127.0.0.1:{port}/predict", json=PAYLOAD, timeout=5).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.02)
+        raise RuntimeError(f"No successful /predict within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait(30)
+
+
+def import_seconds(env):
+    """Time to import the app module alone, in a fresh interpreter."""
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=API_DIR, env=env, capture_output=True, text=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bundle", help="Bundle dir or bundles root; default exports the latest version")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8031)
+    args = parser.parse_args()
+
+    bundle = args.bundle
+    if bundle is None:
+        from artifacts import artifact_cache
+        from model_bundle import export_bundle
+
+        bundle = export_bundle(artifact_cache.load(*artifact_cache.latest_version()), tempfile.mkdtemp())
+
+    # No input logging, no caching: only model loading differs between the modes
+    base = dict(os.environ, PREDICTION_CACHE_SIZE="0", PYTHONDONTWRITEBYTECODE="1")
+    base.pop("MODEL_BUNDLE_DIR", None)
+    modes = {
+        "registry": base,
+        "bundle": dict(base, MODEL_BUNDLE_DIR=os.path.abspath(bundle), MLFLOW_TRACKING_URI="http://127.0.0.1:1"),
+    }
+
+    print(f"{'mode':<10} {'import main s':>14} {'first /predict s (median)':>26} {'min':>7} {'max':>7}")
+    for name, env in modes.items():
+        imports = [import_seconds(env) for _ in range(args.runs)]
+        firsts = [time_to_first_predict(env, args.port) for _ in range(args.runs)]
+        print(f"{name:<10} {statistics.median(imports):>14.2f} {statistics.median(firsts):>26.2f} "
+              f"{min(firsts):>7.2f} {max(firsts):>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_stream.py
+"""
+Rows/sec and server peak memory of /predict/stream as the upload grows. Starts
+the offline stub-model server from loadtest.py, streams a generated NDJSON body
+(never held in memory on the client either) while reading results on the same
+connection, and reads the server's VmHWM (peak RSS) from /proc after each
+upload (Linux only).
+
+The client is full duplex on purpose: the server answers while the upload is
+still arriving, so a client that sends the whole body before reading (like
+httpx's sync client) stalls once the socket buffers fill.
+
+    cd api && python benchmarks/bench_stream.py --rows 100000 500000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loadtest import start_stub_server, wait_until_ready
+from sample_inputs import sample_inputs
+
+
+def peak_rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def ndjson_body(n_rows, pool):
+    lines = [(json.dumps(row) + "\n").encode() for row in pool]
+    for i in range(n_rows):
+        yield lines[i % len(lines)]
+
+
+async def upload(writer, n_rows, pool, lines_per_chunk=500):
+    writer.write(b"POST /predict/stream HTTP/1.1\r\nHost: localhost\r\n"
+                 b"Content-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n")
+    chunk = []
+    for line in ndjson_body(n_rows, pool):
+        chunk.append(line)
+        if len(chunk) == lines_per_chunk:
+            data = b"".join(chunk)
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            await writer.drain()
+            chunk = []
+    if chunk:
+        data = b"".join(chunk)
+        writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+async def count_results(reader):
+    """Read a chunked HTTP response and count its NDJSON lines."""
+    status = await reader.readline()
+    if b" 200 " not in status:
+        raise RuntimeError(f"Unexpected response: {status!r}")
+    while await reader.readline() not in (b"\r\n", b""):
+        pass
+    results = 0
+    while True:
+        size = int((await reader.readline()).strip(), 16)
+        if size == 0:
+            return results
+        results += (await reader.readexactly(size + 2)).count(b"\n") - 1
+
+
+async def stream_once(port, n_rows, pool):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        _, results = await asyncio.gather(upload(writer, n_rows, pool), count_results(reader))
+    finally:
+        writer.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 500000])
+    parser.add_argument("--port", type=int, default=8022)
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}"
+    pool = sample_inputs(1000)
+    print(f"{'rows':>9}{'upload MB':>11}{'rows/s':>10}{'server peak RSS MB':>20}")
+    # A fresh server per size, so each peak is that upload's own
+    for n_rows in args.rows:
+        server = start_stub_server(args.port, prediction_cache=False)
+        try:
+            wait_until_ready(url)
+            upload_mb = sum(len(line) for line in ndjson_body(n_rows, pool)) / 1e6
+            start = time.perf_counter()
+            results = asyncio.run(stream_once(args.port, n_rows, pool))
+            elapsed = time.perf_counter() - start
+            assert results == n_rows, f"got {results} results for {n_rows} rows"
+            peak = peak_rss_mb(server.pid)
+        finally:
+            server.terminate()
+            server.wait(30)
+        print(f"{n_rows:>9}{upload_mb:>11.1f}{n_rows / elapsed:>10.0f}{peak:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/bench_workers.py
+"""
+Throughput and memory of the pre-fork gunicorn mode (gunicorn.conf.py) at
+several worker counts. For each count it starts gunicorn, drives concurrent
+/predict load, then reads RSS and PSS of every worker from /proc (Linux only).
+PSS splits shared copy-on-write pages between the processes that map them, so
+it shows how much of the model is really duplicated. req/s only says something
+about scaling when the host has at least as many cores as the largest worker
+count. Needs the MLflow registry:
+
+    cd api && python benchmarks/bench_workers.py --workers 1 2 4
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sample_inputs import sample_inputs
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def memory_kb(pid):
+    """(rss, pss) in kB from /proc/<pid>/smaps_rollup."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Pss"):
+                values[name] = int(rest.split()[0])
+    return values["Rss"], values["Pss"]
+
+
+def worker_pids(master_pid):
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def wait_until_up(url, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.post(f"{url}/predict", json=sample_inputs(1)[0], timeout=5).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"API at {url} did not come up within {timeout}s")
+
+
+def drive_load(url, payloads, concurrency):
+    def send(chunk):
+        with httpx.Client(base_url=url, timeout=30) as client:
+            for payload in chunk:
+                client.post("/predict", json=payload).raise_for_status()
+
+    chunks = [payloads[i::concurrency] for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(send, chunks))
+    return len(payloads) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--port", type=int, default=8011)
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}"
+    # Distinct inputs so the prediction cache doesn't answer most of the load
+    payloads = sample_inputs(args.requests)
+    env = dict(os.environ, PREDICTION_CACHE_SIZE="0")
+
+    print(f"{'workers':>8}{'req/s':>10}{'RSS/worker MB':>15}{'PSS/worker MB':>15}{'total PSS MB':>14}")
+    for workers in args.workers:
+        server = subprocess.Popen(
+            ["gunicorn", "-c", "gunicorn.conf.py", "main:app",
+             "--workers", str(workers), "--bind", f"127.0.0.1:{args.port}"],
+            cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_up(url)
+            drive_load(url, payloads[:200], args.concurrency)  # warm every worker
+            throughput = drive_load(url, payloads, args.concurrency)
+            usage = [memory_kb(pid) for pid in worker_pids(server.pid)]
+            master_pss = memory_kb(server.pid)[1]
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(30)
+
+        rss = sum(r for r, _ in usage) / len(usage) / 1024
+        pss = sum(p for _, p in usage) / len(usage) / 1024
+        total = (sum(p for _, p in usage) + master_pss) / 1024
+        print(f"{workers:>8}{throughput:>10.0f}{rss:>15.1f}{pss:>15.1f}{total:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+# benchmarks/loadtest.py
+"""
+Load-test / replay harness for the prediction API. Reports throughput, error
+rate and p50/p95/p99 latency.
+
+By default it starts the API in a subprocess with a stub model (stub_model.py)
+and the prediction cache off, so it runs fully offline and measures only the
+serving stack. Pass --url to drive an already running deployment instead.
+
+Payloads come from --replay FILE (JSON lines, one InputData object per line) or
+from the synthetic generator in sample_inputs.py. --record FILE writes the
+synthetic payloads out, so the same traffic can be replayed against later
+releases.
+
+  Closed loop (default): --concurrency clients send back to back.
+  Open loop: --rate R schedules R requests/s and latency is measured from each
+  request's scheduled start, so a slow server can't hide queueing delay
+  (coordinated omission).
+
+    cd api && python benchmarks/loadtest.py --requests 5000 --concurrency 32
+    cd api && python benchmarks/loadtest.py --record traffic.jsonl --requests 5000
+    cd api && python benchmarks/loadtest.py --replay traffic.jsonl --rate 200 --json-out results.jsonl --label v1.4
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+import httpx
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sample_inputs import sample_inputs
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_payloads(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def write_payloads(path, payloads):
+    with open(path, "w") as f:
+        for payload in payloads:
+            f.write(json.dumps(payload) + "\n")
+
+
+def request_bodies(payloads, endpoint, batch_size):
+    """(body, rows) pairs to send: one per payload, or payloads grouped for /predict/batch."""
+    if endpoint in ("/predict", "/predict/async"):
+        return [(payload, 1) for payload in payloads]
+    return [({"inputs": payloads[i:i + batch_size]}, len(payloads[i:i + batch_size]))
+            for i in range(0, len(payloads), batch_size)]
+
+
+async def send(client, endpoint, body, scheduled, results):
+    try:
+        response = await client.post(endpoint, json=body)
+        status = response.status_code
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    results.append((time.perf_counter() - scheduled, status))
+
+
+async def run_closed_loop(client, endpoint, bodies, concurrency, results):
+    queue = iter(bodies)
+
+    async def worker():
+        for body, _ in queue:
+            await send(client, endpoint, body, time.perf_counter(), results)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def run_open_loop(client, endpoint, bodies, concurrency, rate, results):
+    slots = asyncio.Semaphore(concurrency)
+
+    async def bounded(body, scheduled):
+        async with slots:
+            await send(client, endpoint, body, scheduled, results)
+
+    start = time.perf_counter()
+    tasks = []
+    for i, (body, _) in enumerate(bodies):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(bounded(body, scheduled)))
+    await asyncio.gather(*tasks)
+
+
+async def run_load(url, endpoint, bodies, concurrency, rate):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    results = []
+    async with httpx.AsyncClient(base_url=url, timeout=60, limits=limits) as client:
+        start = time.perf_counter()
+        if rate:
+            await run_open_loop(client, endpoint, bodies, concurrency, rate, results)
+        else:
+            await run_closed_loop(client, endpoint, bodies, concurrency, results)
+        elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def summarize(results, elapsed, rows):
+    latencies = np.array([latency for latency, _ in results]) * 1e3
+    statuses = Counter(str(status) for _, status in results)
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+    return {
+        "requests": len(results),
+        "rows": rows,
+        "errors": errors,
+        "error_rate": errors / len(results) if results else 0.0,
+        "duration_s": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 1),
+        "rows_per_s": round(rows / elapsed, 1),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(latencies.max()), 3) if len(latencies) else 0.0,
+        "statuses": dict(statuses),
+    }
+
+
+def start_stub_server(port, prediction_cache):
+    env = dict(os.environ, PREDICTION_CACHE_SIZE=os.environ.get("PREDICTION_CACHE_SIZE", "10000") if prediction_cache else "0")
+    return subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve-stub", "--port", str(port)],
+        cwd=API_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_until_ready(url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/model", timeout=2).json().get("model_version") is not None:
+                return
+        except (httpx.HTTPError, ValueError):
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"API at {url} did not serve a model within {timeout}s")
+
+
+def serve_stub(port):
+    """Run the real app with the stub model pinned in place of the registry model."""
+    import uvicorn
+
+    import main
+    from artifacts import artifact_cache
+    from stub_model import stub_artifacts
+
+    artifact_cache.install(stub_artifacts())
+    uvicorn.run(main.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Running API to test; default starts a local stub-model server")
+    parser.add_argument("--port", type=int, default=8021, help="Port for the local stub-model server")
+    parser.add_argument("--endpoint", choices=["/predict", "/predict/async", "/predict/batch"], default="/predict")
+    parser.add_argument("--batch-size", type=int, default=100, help="Rows per /predict/batch request")
+    parser.add_argument("--replay", help="JSON lines file of InputData payloads to replay")
+    parser.add_argument("--record", help="Write the synthetic payloads to this file and exit")
+    parser.add_argument("--requests", type=int, default=2000, help="Payloads to send (replay files are cycled)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=0, help="Open-loop requests/s; 0 = closed loop")
+    parser.add_argument("--warmup", type=int, default=50, help="Requests sent and discarded before measuring")
+    parser.add_argument("--prediction-cache", action="store_true", help="Keep the prediction cache on in the stub server")
+    parser.add_argument("--json-out", help="Append the summary as one JSON line (release-to-release history)")
+    parser.add_argument("--label", default="", help="Free-form tag stored with --json-out, e.g. a release")
+    parser.add_argument("--serve-stub", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_stub:
+        serve_stub(args.port)
+        return
+
+    if args.record:
+        write_payloads(args.record, sample_inputs(args.requests, args.seed))
+        print(f"Wrote {args.requests} payloads to {args.record}")
+        return
+
+    if args.replay:
+        source = load_payloads(args.replay)
+        payloads = list(itertools.islice(itertools.cycle(source), args.requests))
+    else:
+        payloads = sample_inputs(args.requests, args.seed)
+    bodies = request_bodies(payloads, args.endpoint, args.batch_size)
+
+    server = None
+    url = args.url
+    if url is None:
+        url = f"http://127.0.0.1:{args.port}"
+        server = start_stub_server(args.port, args.prediction_cache)
+    try:
+        wait_until_ready(url)
+        if args.warmup:
+            asyncio.run(run_load(url, args.endpoint, bodies[:args.warmup], args.concurrency, 0))
+        results, elapsed = asyncio.run(run_load(url, args.endpoint, bodies, args.concurrency, args.rate))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(30)
+
+    summary = summarize(results, elapsed, sum(rows for _, rows in bodies))
+    summary.update({
+        "label": args.label,
+        "target": args.url or "stub",
+        "endpoint": args.endpoint,
+        "batch_size": args.batch_size if args.endpoint == "/predict/batch" else 1,
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "source": args.replay or f"synthetic(seed={args.seed})",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    })
+
+    print(f"{args.endpoint} against {summary['target']}: {summary['requests']} requests, "
+          f"concurrency {args.concurrency}, {'rate ' + str(args.rate) + '/s' if args.rate else 'closed loop'}")
+    print(f"  throughput  {summary['throughput_rps']:>10} req/s  ({summary['rows_per_s']} rows/s)")
+    print(f"  errors      {summary['errors']:>10}        ({summary['error_rate']:.2%})  {summary['statuses']}")
+    for name in ("p50_ms", "p95_ms", "p99_ms", "max_ms"):
+        print(f"  {name[:-3]:<11} {summary[name]:>10} ms")
+
+    if args.json_out:
+        with open(args.json_out, "a") as f:
+            f.write(json.dumps(summary) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# benchmarks/sample_inputs.py
+import random
+
+AREAS = [
+    'Ang Mo Kio', 'Bedok', 'Bishan', 'Bukit Batok', 'Bukit Merah', 'Bukit Panjang', 'Bukit Timah',
+    'Central Area', 'Choa Chu Kang', 'Clementi', 'Geylang', 'Hougang', 'Jurong East', 'Jurong West',
+    'Kallang/Whampoa', 'Marine Parade', 'Pasir Ris', 'Punggol', 'Queenstown', 'Sembawang',
+    'Sengkang', 'Serangoon', 'Tampines', 'Toa Payoh', 'Woodlands', 'Yishun'
+]
+
+DISTRICT_REGION = {
+    "Queenstown, Tiong Bahru": "Central",
+    "Telok Blangah, Harbourfront": "Central",
+    "Balestier, Toa Payoh, Serangoon": "Central",
+    "Bishan, Ang Mo Kio": "Central",
+    "Geylang, Eunos": "East",
+    "Bedok, Upper East Coast, Eastwood, Kew Drive": "East",
+    "Tampines, Pasir Ris": "East",
+    "Hillview, Dairy Farm, Bukit Panjang, Choa Chu Kang": "North",
+    "Yishun, Sembawang": "North",
+    "Serangoon Garden, Hougang, Ponggol": "North East",
+    "Jurong": "West",
+    "Upper Bukit Timah, Clementi Park, Ulu Pandan": "West",
+}
+
+N_ROOMS = [
+    'HDB 2-Room', 'HDB 3-Room', 'HDB 4-Room', 'HDB 5-Room', 'HDB 3PA (Premium Apartment)',
+    'HDB 4PA (Premium Apartment)', 'HDB 5PA (Premium Apartment)', 'HDB Exec Apartment'
+]
+
+
+def sample_inputs(n, seed=42):
+    """Generate n valid /predict payloads with a realistic spread of flats."""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        district = rng.choice(list(DISTRICT_REGION))
+        n_bedrooms = rng.randint(1, 5)
+        rows.append({
+            "build_year": rng.randint(1970, 2024),
+            "size_sqft": float(rng.randint(45, 160) * 10),
+            "n_bedrooms": n_bedrooms,
+            "n_bathrooms": rng.randint(1, min(n_bedrooms, 3)),
+            "area": rng.choice(AREAS),
+            "district": district,
+            "region": DISTRICT_REGION[district],
+            "n_rooms": rng.choice(N_ROOMS)
+        })
+    return rows
@@ -0,0 +1,42 @@
+# benchmarks/stub_model.py
+from types import SimpleNamespace
+
+import joblib
+import numpy as np
+
+from artifacts import ModelArtifacts, SELECTED_FEATURES_PATH, SCALER_PATH, read_files, checksum
+
+
+class StubModel:
+    """
+    Deterministic linear stand-in for the registry model, so the serving stack
+    can be benchmarked offline. It declares the lightgbm flavor and is its own
+    raw model, so ModelArtifacts picks it up as the booster and requests take the
+    same native path as production.
+    """
+
+    def __init__(self, n_features, seed=0):
+        rng = np.random.default_rng(seed)
+        self.metadata = SimpleNamespace(flavors={"python_function": {}, "lightgbm": {}})
+        self.coef = rng.normal(20000.0, 5000.0, n_features)
+        self.intercept = 500000.0
+
+    def get_raw_model(self):
+        return self
+
+    def predict(self, X, num_threads=None):
+        return np.asarray(X, dtype=np.float64) @ self.coef + self.intercept
+
+
+def stub_artifacts(version="stub"):
+    """ModelArtifacts around StubModel with the real scaler and feature list; no MLflow access."""
+    features_bytes, scaler_bytes = read_files(SELECTED_FEATURES_PATH, SCALER_PATH)
+    selected_features = joblib.load(SELECTED_FEATURES_PATH)
+    return ModelArtifacts(
+        version=version,
+        checksum=checksum(features_bytes, scaler_bytes),
+        model_uri="stub://",
+        model=StubModel(len(selected_features)),
+        scaler=joblib.load(SCALER_PATH),
+        selected_features=selected_features,
+    )
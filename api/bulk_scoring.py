@@ -0,0 +1,152 @@
+# bulk_scoring.py
+import codecs
+import csv
+import io
+import json
+
+from starlette.responses import StreamingResponse
+
+NDJSON = "ndjson"
+CSV = "csv"
+
+CONTENT_TYPES = {
+    "application/x-ndjson": NDJSON,
+    "application/ndjson": NDJSON,
+    "application/jsonl": NDJSON,
+    "application/x-jsonlines": NDJSON,
+    "text/csv": CSV,
+    "application/csv": CSV,
+}
+RESPONSE_MEDIA_TYPES = {NDJSON: "application/x-ndjson", CSV: "text/csv"}
+
+CSV_RESULT_COLUMNS = ["index", "predicted_price", "lower", "upper", "error"]
+
+
+class LineTooLongError(ValueError):
+    """A single input line exceeded the allowed size (e.g. a file with no line breaks)."""
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for handlers that are still reading the request body while
+    they answer. The stock class also reads `receive` to watch for disconnects,
+    which would swallow the body messages; here a disconnect instead ends
+    request.stream() with ClientDisconnect.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+def stream_format(content_type):
+    """NDJSON or CSV for a request Content-Type header, None if unsupported."""
+    return CONTENT_TYPES.get((content_type or "").split(";")[0].strip().lower())
+
+
+async def iter_lines(byte_chunks, max_line_bytes):
+    """Decode an async stream of byte chunks into text lines, holding at most one partial line."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    async for chunk in byte_chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+        if len(buffer) > max_line_bytes:
+            raise LineTooLongError(f"Input line longer than {max_line_bytes} bytes")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_csv_records(lines, max_line_bytes):
+    """
+    Group physical lines into CSV records and parse each with csv.reader. A
+    quoted field may contain line breaks: lines are gathered until the quotes
+    balance ("" escapes keep the count even), then fed to csv.reader together.
+    """
+    pending, size = [], 0
+    async for line in lines:
+        if not pending and not line.strip():
+            continue
+        pending.append(line + "\n")
+        size += len(line)
+        if sum(part.count('"') for part in pending) % 2:
+            if size > max_line_bytes:
+                raise LineTooLongError(f"CSV record longer than {max_line_bytes} bytes")
+            continue
+        yield next(csv.reader(pending))
+        pending, size = [], 0
+    if pending:
+        # Unterminated quote at end of body: let csv.reader parse what there is
+        yield next(csv.reader(pending))
+
+
+async def iter_record_chunks(byte_chunks, fmt, chunk_rows, max_line_bytes):
+    """
+    Parse a streamed NDJSON or CSV body into lists of at most chunk_rows
+    (index, record) pairs. record is a dict of raw fields, or an error message
+    for a line that could not be parsed. Blank lines are skipped; the CSV header
+    row is not counted as a record.
+    """
+    chunk, index = [], 0
+    lines = iter_lines(byte_chunks, max_line_bytes)
+
+    if fmt == CSV:
+        records = _csv_records(iter_csv_records(lines, max_line_bytes))
+    else:
+        records = _ndjson_records(lines)
+
+    async for record in records:
+        chunk.append((index, record))
+        index += 1
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _csv_records(rows):
+    header = None
+    async for fields in rows:
+        if header is None:
+            header = [name.strip() for name in fields]
+        elif len(fields) == len(header):
+            yield dict(zip(header, fields))
+        else:
+            yield f"Expected {len(header)} fields, got {len(fields)}"
+
+
+async def _ndjson_records(lines):
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            yield record if isinstance(record, dict) else "Expected a JSON object"
+        except json.JSONDecodeError as e:
+            yield f"Invalid JSON: {e}"
+
+
+def format_results(results, fmt):
+    """Serialise /predict/batch-style result dicts as NDJSON lines or CSV rows."""
+    if fmt == NDJSON:
+        return "".join(json.dumps(result) + "\n" for result in results)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for result in results:
+        if "error" in result:
+            error = result["error"]
+            writer.writerow([result["index"], "", "", "", error if isinstance(error, str) else json.dumps(error)])
+        else:
+            price_range = result["price_range"]
+            writer.writerow([result["index"], result["predicted_price"], price_range["lower"], price_range["upper"], ""])
+    return buffer.getvalue()
+
+
+def csv_header():
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_RESULT_COLUMNS)
+    return buffer.getvalue()
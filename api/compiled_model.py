@@ -0,0 +1,200 @@
+# compiled_model.py
+"""
+Compiled LightGBM inference, in the style of treelite: the trees of a booster
+are generated as nested if/else C code, built into a shared library with the
+system C compiler and called through ctypes, one call per matrix.
+
+A compiled model directory holds:
+
+    model.c          generated source
+    model.so         shared library built from it
+    compiled.json    sha256 of the booster's model string, feature/tree counts, platform
+
+models/register_best_model.py compiles every promoted version, checks parity
+against the pyfunc model and logs the directory to the run as "compiled/".
+The API loads it next to the booster and prefers it (see predictor.predict_scaled).
+"""
+import ctypes
+import hashlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+LIBRARY_FILE = "model.so"
+SOURCE_FILE = "model.c"
+MANIFEST_FILE = "compiled.json"
+ENTRY_POINT = "housing_predict"
+
+# Objectives whose raw score is the prediction (no sigmoid/exp transform to replicate)
+IDENTITY_OBJECTIVES = ("regression", "regression_l1", "huber", "fair", "quantile", "mape")
+
+# Largest |compiled - booster| accepted when a compiled model is loaded
+PARITY_TOLERANCE = 1e-6
+
+_DECISIONS = """
+#include <math.h>
+
+/* LightGBM's numerical split rule (tree.h NumericalDecision) per missing_type */
+static inline int left_none(double v, double t) { if (isnan(v)) v = 0.0; return v <= t; }
+static inline int left_zero(double v, double t, int dl) {
+  if (isnan(v)) v = 0.0;
+  if (v >= -1e-35 && v <= 1e-35) return dl;
+  return v <= t;
+}
+static inline int left_nan(double v, double t, int dl) { if (isnan(v)) return dl; return v <= t; }
+"""
+
+
+class CompiledModel:
+    """A loaded model.so; predict() takes an (n, n_features) float64 matrix like Booster.predict."""
+
+    def __init__(self, path, library_path, n_features):
+        self.path = path
+        self.n_features = n_features
+        self._library = ctypes.CDLL(library_path)
+        self._predict = getattr(self._library, ENTRY_POINT)
+        self._predict.argtypes = [ctypes.c_void_p, ctypes.c_long, ctypes.c_long, ctypes.c_void_p]
+        self._predict.restype = None
+
+    def predict(self, X):
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+        out = np.empty(X.shape[0], dtype=np.float64)
+        # ctypes drops the GIL for the call, so concurrent requests don't serialise on it
+        self._predict(X.ctypes.data, X.shape[0], X.shape[1], out.ctypes.data)
+        return out
+
+
+def booster_hash(booster):
+    return hashlib.sha256(booster.model_to_string().encode("utf-8")).hexdigest()
+
+
+def _condition(node):
+    if node["decision_type"] != "<=":
+        raise NotImplementedError(f"Split type '{node['decision_type']}' is not supported by the compiler")
+    value, threshold = f"x[{node['split_feature']}]", repr(float(node["threshold"]))
+    default_left = 1 if node["default_left"] else 0
+    missing = node["missing_type"]
+    if missing == "None":
+        return f"left_none({value}, {threshold})"
+    if missing == "Zero":
+        return f"left_zero({value}, {threshold}, {default_left})"
+    return f"left_nan({value}, {threshold}, {default_left})"
+
+
+def _emit(node, lines, depth):
+    pad = "  " * depth
+    if "leaf_value" in node:
+        lines.append(f"{pad}return {repr(float(node['leaf_value']))};")
+        return
+    lines.append(f"{pad}if ({_condition(node)}) {{")
+    _emit(node["left_child"], lines, depth + 1)
+    lines.append(f"{pad}}} else {{")
+    _emit(node["right_child"], lines, depth + 1)
+    lines.append(f"{pad}}}")
+
+
+def generate_c(booster):
+    """C source of a predict function equivalent to booster.predict on raw scores."""
+    dump = booster.dump_model()
+    objective = dump["objective"].split()[0]
+    if objective not in IDENTITY_OBJECTIVES or dump["num_tree_per_iteration"] != 1:
+        raise NotImplementedError(f"Objective '{dump['objective']}' is not supported by the compiler")
+    if any(tree_info.get("is_linear") for tree_info in dump["tree_info"]):
+        raise NotImplementedError("Linear trees are not supported by the compiler")
+
+    lines = [_DECISIONS]
+    trees = dump["tree_info"]
+    for i, tree_info in enumerate(trees):
+        lines.append(f"static double tree_{i}(const double* x) {{")
+        _emit(tree_info["tree_structure"], lines, 1)
+        lines.append("}")
+
+    # Trees are summed in order, as LightGBM does, so results match to the last bit
+    lines.append(f"void {ENTRY_POINT}(const double* X, long n, long n_features, double* out) {{")
+    lines.append("  for (long i = 0; i < n; ++i) {")
+    lines.append("    const double* x = X + i * n_features;")
+    lines.append("    double s = 0.0;")
+    lines.extend(f"    s += tree_{i}(x);" for i in range(len(trees)))
+    if dump.get("average_output"):
+        lines.append(f"    s /= {len(trees)}.0;")
+    lines.append("    out[i] = s;")
+    lines.append("  }")
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def build_library(source_path, library_path, cc=None):
+    cc = cc or os.environ.get("CC", "cc")
+    subprocess.run([cc, "-O2", "-shared", "-fPIC", "-o", library_path, source_path, "-lm"],
+                   check=True, capture_output=True, text=True)
+
+
+def compile_booster(booster, out_dir, cc=None):
+    """Generate, build and describe a compiled model in out_dir; returns out_dir."""
+    os.makedirs(out_dir, exist_ok=True)
+    source_path = os.path.join(out_dir, SOURCE_FILE)
+    with open(source_path, "w") as f:
+        f.write(generate_c(booster))
+    build_library(source_path, os.path.join(out_dir, LIBRARY_FILE), cc)
+
+    manifest = {
+        "model_sha256": booster_hash(booster),
+        "n_features": booster.num_feature(),
+        "num_trees": booster.num_trees(),
+        "platform": f"{platform.system()}-{platform.machine()}",
+        "compiled_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(os.path.join(out_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return out_dir
+
+
+def max_abs_diff(compiled, booster, X):
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    return float(np.max(np.abs(compiled.predict(X) - booster.predict(X))))
+
+
+def load_compiled(path, booster):
+    """
+    CompiledModel from a compiled directory, or None if it doesn't belong to this
+    booster, can't be loaded on this platform (rebuilding from model.c is tried
+    first) or doesn't reproduce the booster's predictions.
+    """
+    if path is None or not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        return None
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    if manifest["model_sha256"] != booster_hash(booster):
+        print("⚠️ Compiled model was built from a different booster; using the booster")
+        return None
+
+    try:
+        compiled = CompiledModel(path, os.path.join(path, LIBRARY_FILE), manifest["n_features"])
+    except OSError:
+        # Built for another platform: rebuild from the shipped source if a compiler is available
+        # (the library stays mapped once loaded, so the build dir can go right away)
+        try:
+            with tempfile.TemporaryDirectory(prefix="compiled-model-") as rebuilt:
+                shutil.copy(os.path.join(path, SOURCE_FILE), rebuilt)
+                build_library(os.path.join(rebuilt, SOURCE_FILE), os.path.join(rebuilt, LIBRARY_FILE))
+                compiled = CompiledModel(path, os.path.join(rebuilt, LIBRARY_FILE), manifest["n_features"])
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"⚠️ Could not load compiled model ({e}); using the booster")
+            return None
+
+    X = np.random.default_rng(0).normal(size=(256, manifest["n_features"]))
+    diff = max_abs_diff(compiled, booster, X)
+    if diff > PARITY_TOLERANCE:
+        print(f"⚠️ Compiled model differs from the booster by {diff}; using the booster")
+        return None
+    return compiled
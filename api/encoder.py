@@ -0,0 +1,189 @@
+# encoder.py
+import numpy as np
+
+CENTRAL_AREAS = ['Bukit Merah', 'Queenstown', 'Toa Payoh', 'Kallang/Whampoa']
+
+MATURE_TOWNS = [
+    'Ang Mo Kio', 'Bedok', 'Bishan', 'Bukit Merah', 'Bukit Timah', 'Central Area',
+    'Clementi', 'Geylang', 'Kallang/Whampoa', 'Marine Parade', 'Pasir Ris',
+    'Queenstown', 'Serangoon', 'Toa Payoh'
+]
+
+ONE_HOT_COLS = {
+    'n_rooms': ['HDB 4-Room', 'HDB 5PA (Premium Apartment)'],
+    'district': [
+        'Balestier, Toa Payoh, Serangoon',
+        'Geylang, Eunos',
+        'Hillview, Dairy Farm, Bukit Panjang, Choa Chu Kang',
+        'Jurong',
+        'Queenstown, Tiong Bahru',
+        'Telok Blangah, Harbourfront'
+    ],
+    'region': ['East', 'North', 'West'],
+    'area': ['Hougang', 'Marine Parade']
+}
+
+
+class FeatureEncoder:
+    """
+    Maps raw /predict inputs straight into a float64 matrix in model column order.
+
+    Everything that preprocess_user_input works out per request (column positions,
+    one-hot vocabularies, central/mature area lookups) is resolved once here, so
+    encoding a row is only index writes into a preallocated array. The output is
+    identical to preprocess_user_input(...).to_numpy(dtype=float).
+    """
+
+    def __init__(self, selected_features, one_hot_cols, central_areas, mature_towns):
+        self.selected_features = list(selected_features)
+        self.n_features = len(self.selected_features)
+        index = {name: i for i, name in enumerate(self.selected_features)}
+
+        # Engineered numeric columns that the model actually uses (None = not selected)
+        self._build_year = index.get('build_year')
+        self._size_sqft = index.get('size_sqft')
+        self._size_per_room = index.get('size_per_room')
+        self._bed_bath_ratio = index.get('bed_bath_ratio')
+        self._is_central = index.get('is_central')
+        self._is_mature_town = index.get('is_mature_town')
+        self._age_size_interaction = index.get('age_size_interaction')
+
+        # {input field: {category value: column position}}, only for selected one-hot columns
+        self._one_hot = {}
+        for col, values in one_hot_cols.items():
+            positions = {val: index[f"{col}_{val}"] for val in values if f"{col}_{val}" in index}
+            if positions:
+                self._one_hot[col] = positions
+
+        self._central_areas = frozenset(central_areas)
+        self._mature_towns = frozenset(mature_towns)
+
+    def columns_index(self, names):
+        """Positions of the given feature names in the encoded matrix."""
+        return [self.selected_features.index(name) for name in names]
+
+    def encode(self, input_dict):
+        """Encode a single input dict into a (1, n_features) matrix."""
+        build_year = int(input_dict['build_year'])
+        size_sqft = float(input_dict['size_sqft'])
+        n_bedrooms = int(input_dict['n_bedrooms'])
+        n_bathrooms = int(input_dict['n_bathrooms'])
+        area = input_dict['area']
+        categories = {col: input_dict[col] for col in ('n_rooms', 'district', 'region', 'area')}
+
+        X = np.zeros((1, self.n_features), dtype=np.float64)
+        row = X[0]
+        if self._build_year is not None:
+            row[self._build_year] = build_year
+        if self._size_sqft is not None:
+            row[self._size_sqft] = size_sqft
+        if self._size_per_room is not None:
+            row[self._size_per_room] = size_sqft / (n_bedrooms or 1)
+        if self._bed_bath_ratio is not None:
+            row[self._bed_bath_ratio] = n_bedrooms / (n_bathrooms or 1)
+        if self._is_central is not None:
+            row[self._is_central] = area in self._central_areas
+        if self._is_mature_town is not None:
+            row[self._is_mature_town] = area in self._mature_towns
+        if self._age_size_interaction is not None:
+            row[self._age_size_interaction] = (2025 - build_year) * size_sqft
+
+        for col, positions in self._one_hot.items():
+            position = positions.get(categories[col])
+            if position is not None:
+                row[position] = 1.0
+
+        return X
+
+    def encode_batch(self, input_dicts, out=None):
+        """
+        Encode a list of input dicts into an (n, n_features) float64 matrix.
+
+        A preallocated array with at least n rows can be passed as `out` to reuse
+        memory across calls. Raises KeyError if a required field is missing.
+        """
+        n = len(input_dicts)
+        if out is None:
+            X = np.zeros((n, self.n_features), dtype=np.float64)
+        else:
+            X = out[:n]
+            X.fill(0.0)
+        if n == 0:
+            return X
+
+        # Same casts as the DataFrame path: astype(int) / astype(float)
+        build_year = np.fromiter((int(d['build_year']) for d in input_dicts), dtype=np.int64, count=n)
+        size_sqft = np.fromiter((float(d['size_sqft']) for d in input_dicts), dtype=np.float64, count=n)
+        n_bedrooms = np.fromiter((int(d['n_bedrooms']) for d in input_dicts), dtype=np.int64, count=n)
+        n_bathrooms = np.fromiter((int(d['n_bathrooms']) for d in input_dicts), dtype=np.int64, count=n)
+        areas = [d['area'] for d in input_dicts]
+        categories = {col: [d[col] for d in input_dicts] for col in ('n_rooms', 'district', 'region')}
+        categories['area'] = areas
+
+        self._encode_numeric(X, build_year, size_sqft, n_bedrooms, n_bathrooms)
+        if self._is_central is not None:
+            X[:, self._is_central] = [area in self._central_areas for area in areas]
+        if self._is_mature_town is not None:
+            X[:, self._is_mature_town] = [area in self._mature_towns for area in areas]
+
+        for col, positions in self._one_hot.items():
+            for row, value in enumerate(categories[col]):
+                position = positions.get(value)
+                if position is not None:
+                    X[row, position] = 1.0
+
+        return X
+
+    def encode_columns(self, columns, out=None):
+        """
+        Encode a batch given column by column, with no per-row Python objects.
+
+        Numeric fields (build_year, n_bedrooms, n_bathrooms as int64, size_sqft as
+        float64) are arrays of length n. Categorical fields (area, district, region,
+        n_rooms) are (codes, values) pairs: integer codes indexing a list of the
+        distinct values, as in an Arrow dictionary array. Lookups run once per
+        distinct value; the rows are then filled with array indexing. The output is
+        identical to encode_batch on the same rows.
+        """
+        n = len(columns['build_year'])
+        if out is None:
+            X = np.zeros((n, self.n_features), dtype=np.float64)
+        else:
+            X = out[:n]
+            X.fill(0.0)
+        if n == 0:
+            return X
+
+        self._encode_numeric(X, np.asarray(columns['build_year'], dtype=np.int64),
+                             np.asarray(columns['size_sqft'], dtype=np.float64),
+                             np.asarray(columns['n_bedrooms'], dtype=np.int64),
+                             np.asarray(columns['n_bathrooms'], dtype=np.int64))
+
+        area_codes, area_values = columns['area']
+        if self._is_central is not None:
+            X[:, self._is_central] = np.array([v in self._central_areas for v in area_values], dtype=bool)[area_codes]
+        if self._is_mature_town is not None:
+            X[:, self._is_mature_town] = np.array([v in self._mature_towns for v in area_values], dtype=bool)[area_codes]
+
+        rows = np.arange(n)
+        for col, positions in self._one_hot.items():
+            codes, values = columns[col]
+            # Column position per distinct value, -1 where the value isn't one-hot encoded
+            lookup = np.array([positions.get(v, -1) for v in values], dtype=np.int64)
+            row_positions = lookup[codes]
+            hit = row_positions >= 0
+            X[rows[hit], row_positions[hit]] = 1.0
+
+        return X
+
+    def _encode_numeric(self, X, build_year, size_sqft, n_bedrooms, n_bathrooms):
+        if self._build_year is not None:
+            X[:, self._build_year] = build_year
+        if self._size_sqft is not None:
+            X[:, self._size_sqft] = size_sqft
+        if self._size_per_room is not None:
+            X[:, self._size_per_room] = size_sqft / np.where(n_bedrooms == 0, 1, n_bedrooms)
+        if self._bed_bath_ratio is not None:
+            X[:, self._bed_bath_ratio] = n_bedrooms / np.where(n_bathrooms == 0, 1, n_bathrooms)
+        if self._age_size_interaction is not None:
+            X[:, self._age_size_interaction] = (2025 - build_year) * size_sqft
@@ -0,0 +1,84 @@
+# gunicorn.conf.py
+"""
+Pre-fork multi-worker launch mode for the prediction API:
+
+    cd api && gunicorn -c gunicorn.conf.py main:app
+
+The app is imported and the model, scaler and feature list are loaded once in
+the master process, then the workers are forked from it. Those artifacts live in
+pages shared copy-on-write by every worker instead of one copy per worker.
+Each worker still runs its own registry poller, so a newly promoted version is
+picked up (and then held per worker) without a restart.
+
+Environment:
+  WEB_CONCURRENCY        number of workers (default: CPU count)
+  LIGHTGBM_NUM_THREADS   LightGBM threads per worker (default: CPUs // workers, at least 1,
+                         with workers as actually configured, --workers included)
+  PORT                   listen port (default 8000)
+  PROMETHEUS_MULTIPROC_DIR  where workers keep their metrics so /metrics can merge them
+                         (default: a fresh directory under the system temp dir)
+"""
+import gc
+import glob
+import os
+import tempfile
+
+workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+preload_app = True
+timeout = 120
+
+# An explicit LIGHTGBM_NUM_THREADS wins; otherwise post_fork caps each worker at
+# CPUs // workers, so N workers x threads never exceeds the cores available.
+_configured_threads = os.environ.get("LIGHTGBM_NUM_THREADS")
+
+# prometheus_client reads this when it is first imported, so it has to be set before
+# the app is preloaded. Files left over from an earlier run would be summed in, so clear them.
+_metrics_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), f"housing-api-metrics-{os.getpid()}")
+)
+os.makedirs(_metrics_dir, exist_ok=True)
+for _stale in glob.glob(os.path.join(_metrics_dir, "*.db")):
+    os.remove(_stale)
+
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded and before any worker is forked
+    import predictor
+    from artifacts import artifact_cache
+
+    # LightGBM warns that OpenMP used before a fork can deadlock the children: the
+    # master's warm-up predictions stay single-threaded, so no OpenMP pool is started
+    predictor.NUM_THREADS = 1
+    try:
+        artifact_cache.refresh()
+    except Exception as e:
+        # Workers fall back to loading through their own registry poller
+        server.log.warning(f"Could not preload model in master: {e}")
+
+    # Move everything allocated so far out of the GC's reach, so collections in
+    # the workers don't write to (and un-share) the model's pages
+    gc.freeze()
+
+
+def threads_per_worker(n_workers, configured=None, cpu_count=None):
+    if configured:
+        return int(configured)
+    return max(1, (cpu_count or os.cpu_count() or 1) // n_workers)
+
+
+def post_fork(server, worker):
+    import predictor
+
+    threads = threads_per_worker(server.cfg.workers, _configured_threads)
+    predictor.NUM_THREADS = threads
+    os.environ["LIGHTGBM_NUM_THREADS"] = os.environ["OMP_NUM_THREADS"] = str(threads)
+    server.log.info(f"Worker {worker.pid} forked (LightGBM threads: {threads} of {server.cfg.workers} workers)")
+
+
+def child_exit(server, worker):
+    # Drop the dead worker's live gauges (in-flight requests, queue depth, model info)
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,112 @@
+# inference_executor.py
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Every slot of the inference executor is taken; the request is shed instead of queued."""
+
+
+class InferenceExecutor:
+    """
+    Dedicated, bounded thread pool for the CPU-bound part of async handlers.
+
+    At most max_workers scoring jobs run at once, and at most max_pending are
+    accepted (running plus queued). Past that, run() raises
+    ExecutorSaturatedError straight away, so overload turns into fast 503s
+    instead of an ever-growing queue. A job not finished within `timeout`
+    seconds raises TimeoutError. A job that is still queued when it times out,
+    or when its request is cancelled, is cancelled and never runs. A job that
+    has already started runs to completion in the background, still holding its
+    slot, so the bound always reflects the work the threads actually have.
+    """
+
+    def __init__(self, max_workers=4, max_pending=64, timeout=5.0):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "rejected": 0, "timed_out": 0, "cancelled": 0,
+                       "failed": 0, "pending": 0}
+
+    def start(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="inference")
+            return self._executor
+
+    async def run(self, fn, *args):
+        """Await fn(*args) on the pool; re-raises its exceptions."""
+        executor = self._executor or self.start()
+        if not self._slots.acquire(blocking=False):
+            self._count(rejected=1)
+            raise ExecutorSaturatedError(f"Inference executor is saturated ({self.max_pending} jobs pending)")
+        self._count(submitted=1, pending=1)
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            self._count(submitted=-1, pending=-1)
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self._count(timed_out=1)
+            future.cancel()
+            raise TimeoutError(f"Inference did not finish within {self.timeout}s") from None
+        except asyncio.CancelledError:
+            self._count(cancelled=1)
+            future.cancel()
+            raise
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["max_workers"] = self.max_workers
+        stats["max_pending"] = self.max_pending
+        stats["timeout_s"] = self.timeout
+        return stats
+
+    def shutdown(self):
+        """Cancel queued jobs; running jobs finish in the background. run() starts a fresh pool."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, future):
+        # Runs on the worker thread (or the cancelling thread): slots are freed when the work is really done
+        self._slots.release()
+        if future.cancelled():
+            self._count(pending=-1)
+        elif future.exception() is not None:
+            self._count(failed=1, pending=-1)
+        else:
+            self._count(completed=1, pending=-1)
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for name, value in increments.items():
+                self._stats[name] += value
+
+
+def build_inference_executor():
+    """
+    InferenceExecutor for /predict/async, configured from the environment:
+      INFERENCE_WORKERS          scoring threads (default: CPU count)
+      INFERENCE_MAX_PENDING      jobs accepted at once, running + queued, before shedding (default 64)
+      INFERENCE_TIMEOUT_SECONDS  per-request limit before a 504 (default 5)
+    """
+    return InferenceExecutor(
+        max_workers=int(os.environ.get("INFERENCE_WORKERS", str(os.cpu_count() or 1))),
+        max_pending=int(os.environ.get("INFERENCE_MAX_PENDING", "64")),
+        timeout=float(os.environ.get("INFERENCE_TIMEOUT_SECONDS", "5")),
+    )
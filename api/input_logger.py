@@ -0,0 +1,180 @@
+# input_logger.py
+import os
+import queue
+import threading
+import time
+
+import pyarrow as pa
+
+from segment_log import SegmentWriter
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Parquet segments of logged inputs; housing_loader_package/input_segments.py loads them into input_data
+SEGMENT_DIR = os.environ.get("INPUT_LOG_DIR", os.path.join(ROOT_DIR, 'housing_loader_package', 'input_log'))
+
+INPUT_DATA_COLUMNS = [
+    'build_year', 'size_sqft', 'size_per_room', 'bed_bath_ratio', 'is_central',
+    'is_mature_town', 'age_size_interaction', 'n_rooms_HDB_4_Room',
+    'n_rooms_HDB_5PA_Premium_Apartment', 'district_Balestier_Toa_Payoh_Serangoon',
+    'district_Geylang_Eunos', 'district_Hillview_Dairy_Farm_Bukit_Panjang_Choa_Chu_Kang',
+    'district_Jurong', 'district_Queenstown_Tiong_Bahru',
+    'district_Telok_Blangah_Harbourfront', 'region_East', 'region_North',
+    'region_West', 'area_Hougang', 'area_Marine_Parade', 'input_datetime'
+]
+
+# input_data's columns: encoded features as float64, then the request timestamp
+SEGMENT_SCHEMA = pa.schema(
+    [(name, pa.float64()) for name in INPUT_DATA_COLUMNS[:-1]] + [("input_datetime", pa.timestamp("us"))]
+)
+
+# What log_rows does when the queue is full:
+#   drop_newest - discard the incoming row (never blocks the request)
+#   drop_oldest - evict the oldest queued row to make room
+#   block       - wait up to block_timeout for space, then discard the row
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+
+class InputLogger:
+    """
+    Write-behind logger for prediction inputs.
+
+    Requests only put rows on a bounded in-memory queue. A single background
+    worker drains it, and flushes a batch as one row group of the current
+    Parquet segment (segment_log.SegmentWriter) when batch_size rows are
+    waiting or flush_interval seconds have passed since the first row of the
+    batch. Segments rotate by size and age and are closed on shutdown.
+    """
+
+    def __init__(self, segment_dir=SEGMENT_DIR, max_queue_size=10000, batch_size=500, flush_interval=2.0,
+                 overflow_policy="drop_newest", block_timeout=0.05, segment_max_rows=100_000,
+                 segment_max_bytes=64 * 1024 * 1024, segment_max_age=300.0):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}, got '{overflow_policy}'")
+        self.segment_dir = segment_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.segments = SegmentWriter(segment_dir, SEGMENT_SCHEMA, max_rows=segment_max_rows,
+                                      max_bytes=segment_max_bytes, max_age=segment_max_age)
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"enqueued": 0, "dropped": 0, "written": 0, "failed": 0, "flushes": 0}
+
+    # ---------- request side ----------
+
+    def start(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="input-logger", daemon=True)
+                self._thread.start()
+
+    def log_rows(self, rows):
+        """Queue rows (tuples in INPUT_DATA_COLUMNS order) for writing. Never raises."""
+        if self._thread is None:
+            self.start()
+        enqueued = dropped = 0
+        for row in rows:
+            if self._put(row):
+                enqueued += 1
+            else:
+                dropped += 1
+        self._count(enqueued=enqueued, dropped=dropped)
+
+    def _put(self, row):
+        try:
+            if self.overflow_policy == "block":
+                self._queue.put(row, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            if self.overflow_policy != "drop_oldest":
+                return False
+        try:
+            self._queue.get_nowait()
+            self._count(dropped=1)
+        except queue.Empty:
+            pass
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            return False
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["queue_capacity"] = self._queue.maxsize
+        stats["segments"] = self.segments.segments
+        return stats
+
+    def close(self, timeout=10.0):
+        """Flush everything still queued, then stop the worker (waits up to timeout seconds)."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    # ---------- worker side ----------
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for name, value in increments.items():
+                self._stats[name] += value
+
+    def _run(self):
+        batch, deadline = [], None
+        while True:
+            stopping = self._stop.is_set()
+            if stopping and not batch and self._queue.empty():
+                self._close_segment()
+                return
+
+            wait = 0.1 if deadline is None else min(0.1, max(0.0, deadline - time.monotonic()))
+            try:
+                batch.append(self._queue.get(timeout=wait))
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            except queue.Empty:
+                pass
+
+            full = len(batch) >= self.batch_size
+            due = deadline is not None and time.monotonic() >= deadline
+            drained = stopping and self._queue.empty()
+            if batch and (full or due or drained):
+                self._flush(batch)
+                batch, deadline = [], None
+            elif not batch:
+                self._rotate_if_due()
+
+    def _flush(self, batch):
+        try:
+            self._write_batch(batch)
+            self._count(written=len(batch), flushes=1)
+        except Exception as e:
+            print(f"❌ Error while writing input log segment: {e}")
+            self._count(failed=len(batch), flushes=1)
+
+    def _write_batch(self, batch):
+        self.segments.write(batch)
+
+    def _rotate_if_due(self):
+        try:
+            self.segments.rotate_if_due()
+        except Exception as e:
+            print(f"❌ Error while closing input log segment: {e}")
+
+    def _close_segment(self):
+        try:
+            self.segments.close()
+        except Exception as e:
+            print(f"❌ Error while closing input log segment: {e}")
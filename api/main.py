@@ -1,126 +1,304 @@
 print("✅ FastAPI app is starting...")
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from pydantic import BaseModel, ValidationError
+from typing import Any, Dict, List
 import traceback
-import pandas as pd
-
-from predictor import predict_price
-from preprocessing import preprocess_user_input
-import mysql.connector
-from mysql.connector import Error
-import os
-import csv
+import json
+import threading
+import time
+
+from artifacts import artifact_cache, ArtifactsNotLoadedError
+from predictor import scale_encoded, predict_scaled, predict_encoded, warm_up
+from input_logger import InputLogger
+from registry_poller import RegistryPoller
+from prediction_cache import build_prediction_cache, canonical_key
+from micro_batcher import build_micro_batcher
+from inference_executor import build_inference_executor, ExecutorSaturatedError
+from shadow import build_shadow_scorer
+from bulk_scoring import (stream_format, iter_record_chunks, format_results, csv_header,
+                          BodyStreamingResponse, CSV, RESPONSE_MEDIA_TYPES)
+from arrow_scoring import (ARROW_STREAM, ArrowInputError, is_arrow, read_table, check_columns, null_errors,
+                           encoder_columns, result_table, write_table)
+from metrics import (CONTENT_TYPE, REQUESTS, REQUEST_ERRORS, REQUEST_SECONDS, STAGE_SECONDS, IN_FLIGHT,
+                     MODEL_INFO, MODEL_SWAPS, INPUT_LOG_QUEUE_DEPTH, INPUT_LOG_ROWS,
+                     PREDICTION_CACHE_LOOKUPS, PREDICTION_CACHE_SIZE, child, publish_total, render)
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 
+# Prediction inputs are written to rotating Parquet segments by a background worker
+input_logger = InputLogger()
 
-app = FastAPI()
+# New registry versions are picked up in the background and hot-swapped in
+MODEL_POLL_INTERVAL_SECONDS = 60
+# How long a request waits for the first model load before returning 503. Kept well under a
+# second: while the registry is unreachable each waiting request holds a threadpool thread
+MODEL_LOAD_WAIT_SECONDS = 0.25
+registry_poller = RegistryPoller(artifact_cache, interval=MODEL_POLL_INTERVAL_SECONDS)
 
+# Repeated quotes for the same flat and model skip the model entirely (None = disabled)
+prediction_cache = build_prediction_cache()
+
+# Concurrent /predict calls share one model call per window (None = disabled, the default)
+micro_batcher = build_micro_batcher(predict_scaled)
+
+# CPU-bound scoring for /predict/async, off the event loop and bounded
+inference_executor = build_inference_executor()
+
+
+def load_shadow_artifacts(version):
+    """Snapshot of one registry version for shadow scoring, warmed up like a served model."""
+    artifacts = artifact_cache.load(version, artifact_cache.version_uri(version))
+    warm_up(artifacts)
+    return artifacts
+
+
+# A sampled share of /predict requests is re-scored by SHADOW_MODEL_VERSION off the request path
+# and compared with the served prediction (None = disabled, the default)
+shadow_scorer = build_shadow_scorer(load_shadow_artifacts, predict_encoded)
+
+
+# Set once shutdown begins, so /ready fails and load balancers stop routing here while requests drain
+shutting_down = threading.Event()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    shutting_down.clear()
+    registry_poller.start()
+    input_logger.start()
+    # Started here, i.e. in every worker and never in a gunicorn master
+    service_metrics_stop.clear()
+    publisher = threading.Thread(target=run_service_metrics_publisher, name="service-metrics", daemon=True)
+    publisher.start()
+    if micro_batcher is not None:
+        micro_batcher.start()
+    inference_executor.start()
+    if shadow_scorer is not None:
+        shadow_scorer.start()
+    yield
+    shutting_down.set()
+    service_metrics_stop.set()
+    registry_poller.stop()
+    if micro_batcher is not None:
+        micro_batcher.stop()
+    inference_executor.shutdown()
+    if shadow_scorer is not None:
+        shadow_scorer.stop()
+    # Flush whatever is still queued before the process exits
+    input_logger.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+# Each worker pushes its service stats into the metrics this often (and on every scrape it answers)
+SERVICE_METRICS_INTERVAL_SECONDS = 1.0
+served_model_labels = None
+service_metrics_stop = threading.Event()
+
+
+def publish_service_metrics():
+    """
+    Copy the served model and the logger/cache stats those objects already keep
+    into this process's metrics.
+    """
+    global served_model_labels
+    current = artifact_cache.current
+    if current is not None:
+        labels = (artifact_cache.model_name, current.version, current.checksum[:12])
+        if labels != served_model_labels:
+            if served_model_labels is not None:
+                # Zeroed rather than removed: multiprocess mode can't delete a series
+                MODEL_INFO.labels(*served_model_labels).set(0)
+            MODEL_INFO.labels(*labels).set(1)
+            served_model_labels = labels
+    publish_total(MODEL_SWAPS, "swaps", registry_poller.swaps)
+
+    logger_stats = input_logger.stats()
+    INPUT_LOG_QUEUE_DEPTH.set(logger_stats["queue_depth"])
+    for outcome in ("enqueued", "dropped", "written", "failed"):
+        publish_total(child(INPUT_LOG_ROWS, outcome), f"input_log_{outcome}", logger_stats[outcome])
+
+    if prediction_cache is not None:
+        cache_stats = prediction_cache.stats()
+        PREDICTION_CACHE_SIZE.set(cache_stats["size"])
+        for result, stat in (("local_hit", "local_hits"), ("shared_hit", "shared_hits"), ("miss", "misses")):
+            publish_total(child(PREDICTION_CACHE_LOOKUPS, result), f"cache_{stat}", cache_stats[stat])
 
-def save_input_to_mysql(df_input):
-    try:
-        TARGET_DB_CONFIG = {
-            "host": "localhost",
-            "user": "root",
-            "password": "root",
-            "database": "housing_db", 
-            "port": 3307  # Specify the port if it's different from the default
-        }
 
-        conn = mysql.connector.connect(**TARGET_DB_CONFIG)
-        cur = conn.cursor()
-        datetime_now = datetime.now()
-
-        # Extract row data from DataFrame (first row)
-        row = df_input.iloc[0]
-        # Insert the row into the 'property_data' table
-        cur.execute('''
-            INSERT INTO input_data (
-                build_year, size_sqft, size_per_room, bed_bath_ratio, is_central, is_mature_town,
-                age_size_interaction, n_rooms_HDB_4_Room, n_rooms_HDB_5PA_Premium_Apartment,
-                district_Balestier_Toa_Payoh_Serangoon, district_Geylang_Eunos,
-                district_Hillview_Dairy_Farm_Bukit_Panjang_Choa_Chu_Kang, district_Jurong,
-                district_Queenstown_Tiong_Bahru, district_Telok_Blangah_Harbourfront,
-                region_East, region_North, region_West, area_Hougang, area_Marine_Parade, input_datetime
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ''', (
-            row['build_year'], row['size_sqft'], row['size_per_room'], row['bed_bath_ratio'],
-            row['is_central'], row['is_mature_town'], row['age_size_interaction'],
-            row['n_rooms_HDB 4-Room'], row['n_rooms_HDB 5PA (Premium Apartment)'],
-            row['district_Balestier, Toa Payoh, Serangoon'], row['district_Geylang, Eunos'],
-            row['district_Hillview, Dairy Farm, Bukit Panjang, Choa Chu Kang'], row['district_Jurong'],
-            row['district_Queenstown, Tiong Bahru'], row['district_Telok Blangah, Harbourfront'],
-            row['region_East'], row['region_North'], row['region_West'],
-            row['area_Hougang'], row['area_Marine Parade'], datetime_now
-        ))
-
-        
-        conn.commit()
-
-
-
-        # Write the data to a CSV file
-        # Get root directory path relative to current file
-        root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-        csv_filename = os.path.join(root_dir, 'housing_loader_package', 'user_input_data.csv')
-       
-        
-        # Check if the file is empty, and if it doesn't, write the header
-        file_exists = os.path.isfile(csv_filename) and os.path.getsize(csv_filename) > 0
-
-
-        
-        # Write data to CSV (append if file already exists, otherwise write a new file)
-        with open(csv_filename, mode='a', newline='') as file:
-            writer = csv.writer(file)
-            # Write header if the file is new
-            if not file_exists:
-                writer.writerow([
-                    'build_year', 'size_sqft', 'size_per_room', 'bed_bath_ratio', 'is_central', 
-                    'is_mature_town', 'age_size_interaction', 'n_rooms_HDB_4_Room', 
-                    'n_rooms_HDB_5PA_Premium_Apartment', 'district_Balestier_Toa_Payoh_Serangoon', 
-                    'district_Geylang_Eunos', 'district_Hillview_Dairy_Farm_Bukit_Panjang_Choa_Chu_Kang', 
-                    'district_Jurong', 'district_Queenstown_Tiong_Bahru', 
-                    'district_Telok_Blangah_Harbourfront', 'region_East', 'region_North', 
-                    'region_West', 'area_Hougang', 'area_Marine_Parade', 'input_datetime'
-                ])
-            # Write the row data to the CSV
-            writer.writerow([
-                row['build_year'], row['size_sqft'], row['size_per_room'], row['bed_bath_ratio'],
-                row['is_central'], row['is_mature_town'], row['age_size_interaction'],
-                row['n_rooms_HDB 4-Room'], row['n_rooms_HDB 5PA (Premium Apartment)'],
-                row['district_Balestier, Toa Payoh, Serangoon'], row['district_Geylang, Eunos'],
-                row['district_Hillview, Dairy Farm, Bukit Panjang, Choa Chu Kang'], row['district_Jurong'],
-                row['district_Queenstown, Tiong Bahru'], row['district_Telok Blangah, Harbourfront'],
-                row['region_East'], row['region_North'], row['region_West'],
-                row['area_Hougang'], row['area_Marine Parade'], datetime_now
-            ])
-        
-
-
-        cur.close()
-        conn.close()
-        print("Input data inserted into database!")
-
-
-
-    except Error as e:
-        print(f"❌ Error while inserting to MySQL: {e}")
-    finally:
-        if 'cur' in locals() and cur:
-            cur.close()
-        if 'conn' in locals() and conn and conn.is_connected():
-            conn.close()
+def run_service_metrics_publisher():
+    while not service_metrics_stop.wait(SERVICE_METRICS_INTERVAL_SECONDS):
+        try:
+            publish_service_metrics()
+        except Exception as e:
+            print(f"❌ Publishing service metrics failed: {e}")
 
 
+# Upper bound on rows accepted by /predict/batch in a single request
+MAX_BATCH_SIZE = 10000
 
+# Upper bound on rows accepted by /predict/arrow; no per-row objects are built, so it can be much larger
+MAX_ARROW_BATCH_ROWS = 200000
+
+# /predict/stream parses and scores this many rows at a time; memory is bounded by it, not by upload size
+STREAM_CHUNK_ROWS = 5000
+# Longest single NDJSON/CSV line accepted by /predict/stream
+STREAM_MAX_LINE_BYTES = 65536
+
+# Model features persisted to input_data, in table column order
+INPUT_LOG_FEATURES = [
+    'build_year', 'size_sqft', 'size_per_room', 'bed_bath_ratio', 'is_central', 'is_mature_town',
+    'age_size_interaction', 'n_rooms_HDB 4-Room', 'n_rooms_HDB 5PA (Premium Apartment)',
+    'district_Balestier, Toa Payoh, Serangoon', 'district_Geylang, Eunos',
+    'district_Hillview, Dairy Farm, Bukit Panjang, Choa Chu Kang', 'district_Jurong',
+    'district_Queenstown, Tiong Bahru', 'district_Telok Blangah, Harbourfront',
+    'region_East', 'region_North', 'region_West', 'area_Hougang', 'area_Marine Parade'
+]
+
+
+def log_inputs(X_input, encoder):
+    """Queue the encoded rows for the input logger; returns immediately."""
+    datetime_now = datetime.now()
+
+    # Extract row data from the encoded matrix (one tuple per row, in INPUT_LOG_FEATURES order).
+    # tolist() converts the whole block to Python floats in one C call
+    log_index = encoder.columns_index(INPUT_LOG_FEATURES)
+    rows = [(*row, datetime_now) for row in X_input[:, log_index].tolist()]
+    input_logger.log_rows(rows)
+
+
+# nginx's "client closed request", for streams the client abandoned part-way
+CLIENT_CLOSED_STATUS = "499"
+
+
+class track_request:
+    """
+    Request-level metrics for one prediction handler: in-flight gauge, latency,
+    and counts by status and model version. Handlers set labels["model_version"]
+    once they hold an artifact snapshot. A plain class rather than a
+    @contextmanager generator, to keep the per-request cost down.
+    """
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.labels = {"model_version": "none"}
+
+    def __enter__(self):
+        child(IN_FLIGHT, self.endpoint).inc()
+        self.start = time.perf_counter()
+        return self.labels
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        child(IN_FLIGHT, self.endpoint).dec()
+        if exc is None:
+            # Streaming handlers can't raise once the response has started, so they set it
+            status = self.labels.get("status", "200")
+        elif isinstance(exc, GeneratorExit):
+            # A streaming response closed because the client went away: not a server error
+            status = CLIENT_CLOSED_STATUS
+        elif isinstance(exc, HTTPException):
+            status = str(exc.status_code)
+            child(REQUEST_ERRORS, self.endpoint, type(exc.__cause__ or exc).__name__).inc()
+        else:
+            status = "500"
+            child(REQUEST_ERRORS, self.endpoint, type(exc).__name__).inc()
+        child(REQUEST_SECONDS, self.endpoint, status).observe(elapsed)
+        child(REQUESTS, self.endpoint, status, self.labels["model_version"]).inc()
+
+
+def stage_timer(endpoint, artifacts, stage):
+    """Context manager timing one stage of a prediction handler."""
+    return child(STAGE_SECONDS, endpoint, stage, artifacts.version).time()
 
 
 @app.get("/")
 def home():
     return {"message": "🏡 Housing Price Prediction API is live!"}
 
+@app.get("/live")
+def live():
+    """Liveness: the process is up and answering. Says nothing about the model."""
+    return {"status": "alive"}
+
+@app.get("/ready")
+def ready():
+    """
+    Readiness: 200 once a model, scaler and feature list are loaded and have been
+    warmed up (artifacts.ArtifactCache.ready), 503 before that and during shutdown.
+    Hot-swaps warm the new model up before it replaces the old one, so a ready
+    worker stays ready across them.
+    """
+    if shutting_down.is_set():
+        return JSONResponse(status_code=503, content={"status": "shutting_down"})
+    if not artifact_cache.ready:
+        return JSONResponse(status_code=503, content={
+            "status": "loading",
+            "last_error": registry_poller.last_error
+        })
+    current = artifact_cache.current
+    return {
+        "status": "ready",
+        "model_version": current.version,
+        "loaded_at": current.loaded_at,
+        "warmup_seconds": artifact_cache.warmup_seconds
+    }
+
+@app.get("/model")
+def model_info():
+    current = artifact_cache.current
+    return {
+        "model_name": artifact_cache.model_name,
+        "model_version": current.version if current else None,
+        "model_uri": current.model_uri if current else None,
+        "artifacts_checksum": current.checksum if current else None,
+        "compiled": current.compiled is not None if current else None,
+        "loaded_at": current.loaded_at if current else None,
+        "last_poll": registry_poller.last_poll,
+        "last_error": registry_poller.last_error,
+        "swaps": registry_poller.swaps
+    }
+
+@app.get("/prediction-cache/stats")
+def prediction_cache_stats():
+    if prediction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_cache.stats()}
+
+@app.get("/micro-batcher/stats")
+def micro_batcher_stats():
+    if micro_batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **micro_batcher.stats()}
+
+
+@app.get("/shadow/stats")
+def shadow_stats(primary_version: str = None, shadow_version: str = None):
+    """Shadow comparison per (primary, shadow) version pair, optionally filtered to one pair."""
+    if shadow_scorer is None:
+        return {"enabled": False}
+    return {"enabled": True, **shadow_scorer.stats(primary_version, shadow_version)}
+
+
+@app.get("/inference-executor/stats")
+def inference_executor_stats():
+    return inference_executor.stats()
+
+
+@app.get("/input-logger/stats")
+def input_logger_stats():
+    return input_logger.stats()
+
+@app.get("/metrics")
+def metrics():
+    publish_service_metrics()
+    return Response(content=render(), media_type=CONTENT_TYPE)
+
 class InputData(BaseModel):
     build_year: int
     size_sqft: float
@@ -131,27 +309,276 @@ class InputData(BaseModel):
     region: str
     n_rooms: str
 
+class BatchInputData(BaseModel):
+    # Rows are validated one by one so a bad row doesn't reject the whole batch
+    inputs: List[Dict[str, Any]]
+
+
+def format_prediction(prediction):
+    return {
+        "predicted_price": round(prediction, 2),
+        "price_range": {
+            "lower": round(prediction * 0.95, 2),
+            "upper": round(prediction * 1.05, 2)
+        }
+    }
+
+
+def current_artifacts():
+    """Artifact snapshot for one request; 503 until the first model has loaded."""
+    try:
+        return artifact_cache.get(wait=MODEL_LOAD_WAIT_SECONDS)
+    except ArtifactsNotLoadedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def predict_one(input_dict, artifacts, endpoint):
+    """Price for one validated input on one artifact snapshot: encode, cache, model, input log."""
+    with stage_timer(endpoint, artifacts, "encode"):
+        X_input = artifacts.encoder.encode(input_dict)
+
+    prediction = None
+    if prediction_cache is not None:
+        with stage_timer(endpoint, artifacts, "cache_lookup"):
+            # Keyed on the model version too, so a hot-swap invalidates every entry
+            cache_key = canonical_key(input_dict, artifacts.key)
+            prediction = prediction_cache.get(cache_key)
+    if prediction is None:
+        with stage_timer(endpoint, artifacts, "scale"):
+            X_scaled = scale_encoded(X_input, artifacts)
+        with stage_timer(endpoint, artifacts, "model"):
+            if micro_batcher is not None:
+                prediction = micro_batcher.predict(X_scaled, artifacts)
+            else:
+                prediction = float(predict_scaled(X_scaled, artifacts)[0])
+        if prediction_cache is not None:
+            prediction_cache.put(cache_key, prediction)
+
+    with stage_timer(endpoint, artifacts, "log"):
+        log_inputs(X_input, artifacts.encoder)
+    if shadow_scorer is not None and shadow_scorer.sample():
+        shadow_scorer.submit(input_dict, prediction, artifacts.version)
+    return prediction
+
+
 @app.post("/predict")
 def predict(data: InputData):
-    try:
-        # Import inside the function to avoid crashing app during startup
+    with track_request("/predict") as labels:
+        # One artifact snapshot per request: encoding and prediction always agree, and a
+        # hot-swap mid-request doesn't affect it
+        artifacts = current_artifacts()
+        labels["model_version"] = artifacts.version
+        try:
+            prediction = predict_one(data.dict(), artifacts, "/predict")
+            return {**format_prediction(prediction), "model_version": artifacts.version}
+        except Exception as e:
+            print("❌ Backend exception:")
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}") from e
+
 
+@app.post("/predict/async")
+async def predict_async(data: InputData):
+    """
+    /predict as a coroutine. The handler itself never blocks the event loop:
+    scoring (and the input log hand-off) runs on the bounded inference_executor,
+    which sheds load with 503 when full and gives up with 504 after
+    INFERENCE_TIMEOUT_SECONDS. Same response as /predict.
+    """
+    with track_request("/predict/async") as labels:
+        # The loaded snapshot is a plain attribute read; only the first-load wait needs a thread
+        artifacts = artifact_cache.current or await run_in_threadpool(current_artifacts)
+        labels["model_version"] = artifacts.version
+        try:
+            prediction = await inference_executor.run(predict_one, data.dict(), artifacts, "/predict/async")
+            return {**format_prediction(prediction), "model_version": artifacts.version}
+        except ExecutorSaturatedError as e:
+            raise HTTPException(status_code=503, detail=str(e)) from e
+        except TimeoutError as e:
+            raise HTTPException(status_code=504, detail=str(e)) from e
+        except Exception as e:
+            print("❌ Backend exception:")
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}") from e
 
-        input_dict = data.dict()
-        df_input = preprocess_user_input(input_dict)
-        prediction = predict_price(df_input)
-        save_input_to_mysql(df_input)
 
-        print(df_input.columns)
+@app.post("/predict/batch")
+def predict_batch(batch: BatchInputData):
+    with track_request("/predict/batch") as labels:
+        n_rows = len(batch.inputs)
+        if n_rows > MAX_BATCH_SIZE:
+            raise HTTPException(status_code=413, detail=f"Batch too large: {n_rows} rows (max {MAX_BATCH_SIZE})")
 
-        return {
-            "predicted_price": round(prediction, 2),
-            "price_range": {
-                "lower": round(prediction * 0.95, 2),
-                "upper": round(prediction * 1.05, 2)
+        start = time.perf_counter()
+        results = [None] * n_rows
+        valid_rows, valid_index = [], []
+        for i, row in enumerate(batch.inputs):
+            try:
+                valid_rows.append(InputData(**row).dict())
+                valid_index.append(i)
+            except ValidationError as e:
+                results[i] = {"index": i, "error": json.loads(e.json())}
+        validate_seconds = time.perf_counter() - start
+
+        artifacts = current_artifacts()
+        labels["model_version"] = artifacts.version
+        child(STAGE_SECONDS, "/predict/batch", "validate", artifacts.version).observe(validate_seconds)
+        try:
+            if valid_rows:
+                # One encoded matrix, one scaling pass and one model.predict for the whole batch
+                with stage_timer("/predict/batch", artifacts, "encode"):
+                    X_input = artifacts.encoder.encode_batch(valid_rows)
+                with stage_timer("/predict/batch", artifacts, "scale"):
+                    X_scaled = scale_encoded(X_input, artifacts)
+                with stage_timer("/predict/batch", artifacts, "model"):
+                    predictions = predict_scaled(X_scaled, artifacts)
+                with stage_timer("/predict/batch", artifacts, "log"):
+                    log_inputs(X_input, artifacts.encoder)
+
+                for i, prediction in zip(valid_index, predictions):
+                    results[i] = {"index": i, **format_prediction(float(prediction))}
+
+            return {
+                "results": results,
+                "n_rows": n_rows,
+                "n_failed": n_rows - len(valid_index),
+                "model_version": artifacts.version
             }
-        }
-    except Exception as e:
-        print("❌ Backend exception:")
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+        except Exception as e:
+            print("❌ Backend exception:")
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}") from e
+
+
+def score_arrow(body, artifacts):
+    """
+    Score one /predict/arrow body: an Arrow IPC stream in, an Arrow IPC stream
+    of results out. Columns go straight from the Arrow buffers into the encoder;
+    rows with a null input get an error instead of a price.
+    """
+    with stage_timer("/predict/arrow", artifacts, "decode"):
+        table = read_table(body)
+        if table.num_rows > MAX_ARROW_BATCH_ROWS:
+            raise HTTPException(status_code=413,
+                                detail=f"Batch too large: {table.num_rows} rows (max {MAX_ARROW_BATCH_ROWS})")
+        check_columns(table)
+        valid, errors = null_errors(table)
+        complete = table if errors is None else table.filter(valid)
+        columns = encoder_columns(complete)
+
+    predictions = []
+    if complete.num_rows:
+        with stage_timer("/predict/arrow", artifacts, "encode"):
+            X_input = artifacts.encoder.encode_columns(columns)
+        with stage_timer("/predict/arrow", artifacts, "scale"):
+            X_scaled = scale_encoded(X_input, artifacts)
+        with stage_timer("/predict/arrow", artifacts, "model"):
+            predictions = predict_scaled(X_scaled, artifacts)
+        with stage_timer("/predict/arrow", artifacts, "log"):
+            log_inputs(X_input, artifacts.encoder)
+
+    with stage_timer("/predict/arrow", artifacts, "respond"):
+        return write_table(result_table(predictions, valid, errors))
+
+
+@app.post("/predict/arrow")
+async def predict_arrow(request: Request):
+    """
+    Batch scoring over Arrow IPC (application/vnd.apache.arrow.stream): one
+    column per /predict field in, and a table of predicted_price, lower, upper
+    and error out, one row per input row in the same order. Same model snapshot,
+    input logging and per-row errors as /predict/batch, without JSON or pydantic
+    objects in between. See arrow_client.py for the client side.
+    """
+    if not is_arrow(request.headers.get("content-type")):
+        raise HTTPException(status_code=415, detail=f"Send {ARROW_STREAM}")
+
+    with track_request("/predict/arrow") as labels:
+        body = await request.body()
+        artifacts = await run_in_threadpool(current_artifacts)
+        labels["model_version"] = artifacts.version
+        try:
+            # Decoding and scoring are CPU work: keep them off the event loop
+            content = await run_in_threadpool(score_arrow, body, artifacts)
+        except ArrowInputError as e:
+            raise HTTPException(status_code=422, detail=str(e)) from e
+        except HTTPException:
+            raise
+        except Exception as e:
+            print("❌ Backend exception:")
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=f"Arrow batch prediction failed: {str(e)}") from e
+
+    return Response(content, media_type=ARROW_STREAM, headers={"X-Model-Version": str(artifacts.version)})
+
+
+def score_records(chunk, artifacts):
+    """
+    Validate and score one parsed /predict/stream chunk of (index, record) pairs.
+    Results have the same shape as /predict/batch: a price or a per-row error.
+    """
+    results = [None] * len(chunk)
+    valid_rows, valid_pos = [], []
+    for pos, (index, record) in enumerate(chunk):
+        if isinstance(record, str):
+            results[pos] = {"index": index, "error": record}
+            continue
+        try:
+            valid_rows.append(InputData(**record).dict())
+            valid_pos.append(pos)
+        except ValidationError as e:
+            results[pos] = {"index": index, "error": json.loads(e.json())}
+
+    if valid_rows:
+        with stage_timer("/predict/stream", artifacts, "encode"):
+            X_input = artifacts.encoder.encode_batch(valid_rows)
+        with stage_timer("/predict/stream", artifacts, "scale"):
+            X_scaled = scale_encoded(X_input, artifacts)
+        with stage_timer("/predict/stream", artifacts, "model"):
+            predictions = predict_scaled(X_scaled, artifacts)
+        for pos, prediction in zip(valid_pos, predictions):
+            results[pos] = {"index": chunk[pos][0], **format_prediction(float(prediction))}
+    return results
+
+
+async def stream_predictions(byte_chunks, fmt, artifacts):
+    with track_request("/predict/stream") as labels:
+        labels["model_version"] = artifacts.version
+        if fmt == CSV:
+            yield csv_header()
+        try:
+            async for chunk in iter_record_chunks(byte_chunks, fmt, STREAM_CHUNK_ROWS, STREAM_MAX_LINE_BYTES):
+                # Scoring is CPU work: keep it off the event loop
+                results = await run_in_threadpool(score_records, chunk, artifacts)
+                yield format_results(results, fmt)
+        except ClientDisconnect:
+            # Client went away while still uploading: nobody is left to answer
+            labels["status"] = CLIENT_CLOSED_STATUS
+        except Exception as e:
+            print("❌ Backend exception:")
+            traceback.print_exc()
+            labels["status"] = "500"
+            child(REQUEST_ERRORS, "/predict/stream", type(e).__name__).inc()
+            # Headers are already sent: report the failure as a final record
+            yield format_results([{"index": None, "error": f"Stream scoring failed: {str(e)}"}], fmt)
+
+
+@app.post("/predict/stream")
+async def predict_stream(request: Request):
+    """
+    Bulk scoring of an NDJSON (application/x-ndjson) or CSV (text/csv) upload.
+    The body is read, scored and answered STREAM_CHUNK_ROWS rows at a time in
+    the same format, one result per input row. The whole stream is scored by one
+    model snapshot, reported in the X-Model-Version header. Bulk rows are not
+    written to the input log.
+    """
+    fmt = stream_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Send application/x-ndjson or text/csv")
+
+    artifacts = await run_in_threadpool(current_artifacts)
+    return BodyStreamingResponse(
+        stream_predictions(request.stream(), fmt, artifacts),
+        media_type=RESPONSE_MEDIA_TYPES[fmt],
+        headers={"X-Model-Version": str(artifacts.version)}
+    )
@@ -0,0 +1,88 @@
+# metrics.py
+import os
+import threading
+
+from prometheus_client import (REGISTRY, CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge,
+                               Histogram, generate_latest, multiprocess)
+
+# Set (by gunicorn.conf.py, or by hand) when the API runs as several worker processes.
+# prometheus_client then keeps every value in per-process files in this directory, and
+# /metrics merges them, so whichever worker answers a scrape reports the whole server.
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Latency buckets in seconds: the hot path is tens of microseconds, batches and
+# first loads can take seconds
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = Counter(
+    "housing_api_requests_total", "Prediction requests by endpoint, HTTP status and model version.",
+    ["endpoint", "status", "model_version"])
+REQUEST_ERRORS = Counter(
+    "housing_api_request_errors_total", "Failed prediction requests by endpoint and exception type.",
+    ["endpoint", "error"])
+REQUEST_SECONDS = Histogram(
+    "housing_api_request_duration_seconds", "End-to-end prediction handler latency.",
+    ["endpoint", "status"], buckets=LATENCY_BUCKETS)
+STAGE_SECONDS = Histogram(
+    "housing_api_stage_duration_seconds",
+    "Latency of each prediction stage (validate, encode, cache_lookup, scale, model, log).",
+    ["endpoint", "stage", "model_version"], buckets=LATENCY_BUCKETS)
+IN_FLIGHT = Gauge(
+    "housing_api_requests_in_flight", "Prediction requests currently being handled.",
+    ["endpoint"], multiprocess_mode="livesum")
+
+# Service state tracked elsewhere (artifact cache, registry poller, input logger,
+# prediction cache), published into these by main.publish_service_metrics
+MODEL_INFO = Gauge(
+    "housing_api_model_info", "Model version currently served (one series per worker under gunicorn).",
+    ["model_name", "model_version", "artifacts_checksum"], multiprocess_mode="liveall")
+MODEL_SWAPS = Counter(
+    "housing_api_model_swaps_total", "Model hot-swaps done by the registry poller.")
+INPUT_LOG_QUEUE_DEPTH = Gauge(
+    "housing_api_input_log_queue_depth", "Input rows waiting to be written.",
+    multiprocess_mode="livesum")
+INPUT_LOG_ROWS = Counter(
+    "housing_api_input_log_rows_total", "Input rows by logging outcome.", ["outcome"])
+PREDICTION_CACHE_LOOKUPS = Counter(
+    "housing_api_prediction_cache_lookups_total", "Prediction cache lookups by result.", ["result"])
+PREDICTION_CACHE_SIZE = Gauge(
+    "housing_api_prediction_cache_size", "Entries in the in-process prediction caches.",
+    multiprocess_mode="livesum")
+
+_children = {}
+_published = {}
+_publish_lock = threading.Lock()
+
+
+def child(metric, *labels):
+    """
+    metric.labels(*labels), memoised: prometheus_client's labels() stringifies and
+    takes a lock on every call, which adds up over the six or so stages per request.
+    """
+    key = (metric, labels)
+    found = _children.get(key)
+    if found is None:
+        found = _children[key] = metric.labels(*labels)
+    return found
+
+
+def publish_total(counter, key, total):
+    """Advance a Counter to a running total kept elsewhere (e.g. InputLogger.stats())."""
+    with _publish_lock:
+        delta = total - _published.get(key, 0)
+        if delta > 0:
+            counter.inc(delta)
+            _published[key] = total
+
+
+def render(path=None):
+    """Exposition text for /metrics, merged across worker processes in multiprocess mode."""
+    path = path or MULTIPROC_DIR
+    if path:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=path)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
@@ -0,0 +1,139 @@
+# micro_batcher.py
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-row predictions into one model call.
+
+    Request threads hand over a scaled (1, n_features) row and block on a
+    Future. A single background worker takes the first waiting row, collects
+    more for up to `window` seconds or until max_batch_size rows, stacks them
+    into one matrix per artifact snapshot and calls predict_fn(X, artifacts)
+    once per snapshot.
+
+    With adaptive=True the worker only waits out the window while traffic is
+    concurrent (the previous batch had more than one row). A lone request is
+    dispatched with whatever is already queued, so light traffic pays no
+    batching delay.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=64, window=0.002, adaptive=True, result_timeout=30.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.window = window
+        self.adaptive = adaptive
+        self.result_timeout = result_timeout
+
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._last_size = 0
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "batches": 0, "max_batch": 0, "failed": 0}
+
+    def start(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Stop the worker once everything already queued has been answered."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def predict(self, x_row, artifacts):
+        """Prediction for one scaled row; blocks until its batch has run. Re-raises model errors."""
+        if self._thread is None:
+            self.start()
+        future = Future()
+        self._queue.put((x_row, artifacts, future))
+        return future.result(timeout=self.result_timeout)
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["mean_batch"] = round(stats["requests"] / stats["batches"], 2) if stats["batches"] else 0.0
+        stats["queue_depth"] = self._queue.qsize()
+        stats["window_ms"] = self.window * 1e3
+        stats["max_batch_size"] = self.max_batch_size
+        return stats
+
+    # ---------- worker side ----------
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            self._dispatch(self._collect(first))
+
+    def _collect(self, first):
+        batch = [first]
+        wait = self.window if (not self.adaptive or self._last_size > 1) else 0.0
+        deadline = time.monotonic() + wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._last_size = len(batch)
+        return batch
+
+    def _dispatch(self, batch):
+        # A hot-swap can land mid-window: each snapshot is scored with its own model
+        groups = {}
+        for item in batch:
+            groups.setdefault(id(item[1]), []).append(item)
+        failed = 0
+        for items in groups.values():
+            artifacts = items[0][1]
+            try:
+                predictions = self.predict_fn(np.vstack([x_row for x_row, _, _ in items]), artifacts)
+                for (_, _, future), prediction in zip(items, predictions):
+                    future.set_result(float(prediction))
+            except Exception as e:
+                failed += len(items)
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+        with self._stats_lock:
+            self._stats["requests"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+            self._stats["failed"] += failed
+
+
+def build_micro_batcher(predict_fn):
+    """
+    MicroBatcher configured from the environment, or None if disabled:
+      PREDICT_BATCH_WINDOW_MS    how long to gather concurrent /predict rows, 0 disables (default 0)
+      PREDICT_BATCH_MAX_SIZE     rows per model call at most (default 64)
+      PREDICT_BATCH_ADAPTIVE     "0" to always wait out the window (default 1)
+    """
+    window_ms = float(os.environ.get("PREDICT_BATCH_WINDOW_MS", "0"))
+    if window_ms <= 0:
+        return None
+    return MicroBatcher(
+        predict_fn,
+        max_batch_size=int(os.environ.get("PREDICT_BATCH_MAX_SIZE", "64")),
+        window=window_ms / 1e3,
+        adaptive=os.environ.get("PREDICT_BATCH_ADAPTIVE", "1") != "0",
+    )
@@ -0,0 +1,206 @@
+# model_bundle.py
+"""
+Self-contained, versioned copy of a registered model for serving without MLflow:
+
+    cd api && python model_bundle.py                     # export the latest version
+    cd api && python model_bundle.py --model-version 3 --out /srv/bundles
+    MODEL_BUNDLE_DIR=bundles/lightgbm_model uvicorn main:app
+
+A bundle is one directory per version:
+
+    bundles/lightgbm_model/3/
+        manifest.json              name, version, source run URI, sha256 of every file
+        model.txt                  native LightGBM booster (lightgbm flavor), or
+        mlflow_model/              the downloaded MLflow model (any other flavor)
+        compiled/                  compiled model (compiled_model.py), if the version has one
+        scaler.joblib
+        selected_features.joblib
+
+LightGBM bundles load with lightgbm alone. Bundles of other flavors still need
+mlflow to load, but never the tracking server.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from types import SimpleNamespace
+
+import joblib
+import numpy as np
+
+from artifacts import (BASE_DIR, MODEL_NAME, SCALER_PATH, SELECTED_FEATURES_PATH, ModelArtifacts, artifact_cache,
+                       checksum, read_files)
+
+BUNDLES_DIR = os.path.join(BASE_DIR, "bundles", MODEL_NAME)
+
+MANIFEST = "manifest.json"
+BOOSTER_FILE = "model.txt"
+MLFLOW_MODEL_DIR = "mlflow_model"
+SCALER_FILE = "scaler.joblib"
+SELECTED_FEATURES_FILE = "selected_features.joblib"
+COMPILED_DIR = "compiled"
+
+
+class BundleIntegrityError(ValueError):
+    """A bundle file is missing or does not match the checksum in its manifest."""
+
+
+class BundledBoosterModel:
+    """
+    pyfunc-shaped wrapper around a bundled lightgbm.Booster, so ModelArtifacts
+    finds the booster for the native path and "pyfunc" mode still works.
+    """
+
+    def __init__(self, booster):
+        self.booster = booster
+        self.metadata = SimpleNamespace(flavors={"python_function": {}, "lightgbm": {}})
+
+    def get_raw_model(self):
+        return self.booster
+
+    def predict(self, X):
+        return self.booster.predict(np.asarray(X, dtype=np.float64))
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def bundle_files(bundle_dir):
+    """Paths of every file in the bundle except the manifest, relative and sorted."""
+    found = []
+    for root, _, names in os.walk(bundle_dir):
+        for name in names:
+            path = os.path.relpath(os.path.join(root, name), bundle_dir)
+            if path != MANIFEST:
+                found.append(path.replace(os.sep, "/"))
+    return sorted(found)
+
+
+def export_bundle(artifacts, out_dir=BUNDLES_DIR, model_name=MODEL_NAME,
+                  selected_features_path=SELECTED_FEATURES_PATH, scaler_path=SCALER_PATH):
+    """
+    Write a ModelArtifacts snapshot to out_dir/<version>/ and return that path.
+    The joblib files are copied byte for byte, so the bundle keeps the
+    snapshot's checksum. The bundle is assembled in a temporary directory and
+    renamed into place, so a reader never sees a half-written version.
+    """
+    features_bytes, scaler_bytes = read_files(selected_features_path, scaler_path)
+    if checksum(features_bytes, scaler_bytes) != artifacts.checksum:
+        raise ValueError("Scaler/feature files changed since the snapshot was loaded; reload before exporting")
+
+    target = os.path.join(out_dir, str(artifacts.version))
+    os.makedirs(out_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{artifacts.version}-", dir=out_dir)
+    try:
+        if artifacts.booster is not None:
+            artifacts.booster.save_model(os.path.join(staging, BOOSTER_FILE))
+            flavor = "lightgbm"
+        else:
+            from mlflow.artifacts import download_artifacts
+
+            download_artifacts(artifact_uri=artifacts.model_uri, dst_path=os.path.join(staging, MLFLOW_MODEL_DIR))
+            flavor = "pyfunc"
+        if artifacts.compiled is not None:
+            shutil.copytree(artifacts.compiled.path, os.path.join(staging, COMPILED_DIR))
+        for name, content in ((SELECTED_FEATURES_FILE, features_bytes), (SCALER_FILE, scaler_bytes)):
+            with open(os.path.join(staging, name), "wb") as f:
+                f.write(content)
+
+        manifest = {
+            "model_name": model_name,
+            "version": str(artifacts.version),
+            "source_uri": artifacts.model_uri,
+            "flavor": flavor,
+            "exported_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "files": {path: file_sha256(os.path.join(staging, path)) for path in bundle_files(staging)},
+        }
+        with open(os.path.join(staging, MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        os.replace(staging, target)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return target
+
+
+def resolve_bundle(path):
+    """A bundle directory as given, or the highest version directory under a bundles root."""
+    if os.path.exists(os.path.join(path, MANIFEST)):
+        return path
+    versions = [name for name in os.listdir(path)
+                if name.isdigit() and os.path.exists(os.path.join(path, name, MANIFEST))]
+    if not versions:
+        raise FileNotFoundError(f"No model bundle found in '{path}'")
+    return os.path.join(path, max(versions, key=int))
+
+
+def load_bundle(path):
+    """
+    ModelArtifacts from a bundle directory (or bundles root), after checking every
+    file against the manifest. Raises BundleIntegrityError on any mismatch.
+    """
+    bundle_dir = resolve_bundle(path)
+    with open(os.path.join(bundle_dir, MANIFEST)) as f:
+        manifest = json.load(f)
+
+    present = bundle_files(bundle_dir)
+    for name, expected in manifest["files"].items():
+        if name not in present:
+            raise BundleIntegrityError(f"Bundle file '{name}' is missing from {bundle_dir}")
+        if file_sha256(os.path.join(bundle_dir, name)) != expected:
+            raise BundleIntegrityError(f"Bundle file '{name}' does not match its manifest checksum")
+
+    compiled = None
+    if manifest["flavor"] == "lightgbm":
+        import lightgbm
+        from compiled_model import load_compiled
+
+        booster = lightgbm.Booster(model_file=os.path.join(bundle_dir, BOOSTER_FILE))
+        model = BundledBoosterModel(booster)
+        compiled = load_compiled(os.path.join(bundle_dir, COMPILED_DIR), booster)
+    else:
+        import mlflow.pyfunc
+
+        model = mlflow.pyfunc.load_model(os.path.join(bundle_dir, MLFLOW_MODEL_DIR))
+
+    features_bytes, scaler_bytes = read_files(os.path.join(bundle_dir, SELECTED_FEATURES_FILE),
+                                              os.path.join(bundle_dir, SCALER_FILE))
+    return ModelArtifacts(
+        version=manifest["version"],
+        checksum=checksum(features_bytes, scaler_bytes),
+        model_uri=bundle_dir,
+        model=model,
+        scaler=joblib.load(io.BytesIO(scaler_bytes)),
+        selected_features=joblib.load(io.BytesIO(features_bytes)),
+        compiled=compiled,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-version", help="Registered version to export; default the latest")
+    parser.add_argument("--out", default=BUNDLES_DIR, help="Bundles root; the bundle goes in <out>/<version>/")
+    args = parser.parse_args()
+
+    if args.model_version:
+        version, model_uri = args.model_version, artifact_cache.version_uri(args.model_version)
+    else:
+        version, model_uri = artifact_cache.latest_version()
+    target = export_bundle(artifact_cache.load(version, model_uri), args.out)
+    print(f"✅ Exported '{MODEL_NAME}' version {version} to {target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# prediction_cache.py
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def canonical_key(input_dict, model_key):
+    """
+    Stable hash of a validated InputData dict plus the served model.
+
+    Fields are sorted and numbers normalised (size_sqft as float, counts as int),
+    so the same flat always maps to the same key; model_key (version + artifact
+    checksum) makes every entry invalid as soon as a new model is swapped in.
+    """
+    canonical = {
+        "build_year": int(input_dict["build_year"]),
+        "size_sqft": float(input_dict["size_sqft"]),
+        "n_bedrooms": int(input_dict["n_bedrooms"]),
+        "n_bathrooms": int(input_dict["n_bathrooms"]),
+        "area": input_dict["area"],
+        "district": input_dict["district"],
+        "region": input_dict["region"],
+        "n_rooms": input_dict["n_rooms"],
+        "model": list(model_key),
+    }
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Bounded in-process LRU map, safe to share between request threads."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Insert or refresh an entry; returns the number of entries evicted."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            evicted = 0
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisStore:
+    """Shared second tier: plain Redis string keys with a TTL. Needs the optional `redis` package."""
+
+    def __init__(self, url, ttl_seconds=3600, prefix="housing:prediction:"):
+        import redis  # optional dependency, only needed when a shared tier is configured
+
+        self.client = redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.05)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return None if value is None else float(value)
+
+    def set(self, key, value):
+        self.client.setex(self.prefix + key, self.ttl_seconds, repr(float(value)))
+
+
+class PredictionCache:
+    """
+    Two-tier cache of predicted prices: a bounded in-process LRU (tier 1) in
+    front of an optional shared store with TTL (tier 2, e.g. RedisStore).
+
+    Tier-2 errors are counted and treated as misses, so an unavailable shared
+    store never fails a prediction. After an error the shared tier is skipped
+    for shared_backoff_seconds (a simple circuit breaker), so an outage costs
+    one timeout per backoff window instead of one per request; the first call
+    after the window probes it again.
+    """
+
+    def __init__(self, maxsize=10000, shared_store=None, shared_backoff_seconds=30.0, clock=time.monotonic):
+        self.local = LRUCache(maxsize)
+        self.shared = shared_store
+        self.shared_backoff_seconds = shared_backoff_seconds
+        self.clock = clock
+        self._shared_down_until = 0.0
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "local_hits": 0, "shared_hits": 0, "misses": 0,
+                       "evictions": 0, "shared_errors": 0, "shared_skipped": 0}
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for name, value in increments.items():
+                self._stats[name] += value
+
+    def _shared_available(self):
+        if self.shared is None:
+            return False
+        if self.clock() < self._shared_down_until:
+            self._count(shared_skipped=1)
+            return False
+        return True
+
+    def _shared_failed(self):
+        self._shared_down_until = self.clock() + self.shared_backoff_seconds
+        self._count(shared_errors=1)
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is not None:
+            self._count(hits=1, local_hits=1)
+            return value
+
+        if self._shared_available():
+            try:
+                value = self.shared.get(key)
+            except Exception:
+                self._shared_failed()
+                value = None
+            if value is not None:
+                evicted = self.local.put(key, value)
+                self._count(hits=1, shared_hits=1, evictions=evicted)
+                return value
+
+        self._count(misses=1)
+        return None
+
+    def put(self, key, value):
+        evicted = self.local.put(key, value)
+        if evicted:
+            self._count(evictions=evicted)
+        if self._shared_available():
+            try:
+                self.shared.set(key, value)
+            except Exception:
+                self._shared_failed()
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        stats["size"] = len(self.local)
+        stats["maxsize"] = self.local.maxsize
+        stats["shared_tier"] = self.shared is not None
+        stats["shared_tier_open"] = self.shared is not None and self.clock() >= self._shared_down_until
+        return stats
+
+
+def build_prediction_cache():
+    """
+    PredictionCache configured from the environment, or None if disabled:
+      PREDICTION_CACHE_SIZE         tier-1 entries, 0 disables caching (default 10000)
+      PREDICTION_CACHE_REDIS_URL    enables the shared tier, e.g. redis://redis:6379/1
+      PREDICTION_CACHE_TTL_SECONDS  shared-tier TTL (default 3600)
+      PREDICTION_CACHE_SHARED_BACKOFF_SECONDS  how long to skip the shared tier after an error (default 30)
+    """
+    maxsize = int(os.environ.get("PREDICTION_CACHE_SIZE", "10000"))
+    if maxsize <= 0:
+        return None
+
+    shared_store = None
+    redis_url = os.environ.get("PREDICTION_CACHE_REDIS_URL")
+    if redis_url:
+        try:
+            shared_store = RedisStore(redis_url, int(os.environ.get("PREDICTION_CACHE_TTL_SECONDS", "3600")))
+        except ImportError:
+            print("⚠️ redis is not installed; shared prediction cache tier disabled")
+    backoff = float(os.environ.get("PREDICTION_CACHE_SHARED_BACKOFF_SECONDS", "30"))
+    return PredictionCache(maxsize, shared_store, shared_backoff_seconds=backoff)
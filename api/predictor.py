@@ -1,45 +1,78 @@
 # predictor.py
 
 import os
-import mlflow.pyfunc
-from mlflow.tracking import MlflowClient
-import joblib
+import numpy as np
 import pandas as pd
 
-MODEL_NAME = "lightgbm_model"
-mlflow.set_tracking_uri("http://127.0.0.1:5000")
+from artifacts import artifact_cache
 
-print("✅ Fetching model from registry...")
+# Model, scaler and selected features live in the shared artifact cache, the same
+# snapshot preprocessing.py encodes against. Nothing is loaded at import time:
+# the API loads (and hot-swaps) them from registry_poller.RegistryPoller, and
+# scripts load them on first use.
 
-client = MlflowClient()
-latest_versions = client.search_model_versions(f"name='{MODEL_NAME}'")
+# "native": the compiled model (compiled_model.py) when one was loaded, else the
+#           LightGBM booster directly when the model has one (default)
+# "booster": the LightGBM booster even when a compiled model is loaded
+# "pyfunc": always go through the generic mlflow.pyfunc wrapper
+SERVING_MODE = os.environ.get("MODEL_SERVING_MODE", "native")
 
-if not latest_versions:
-    raise ValueError(f"No model versions found for model '{MODEL_NAME}'.")
+# Threads LightGBM may use per predict call; 0 keeps LightGBM's default (all cores).
+# Multi-worker deployments cap this so N workers x threads doesn't oversubscribe the CPUs.
+NUM_THREADS = int(os.environ.get("LIGHTGBM_NUM_THREADS", "0"))
 
-# Pick highest version
-latest = sorted(latest_versions, key=lambda v: int(v.version), reverse=True)[0]
-model_uri = f"runs:/{latest.run_id}/{latest.source.split('/')[-1]}"
+# Representative flats run through every newly loaded model before it serves traffic
+WARMUP_INPUTS = [
+    {"build_year": 1990, "size_sqft": 1000.0, "n_bedrooms": 3, "n_bathrooms": 2, "area": "Queenstown",
+     "district": "Queenstown, Tiong Bahru", "region": "Central", "n_rooms": "HDB 4-Room"},
+    {"build_year": 2015, "size_sqft": 1130.0, "n_bedrooms": 3, "n_bathrooms": 2, "area": "Hougang",
+     "district": "Serangoon Garden, Hougang, Ponggol", "region": "North East", "n_rooms": "HDB 5PA (Premium Apartment)"},
+    {"build_year": 1985, "size_sqft": 700.0, "n_bedrooms": 2, "n_bathrooms": 1, "area": "Jurong West",
+     "district": "Jurong", "region": "West", "n_rooms": "HDB 3-Room"},
+]
 
-# 🔥 This is where you use the model URI!
-try:
-    model = mlflow.pyfunc.load_model(model_uri)
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    JoblibsPath = os.path.join(BASE_DIR, "models_dump_for_Registry/selected_features.joblib")
-    selected_features =joblib.load(JoblibsPath)
-    #selected_features = joblib.load("models_dump_for_Registry/selected_features.joblib")
-    #scaler = joblib.load("models_dump_for_Registry/scaler.joblib")
-    JoblibsPath2 = os.path.join(BASE_DIR, "models_dump_for_Registry/scaler.joblib")
-    scaler =joblib.load(JoblibsPath2)
-except Exception as e:
-    print("❌ Error loading model or files:", e)
-
-def predict_price(user_input_df):
+def predict_prices(user_input_df, artifacts=None):
+    artifacts = artifacts or artifact_cache.get()
     # Ensure columns match and are in order
-    X_selected = user_input_df[selected_features]
-    X_scaled = scaler.transform(X_selected)
-    X_scaled_df = pd.DataFrame(X_scaled, columns=selected_features)
+    X_selected = user_input_df[artifacts.selected_features]
+    X_scaled = artifacts.scaler.transform(X_selected)
+    X_scaled_df = pd.DataFrame(X_scaled, columns=artifacts.selected_features)
+
+    # Predict every row in one call
+    return artifacts.model.predict(X_scaled_df)
+
+def predict_price(user_input_df, artifacts=None):
+    return predict_prices(user_input_df, artifacts)[0]
+
+def predict_encoded(X, artifacts=None, mode=None):
+    """Predict from a float matrix already in selected_features order (see encoder.FeatureEncoder)."""
+    artifacts = artifacts or artifact_cache.get()
+    return predict_scaled(scale_encoded(X, artifacts), artifacts, mode)
+
+def scale_encoded(X, artifacts):
+    # Same arithmetic as scaler.transform, minus its per-call DataFrame/feature-name checks
+    X_scaled = np.subtract(X, artifacts.scaler_mean)
+    np.divide(X_scaled, artifacts.scaler_scale, out=X_scaled)
+    return X_scaled
+
+def predict_scaled(X_scaled, artifacts, mode=None):
+    """Model step of predict_encoded, on an already scaled matrix."""
+    mode = mode or SERVING_MODE
+    if mode == "native" and artifacts.compiled is not None:
+        return artifacts.compiled.predict(X_scaled)
+    if mode in ("native", "booster") and artifacts.booster is not None:
+        # Contiguous float64 straight into LightGBM: no DataFrame, no pyfunc schema enforcement
+        if NUM_THREADS > 0:
+            return artifacts.booster.predict(X_scaled, num_threads=NUM_THREADS)
+        return artifacts.booster.predict(X_scaled)
+
+    X_scaled_df = pd.DataFrame(X_scaled, columns=artifacts.selected_features)
+    return artifacts.model.predict(X_scaled_df)
+
+def warm_up(artifacts):
+    """Run single-row and batch predictions on a freshly loaded snapshot before it is swapped in."""
+    for row in WARMUP_INPUTS:
+        predict_encoded(artifacts.encoder.encode(row), artifacts)
+    predict_encoded(artifacts.encoder.encode_batch(WARMUP_INPUTS), artifacts)
 
-    # Predict
-    preds = model.predict(X_scaled_df)
-    return preds[0]
+artifact_cache.warmup = warm_up
@@ -1,9 +1,16 @@
 import pandas as pd
-import joblib
-import os
+
+from artifacts import get_artifacts
+from encoder import CENTRAL_AREAS, MATURE_TOWNS, ONE_HOT_COLS
+
 
 def preprocess_user_input(input_dict):
-    df = pd.DataFrame([input_dict])
+    return preprocess_batch([input_dict])
+
+
+def preprocess_batch(input_dicts):
+    """Vectorized version of preprocess_user_input: one row per input dict, same columns and dtypes."""
+    df = pd.DataFrame(list(input_dicts))
 
     df['build_year'] = df['build_year'].astype(int)
     df['size_sqft'] = df['size_sqft'].astype(float)
@@ -12,39 +19,16 @@ def preprocess_user_input(input_dict):
 
     df['size_per_room'] = df['size_sqft'] / df['n_bedrooms'].replace(0, 1)
     df['bed_bath_ratio'] = df['n_bedrooms'] / df['n_bathrooms'].replace(0, 1)
-    df['is_central'] = 1 if input_dict['area'] in [
-        'Bukit Merah', 'Queenstown', 'Toa Payoh', 'Kallang/Whampoa'
-    ] else 0
-    df['is_mature_town'] = 1 if input_dict['area'] in [
-        'Ang Mo Kio', 'Bedok', 'Bishan', 'Bukit Merah', 'Bukit Timah', 'Central Area',
-        'Clementi', 'Geylang', 'Kallang/Whampoa', 'Marine Parade', 'Pasir Ris',
-        'Queenstown', 'Serangoon', 'Toa Payoh'
-    ] else 0
+    df['is_central'] = df['area'].isin(CENTRAL_AREAS).astype(int)
+    df['is_mature_town'] = df['area'].isin(MATURE_TOWNS).astype(int)
     df['age_size_interaction'] = (2025 - df['build_year']) * df['size_sqft']
 
-    one_hot_cols = {
-        'n_rooms': ['HDB 4-Room', 'HDB 5PA (Premium Apartment)'],
-        'district': [
-            'Balestier, Toa Payoh, Serangoon',
-            'Geylang, Eunos',
-            'Hillview, Dairy Farm, Bukit Panjang, Choa Chu Kang',
-            'Jurong',
-            'Queenstown, Tiong Bahru',
-            'Telok Blangah, Harbourfront'
-        ],
-        'region': ['East', 'North', 'West'],
-        'area': ['Hougang', 'Marine Parade']
-    }
-
-    for col, values in one_hot_cols.items():
+    for col, values in ONE_HOT_COLS.items():
         for val in values:
-            df[f"{col}_{val}"] = 1 if input_dict[col] == val else 0
+            df[f"{col}_{val}"] = (df[col] == val).astype(int)
 
-    # ✅ Load expected feature list from model training
-    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    JoblibsPath = os.path.join(BASE_DIR, "models_dump_for_Registry/selected_features.joblib")
-    selected_features =joblib.load(JoblibsPath)
-    #joblib.load("models_dump_for_Registry/selected_features.joblib")
+    # ✅ Expected feature list from model training (cached, no disk read)
+    selected_features = get_artifacts().selected_features
 
     # Fill in any missing columns
     for col in selected_features:
@@ -55,3 +39,18 @@ def preprocess_user_input(input_dict):
     df = df[selected_features]
 
     return df
+
+
+def get_encoder():
+    """FeatureEncoder compiled for the currently served artifacts."""
+    return get_artifacts().encoder
+
+
+def encode_user_input(input_dict):
+    """Array equivalent of preprocess_user_input: a (1, n_features) float matrix."""
+    return get_encoder().encode(input_dict)
+
+
+def encode_batch(input_dicts):
+    """Array equivalent of preprocess_batch: an (n, n_features) float matrix."""
+    return get_encoder().encode_batch(input_dicts)
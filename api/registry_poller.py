@@ -0,0 +1,59 @@
+# registry_poller.py
+import threading
+import time
+
+
+class RegistryPoller:
+    """
+    Background thread that keeps an ArtifactCache in sync with the MLflow registry.
+
+    It calls cache.refresh() immediately on start and then every `interval`
+    seconds (every `retry_interval` seconds while no model has loaded yet).
+    New versions are downloaded, warmed up and swapped in on this thread, so
+    requests never wait on the registry; in-flight requests keep the snapshot
+    they already hold.
+    """
+
+    def __init__(self, cache, interval=60.0, retry_interval=5.0):
+        self.cache = cache
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.last_poll = None
+        self.last_error = None
+        self.swaps = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def start(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="registry-poller", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=5.0):
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def poll_once(self):
+        try:
+            if self.cache.refresh():
+                self.swaps += 1
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"❌ Model registry poll failed: {e}")
+        self.last_poll = time.time()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.interval if self.cache.loaded else self.retry_interval)
@@ -0,0 +1,84 @@
+# segment_log.py
+import os
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+SEGMENT_PREFIX = "input-"
+SEGMENT_SUFFIX = ".parquet"
+# Segments being written carry this suffix; only renamed (closed) segments are ever loaded
+OPEN_SUFFIX = ".open"
+
+
+class SegmentWriter:
+    """
+    Append-only log of row batches as rotating Parquet segment files.
+
+    Each write() becomes one row group of the open segment. The segment is
+    closed and renamed into place after max_rows rows, max_bytes bytes on disk
+    or max_age seconds, whichever comes first, so readers only ever see
+    complete files. Not thread-safe: meant to be driven by a single writer
+    thread (InputLogger's worker).
+    """
+
+    def __init__(self, directory, schema, max_rows=100_000, max_bytes=64 * 1024 * 1024, max_age=300.0,
+                 clock=time.time):
+        self.directory = directory
+        self.schema = schema
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.clock = clock
+        self.segments = 0
+        self._writer = None
+        self._path = None
+        self._rows = 0
+        self._opened_at = None
+        self._seq = 0
+
+    def write(self, rows):
+        """Append row tuples (in schema order) to the open segment, opening one if needed."""
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        table = pa.Table.from_arrays(
+            [pa.array(column, type=field.type) for column, field in zip(columns, self.schema)], schema=self.schema
+        )
+        if self._writer is None:
+            self._open()
+        self._writer.write_table(table)
+        self._rows += len(rows)
+        if self._rows >= self.max_rows or os.path.getsize(self._path) >= self.max_bytes:
+            self.rotate()
+        else:
+            self.rotate_if_due()
+
+    def rotate_if_due(self):
+        """Close the open segment once it is older than max_age; cheap to call often."""
+        if self._writer is not None and self.clock() - self._opened_at >= self.max_age:
+            self.rotate()
+
+    def rotate(self):
+        """Close the open segment (if any) and publish it under its final name."""
+        if self._writer is None:
+            return None
+        self._writer.close()
+        final_path = self._path[:-len(OPEN_SUFFIX)]
+        os.replace(self._path, final_path)
+        self._writer = self._path = self._opened_at = None
+        self._rows = 0
+        self.segments += 1
+        return final_path
+
+    close = rotate
+
+    def _open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._opened_at = self.clock()
+        self._seq += 1
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.localtime(self._opened_at))
+        # pid keeps segments from several API worker processes apart
+        name = f"{SEGMENT_PREFIX}{stamp}-{os.getpid()}-{self._seq:05d}{SEGMENT_SUFFIX}"
+        self._path = os.path.join(self.directory, name + OPEN_SUFFIX)
+        self._writer = pq.ParquetWriter(self._path, self.schema)
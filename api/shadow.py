@@ -0,0 +1,188 @@
+# shadow.py
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+
+class PairStats:
+    """Running comparison of one (primary version, shadow version) pair."""
+
+    def __init__(self, latency_window):
+        self.count = 0
+        self.sum_delta = 0.0
+        self.sum_abs_delta = 0.0
+        self.sum_abs_rel_delta = 0.0
+        self.max_abs_delta = 0.0
+        # Most recent shadow latencies, for percentiles
+        self.latencies = deque(maxlen=latency_window)
+
+    def add(self, primary, shadow, seconds):
+        delta = shadow - primary
+        self.count += 1
+        self.sum_delta += delta
+        self.sum_abs_delta += abs(delta)
+        self.sum_abs_rel_delta += abs(delta) / abs(primary) if primary else 0.0
+        self.max_abs_delta = max(self.max_abs_delta, abs(delta))
+        self.latencies.append(seconds)
+
+    def summary(self):
+        latencies_ms = np.array(self.latencies) * 1e3
+        p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99]) if len(latencies_ms) else (0.0, 0.0, 0.0)
+        return {
+            "count": self.count,
+            "mean_delta": round(self.sum_delta / self.count, 4),
+            "mean_abs_delta": round(self.sum_abs_delta / self.count, 4),
+            "mean_abs_rel_delta": round(self.sum_abs_rel_delta / self.count, 6),
+            "max_abs_delta": round(self.max_abs_delta, 4),
+            "shadow_p50_ms": round(float(p50), 3),
+            "shadow_p95_ms": round(float(p95), 3),
+            "shadow_p99_ms": round(float(p99), 3),
+        }
+
+
+class ShadowScorer:
+    """
+    Re-scores a sampled share of live /predict requests with a shadow model
+    version, off the request path.
+
+    Requests only draw a sample (sample()) and, if picked, put the validated
+    input and the primary prediction on a bounded queue (submit(), never blocks;
+    full queue = dropped). A single background worker loads the shadow snapshot
+    with load_shadow() (retrying every retry_interval seconds while that fails),
+    then encodes each input with the shadow's own encoder, times
+    predict_fn(X, shadow), and folds the delta against the primary prediction
+    and the shadow latency into PairStats keyed by (primary version, shadow
+    version). A primary hot-swap therefore starts a new pair.
+    """
+
+    def __init__(self, load_shadow, predict_fn, sample_rate=0.1, max_queue_size=1000, latency_window=1000,
+                 retry_interval=30.0, rng=random.random):
+        self.load_shadow = load_shadow
+        self.predict_fn = predict_fn
+        self.sample_rate = sample_rate
+        self.latency_window = latency_window
+        self.retry_interval = retry_interval
+        self.rng = rng
+        self.shadow = None
+        self.last_error = None
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._pairs = {}
+        self._counts = {"submitted": 0, "dropped": 0, "scored": 0, "failed": 0}
+
+    def start(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """Stop the worker; queued requests that were not scored yet are discarded."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    def sample(self):
+        return self.rng() < self.sample_rate
+
+    def submit(self, input_dict, prediction, primary_version):
+        """Queue one request for shadow scoring. Never blocks or raises."""
+        if self._thread is None:
+            self.start()
+        try:
+            self._queue.put_nowait((input_dict, prediction, primary_version))
+            self._count(submitted=1)
+        except queue.Full:
+            self._count(dropped=1)
+
+    def stats(self, primary_version=None, shadow_version=None):
+        """Counters plus a summary per version pair, optionally filtered to one primary and/or shadow version."""
+        with self._stats_lock:
+            counts = dict(self._counts)
+            pairs = [
+                {"primary_version": primary, "shadow_version": shadow, **pair.summary()}
+                for (primary, shadow), pair in self._pairs.items()
+                if (primary_version is None or str(primary) == str(primary_version))
+                and (shadow_version is None or str(shadow) == str(shadow_version))
+            ]
+        return {
+            **counts,
+            "sample_rate": self.sample_rate,
+            "shadow_version": self.shadow.version if self.shadow is not None else None,
+            "queue_depth": self._queue.qsize(),
+            "last_error": self.last_error,
+            "pairs": pairs,
+        }
+
+    # ---------- worker side ----------
+
+    def _count(self, **increments):
+        with self._stats_lock:
+            for name, value in increments.items():
+                self._counts[name] += value
+
+    def _run(self):
+        while self.shadow is None and not self._stop.is_set():
+            try:
+                self.shadow = self.load_shadow()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"❌ Loading the shadow model failed: {e}")
+                self._stop.wait(self.retry_interval)
+
+        while not self._stop.is_set():
+            try:
+                item = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            self._score(*item)
+
+    def _score(self, input_dict, primary_prediction, primary_version):
+        shadow = self.shadow
+        try:
+            start = time.perf_counter()
+            prediction = float(self.predict_fn(shadow.encoder.encode(input_dict), shadow)[0])
+            seconds = time.perf_counter() - start
+        except Exception as e:
+            self.last_error = str(e)
+            self._count(failed=1)
+            return
+        with self._stats_lock:
+            pair = self._pairs.get((primary_version, shadow.version))
+            if pair is None:
+                pair = self._pairs[(primary_version, shadow.version)] = PairStats(self.latency_window)
+            pair.add(primary_prediction, prediction, seconds)
+            self._counts["scored"] += 1
+
+
+def build_shadow_scorer(load_version, predict_fn):
+    """
+    ShadowScorer configured from the environment, or None if disabled:
+      SHADOW_MODEL_VERSION    registry version of lightgbm_model to shadow; unset disables (default)
+      SHADOW_SAMPLE_RATE      share of /predict requests re-scored by it (default 0.1)
+      SHADOW_QUEUE_SIZE       sampled requests waiting at most; more are dropped (default 1000)
+    load_version(version) returns a warmed-up ModelArtifacts of that version.
+    """
+    version = os.environ.get("SHADOW_MODEL_VERSION")
+    if not version:
+        return None
+    return ShadowScorer(
+        lambda: load_version(version),
+        predict_fn,
+        sample_rate=float(os.environ.get("SHADOW_SAMPLE_RATE", "0.1")),
+        max_queue_size=int(os.environ.get("SHADOW_QUEUE_SIZE", "1000")),
+    )
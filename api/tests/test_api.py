@@ -1,15 +1,51 @@
+import csv
+import io
+import json
+import time
+
+import pyarrow as pa
+import pytest
 from fastapi.testclient import TestClient
+from api import main
 from api.main import app
+from api.arrow_client import ARROW_STREAM, encode_request, decode_response
+from api.micro_batcher import MicroBatcher
+from api.shadow import ShadowScorer
+
+
+@pytest.fixture(scope="module", autouse=True)
+def input_log_dir(tmp_path_factory):
+    # Logged inputs go to a temp dir, not the repo's housing_loader_package/input_log that loaders ingest
+    segment_dir = tmp_path_factory.mktemp("input_log")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(main, "input_logger", main.InputLogger(segment_dir=str(segment_dir)))
+        yield segment_dir
+
 
+@pytest.fixture(scope="module")
+def client(input_log_dir):
+    # Entering the client runs the lifespan, which starts the registry poller
+    with TestClient(app) as client:
+        main.artifact_cache.get(wait=60)
+        yield client
 
-client = TestClient(app)
+def test_predict_inputs_are_logged_to_the_test_dir(client, input_log_dir):
+    response = client.post("/predict", json={
+        "build_year": 2010, "size_sqft": 1200.0, "n_bedrooms": 3, "n_bathrooms": 2, "area": "Orchard",
+        "district": "Ardmore, Bukit Timah, Holland Road, Tanglin", "region": "Central Region",
+        "n_rooms": "HDB 4-Room"
+    })
+    assert response.status_code == 200
+    # Closing flushes the open segment; the next logged row restarts the worker
+    main.input_logger.close()
+    assert list(input_log_dir.glob("*.parquet"))
 
-def test_home_endpoint():
+def test_home_endpoint(client):
     response = client.get("/")
     assert response.status_code == 200
     assert response.json() == {"message": "🏡 Housing Price Prediction API is live!"}
 
-def test_predict_endpoint_valid():
+def test_predict_endpoint_valid(client):
     response = client.post("/predict", json={
         "build_year": 2010,
         "size_sqft": 1200.0,
@@ -24,11 +60,234 @@ def test_predict_endpoint_valid():
     result = response.json()
     assert "predicted_price" in result
     assert "price_range" in result
+    assert result["model_version"] is not None
 
-def test_predict_endpoint_invalid_input():
+def test_predict_endpoint_invalid_input(client):
     # Missing fields
     response = client.post("/predict", json={
         "build_year": 2010,
         "size_sqft": 1200.0
     })
     assert response.status_code == 422  # Unprocessable Entity (validation error)
+
+def test_predict_batch_endpoint_mixed_rows(client):
+    valid_row = {
+        "build_year": 2010,
+        "size_sqft": 1200.0,
+        "n_bedrooms": 3,
+        "n_bathrooms": 2,
+        "area": "Orchard",
+        "district": "Ardmore, Bukit Timah, Holland Road, Tanglin",
+        "region": "Central Region",
+        "n_rooms": "HDB 4-Room"
+    }
+    response = client.post("/predict/batch", json={
+        "inputs": [valid_row, {"build_year": 2010}, valid_row]
+    })
+    assert response.status_code == 200
+    result = response.json()
+    assert result["n_rows"] == 3
+    assert result["n_failed"] == 1
+    assert [r["index"] for r in result["results"]] == [0, 1, 2]
+    assert "error" in result["results"][1]
+    assert result["results"][0]["predicted_price"] == result["results"][2]["predicted_price"]
+
+    single = client.post("/predict", json=valid_row).json()
+    assert result["results"][0]["predicted_price"] == single["predicted_price"]
+
+def test_live_and_ready_endpoints(client):
+    assert client.get("/live").json() == {"status": "alive"}
+    response = client.get("/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["model_version"] == main.artifact_cache.current.version
+    assert body["warmup_seconds"] is not None
+
+def test_ready_is_503_until_a_model_is_loaded(client, monkeypatch):
+    empty_cache = type(main.artifact_cache)(tracking_uri="http://127.0.0.1:1")
+    monkeypatch.setattr(main, "artifact_cache", empty_cache)
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "loading"
+    assert client.get("/live").status_code == 200
+
+def test_model_info_endpoint(client):
+    client.post("/predict", json={
+        "build_year": 2010, "size_sqft": 1200.0, "n_bedrooms": 3, "n_bathrooms": 2,
+        "area": "Orchard", "district": "Ardmore, Bukit Timah, Holland Road, Tanglin",
+        "region": "Central Region", "n_rooms": "HDB 4-Room"
+    })
+    response = client.get("/model")
+    assert response.status_code == 200
+    info = response.json()
+    assert info["model_name"] == "lightgbm_model"
+    assert info["model_version"] is not None
+
+def test_prediction_cache_serves_repeated_quotes(client):
+    payload = {
+        "build_year": 1999, "size_sqft": 1001.0, "n_bedrooms": 3, "n_bathrooms": 2,
+        "area": "Bedok", "district": "Bedok, Upper East Coast, Eastwood, Kew Drive",
+        "region": "East", "n_rooms": "HDB 4-Room"
+    }
+    before = client.get("/prediction-cache/stats").json()
+    first = client.post("/predict", json=payload).json()
+    second = client.post("/predict", json=payload).json()
+    after = client.get("/prediction-cache/stats").json()
+    assert first == second
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"] + 1
+
+def test_metrics_endpoint_reports_stages(client):
+    client.post("/predict", json={
+        "build_year": 2001, "size_sqft": 950.0, "n_bedrooms": 3, "n_bathrooms": 2,
+        "area": "Hougang", "district": "Serangoon Garden, Hougang, Ponggol",
+        "region": "North East", "n_rooms": "HDB 4-Room"
+    })
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    version = main.artifact_cache.current.version
+    # prometheus_client writes labels in alphabetical order
+    assert f'housing_api_requests_total{{endpoint="/predict",model_version="{version}",status="200"}}' in body
+    for stage in ("encode", "model", "log"):
+        assert (f'housing_api_stage_duration_seconds_count{{endpoint="/predict",model_version="{version}",'
+                f'stage="{stage}"}}') in body
+    assert "housing_api_model_info{" in body
+    assert "housing_api_input_log_queue_depth" in body
+
+def test_predict_stream_ndjson_matches_batch(client):
+    valid_row = {
+        "build_year": 2010, "size_sqft": 1200.0, "n_bedrooms": 3, "n_bathrooms": 2,
+        "area": "Orchard", "district": "Ardmore, Bukit Timah, Holland Road, Tanglin",
+        "region": "Central Region", "n_rooms": "HDB 4-Room"
+    }
+    body = "\n".join([json.dumps(valid_row), "not json", json.dumps({"build_year": 2010}), ""])
+    response = client.post("/predict/stream", content=body, headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    assert response.headers["x-model-version"] is not None
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert "error" in results[1] and "error" in results[2]
+
+    single = client.post("/predict", json=valid_row).json()
+    assert results[0]["predicted_price"] == single["predicted_price"]
+
+def test_predict_stream_csv(client):
+    body = (
+        "build_year,size_sqft,n_bedrooms,n_bathrooms,area,district,region,n_rooms\n"
+        '2010,1200.0,3,2,Orchard,"Ardmore, Bukit Timah, Holland Road, Tanglin",Central Region,HDB 4-Room\n'
+        "2010,abc,3,2,Orchard,Jurong,West,HDB 4-Room\n"
+    )
+    response = client.post("/predict/stream", content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["index"] for row in rows] == ["0", "1"]
+    assert float(rows[0]["predicted_price"]) > 0 and rows[0]["error"] == ""
+    assert rows[1]["predicted_price"] == "" and "size_sqft" in rows[1]["error"]
+
+def test_predict_stream_rejects_unknown_content_type(client):
+    response = client.post("/predict/stream", content="x", headers={"Content-Type": "application/xml"})
+    assert response.status_code == 415
+
+def test_predict_stream_csv_quoted_newline(client):
+    body = (
+        "build_year,size_sqft,n_bedrooms,n_bathrooms,area,district,region,n_rooms\n"
+        '2010,1200.0,3,2,"Orchard","Ardmore, Bukit Timah,\nHolland Road, Tanglin",Central Region,HDB 4-Room\n'
+        "2011,1100.0,3,2,Jurong West,Jurong,West,HDB 4-Room\n"
+    )
+    response = client.post("/predict/stream", content=body, headers={"Content-Type": "text/csv"})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["index"] for row in rows] == ["0", "1"]
+    assert rows[0]["error"] == "" and rows[1]["error"] == ""
+
+def test_predict_returns_503_quickly_without_a_model(client, monkeypatch):
+    # main imports artifacts flat, so build the empty cache from its own class
+    empty_cache = type(main.artifact_cache)(tracking_uri="http://127.0.0.1:1")
+    monkeypatch.setattr(main, "artifact_cache", empty_cache)
+    start = time.perf_counter()
+    response = client.post("/predict", json={
+        "build_year": 2010, "size_sqft": 1200.0, "n_bedrooms": 3, "n_bathrooms": 2,
+        "area": "Orchard", "district": "Jurong", "region": "West", "n_rooms": "HDB 4-Room"
+    })
+    assert response.status_code == 503
+    assert time.perf_counter() - start < 2
+
+
+def test_micro_batched_predict_matches_unbatched(client, monkeypatch):
+    payload = {"build_year": 1999, "size_sqft": 980.0, "n_bedrooms": 3, "n_bathrooms": 2, "area": "Tampines",
+               "district": "Tampines, Pasir Ris", "region": "East", "n_rooms": "HDB 4-Room"}
+    monkeypatch.setattr(main, "prediction_cache", None)
+    expected = client.post("/predict", json=payload).json()
+
+    batcher = MicroBatcher(main.predict_scaled, window=0.001)
+    monkeypatch.setattr(main, "micro_batcher", batcher)
+    response = client.post("/predict", json=payload)
+    batcher.stop()
+
+    assert response.json() == expected
+    stats = client.get("/micro-batcher/stats").json()
+    assert stats["enabled"] is True and stats["requests"] == 1
+
+
+def test_predict_arrow_matches_batch(client):
+    rows = [
+        {"build_year": 2010, "size_sqft": 1200.0, "n_bedrooms": 3, "n_bathrooms": 2, "area": "Orchard",
+         "district": "Ardmore, Bukit Timah, Holland Road, Tanglin", "region": "Central Region", "n_rooms": "HDB 4-Room"},
+        {"build_year": 1985, "size_sqft": None, "n_bedrooms": 3, "n_bathrooms": 2, "area": "Hougang",
+         "district": "Geylang, Eunos", "region": "East", "n_rooms": "HDB 4-Room"},
+        {"build_year": 1978, "size_sqft": 645.0, "n_bedrooms": 2, "n_bathrooms": 1, "area": "Marine Parade",
+         "district": "Jurong", "region": "West", "n_rooms": "HDB 5PA (Premium Apartment)"},
+    ]
+    response = client.post("/predict/arrow", content=encode_request(rows),
+                           headers={"Content-Type": ARROW_STREAM})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == ARROW_STREAM
+    assert response.headers["x-model-version"] is not None
+    results = decode_response(response.content).to_pylist()
+    assert len(results) == 3
+    assert results[1]["predicted_price"] is None and "size_sqft" in results[1]["error"]
+
+    batch = client.post("/predict/batch", json={"inputs": [rows[0], rows[2]]}).json()["results"]
+    for arrow_row, json_row in zip([results[0], results[2]], batch):
+        assert arrow_row["error"] is None
+        assert arrow_row["predicted_price"] == json_row["predicted_price"]
+        assert arrow_row["lower"] == json_row["price_range"]["lower"]
+        assert arrow_row["upper"] == json_row["price_range"]["upper"]
+
+def test_predict_arrow_rejects_bad_requests(client):
+    headers = {"Content-Type": ARROW_STREAM}
+    missing = encode_request(pa.table({"build_year": [2010], "size_sqft": [1200.0]}))
+    response = client.post("/predict/arrow", content=missing, headers=headers)
+    assert response.status_code == 422 and "n_bedrooms" in response.json()["detail"]
+
+    assert client.post("/predict/arrow", content=b"not arrow", headers=headers).status_code == 422
+    assert client.post("/predict/arrow", content=missing, headers={"Content-Type": "application/json"}).status_code == 415
+
+def test_predict_async_matches_sync(client, monkeypatch):
+    payload = {"build_year": 2003, "size_sqft": 1050.0, "n_bedrooms": 3, "n_bathrooms": 2, "area": "Bishan",
+               "district": "Bishan, Ang Mo Kio", "region": "Central", "n_rooms": "HDB 4-Room"}
+    monkeypatch.setattr(main, "prediction_cache", None)
+    response = client.post("/predict/async", json=payload)
+    assert response.status_code == 200
+    assert response.json() == client.post("/predict", json=payload).json()
+    assert client.get("/inference-executor/stats").json()["completed"] >= 1
+    assert client.post("/predict/async", json={"build_year": 2003}).status_code == 422
+
+def test_shadow_scorer_compares_off_the_request_path(client, monkeypatch):
+    # Shadowing the served model against itself: every delta must be zero
+    scorer = ShadowScorer(lambda: main.artifact_cache.current, main.predict_encoded, sample_rate=1.0)
+    monkeypatch.setattr(main, "shadow_scorer", scorer)
+    payload = {"build_year": 1996, "size_sqft": 1100.0, "n_bedrooms": 3, "n_bathrooms": 2, "area": "Bedok",
+               "district": "Bedok, Upper East Coast, Eastwood, Kew Drive", "region": "East", "n_rooms": "HDB 4-Room"}
+    assert client.post("/predict", json=payload).status_code == 200
+
+    deadline = time.monotonic() + 5
+    while scorer.stats()["scored"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    scorer.stop()
+    version = main.artifact_cache.current.version
+    stats = client.get("/shadow/stats", params={"primary_version": version}).json()
+    assert stats["enabled"] is True
+    assert stats["pairs"][0]["count"] == 1 and stats["pairs"][0]["max_abs_delta"] == 0.0
@@ -0,0 +1,85 @@
+import shutil
+import joblib
+import numpy as np
+import pytest
+from api.artifacts import ArtifactCache, SELECTED_FEATURES_PATH, SCALER_PATH
+
+
+def make_cache(tmp_path):
+    features_path = tmp_path / "selected_features.joblib"
+    scaler_path = tmp_path / "scaler.joblib"
+    shutil.copy(SELECTED_FEATURES_PATH, features_path)
+    shutil.copy(SCALER_PATH, scaler_path)
+    return ArtifactCache(selected_features_path=str(features_path), scaler_path=str(scaler_path))
+
+
+def test_refresh_is_noop_when_nothing_changed(tmp_path):
+    cache = make_cache(tmp_path)
+    first = cache.get()
+    assert cache.refresh() is False
+    assert cache.get() is first
+    assert first.encoder.selected_features == first.selected_features
+
+
+def test_refresh_swaps_snapshot_when_files_change(tmp_path):
+    cache = make_cache(tmp_path)
+    first = cache.get()
+
+    scaler = joblib.load(cache.scaler_path)
+    scaler.mean_ = scaler.mean_ + 1.0
+    joblib.dump(scaler, cache.scaler_path)
+
+    assert cache.refresh() is True
+    second = cache.get()
+    assert second is not first
+    assert second.checksum != first.checksum
+    assert second.version == first.version
+    # Same registry version: the already loaded model is reused
+    assert second.model is first.model
+    # The old snapshot is left untouched for in-flight requests
+    assert np.allclose(second.scaler.mean_ - first.scaler.mean_, 1.0)
+
+
+def test_warmup_runs_before_swap(tmp_path):
+    cache = make_cache(tmp_path)
+    seen = []
+
+    def warmup(candidate):
+        # The candidate is not visible to readers until warm-up has finished
+        seen.append((candidate.version, cache.current))
+
+    cache.warmup = warmup
+    cache.refresh()
+    assert len(seen) == 1
+    assert seen[0][1] is None
+    assert cache.current.version == seen[0][0]
+
+
+def test_failed_warmup_keeps_previous_snapshot(tmp_path):
+    cache = make_cache(tmp_path)
+    assert not cache.ready
+    first = cache.get()
+    assert cache.ready
+
+    def warmup(candidate):
+        raise RuntimeError("warm-up failed")
+
+    cache.warmup = warmup
+    with pytest.raises(RuntimeError):
+        cache.refresh(force=True)
+    assert cache.current is first
+    assert cache.ready
+
+
+def test_installed_snapshot_is_pinned(tmp_path):
+    cache = make_cache(tmp_path)
+    loaded = cache.get()
+    other = make_cache(tmp_path).get()
+
+    cache.install(other)
+    assert cache.current is other
+    assert cache.pinned
+    # Pinned: refresh neither reloads nor swaps, even when forced
+    assert cache.refresh(force=True) is False
+    assert cache.current is other
+    assert cache.current is not loaded
@@ -0,0 +1,147 @@
+import json
+import os
+import pytest
+from api.artifacts import artifact_cache, get_artifacts
+from api.batch_score import pending_chunks, score_table
+from api.predictor import predict_encoded, WARMUP_INPUTS
+
+
+class MemoryScoringStore:
+    """MySQLScoringStore stand-in over an in-memory housing_data table."""
+
+    def __init__(self, rows, fail_on_chunk=None):
+        self.rows = rows
+        self.fail_on_chunk = fail_on_chunk
+        self.predictions = {}
+        self.chunks = {}
+        self.reads = []
+
+    def ensure_tables(self):
+        pass
+
+    def plan_chunks(self, chunk_rows):
+        ids = sorted(row["id"] for row in self.rows)
+        return [(ids[i], ids[min(i + chunk_rows, len(ids)) - 1]) for i in range(0, len(ids), chunk_rows)]
+
+    def completed_chunks(self, model_version):
+        return [(first, last) for version, first, last in self.chunks if version == model_version]
+
+    def reset(self, model_version):
+        self.chunks = {key: value for key, value in self.chunks.items() if key[0] != model_version}
+
+    def read_chunk(self, first_id, last_id):
+        self.reads.append((first_id, last_id))
+        return [dict(row) for row in self.rows if first_id <= row["id"] <= last_id]
+
+    def write_chunk(self, model_version, first_id, last_id, predictions, skipped):
+        if (first_id, last_id) == self.fail_on_chunk:
+            raise ConnectionError("lost connection to MySQL")
+        for housing_id, version, price, _ in predictions:
+            self.predictions[(housing_id, version)] = price
+        self.chunks[(model_version, first_id, last_id)] = (len(predictions), skipped)
+
+
+class ProcessCheckingStore(MemoryScoringStore):
+    """
+    Writes predictions to a file, so they survive worker processes, and its
+    "connection" remembers the process that opened it: a worker must never
+    use one opened by the parent.
+    """
+
+    def __init__(self, rows, path):
+        super().__init__(rows)
+        self.path = path
+        self._connection = None
+
+    def connection(self):
+        if self._connection is None:
+            self._connection = os.getpid()
+        assert self._connection == os.getpid(), "connection opened by another process"
+        return self._connection
+
+    def close(self):
+        self._connection = None
+
+    def ensure_tables(self):
+        self.connection()
+
+    def read_chunk(self, first_id, last_id):
+        self.connection()
+        return super().read_chunk(first_id, last_id)
+
+    def write_chunk(self, model_version, first_id, last_id, predictions, skipped):
+        self.connection()
+        with open(self.path, "a") as f:
+            for housing_id, version, price, _ in predictions:
+                f.write(json.dumps([housing_id, version, price]) + "\n")
+
+
+def housing_rows(n):
+    # Sparse ids, as left behind by deletes
+    return [dict(WARMUP_INPUTS[i % len(WARMUP_INPUTS)], id=10 + 3 * i) for i in range(n)]
+
+
+@pytest.fixture(scope="module")
+def artifacts():
+    return get_artifacts()
+
+
+def test_scores_every_row_with_the_model_version(artifacts):
+    rows = housing_rows(25)
+    store = MemoryScoringStore(rows)
+
+    summary = score_table(store, artifacts.version, chunk_rows=10, artifacts=artifacts)
+
+    assert summary["chunks"] == 3 and summary["scored"] == 25 and summary["skipped"] == 0
+    expected = predict_encoded(artifacts.encoder.encode_batch(rows), artifacts)
+    assert [store.predictions[(row["id"], artifacts.version)] for row in rows] == pytest.approx(list(expected))
+
+
+def test_rows_with_missing_fields_are_skipped(artifacts):
+    rows = housing_rows(5)
+    rows[2]["build_year"] = None
+    store = MemoryScoringStore(rows)
+
+    summary = score_table(store, artifacts.version, chunk_rows=10, artifacts=artifacts)
+
+    assert summary["scored"] == 4 and summary["skipped"] == 1
+    assert (rows[2]["id"], artifacts.version) not in store.predictions
+
+
+def test_resumes_after_the_last_completed_chunk(artifacts):
+    store = MemoryScoringStore(housing_rows(30), fail_on_chunk=(40, 67))
+    with pytest.raises(ConnectionError):
+        score_table(store, artifacts.version, chunk_rows=10, artifacts=artifacts)
+    assert store.completed_chunks(artifacts.version) == [(10, 37)]
+
+    store.fail_on_chunk = None
+    store.reads.clear()
+    summary = score_table(store, artifacts.version, chunk_rows=10, artifacts=artifacts)
+
+    assert store.reads == [(40, 67), (70, 97)]
+    assert summary["resumed_chunks"] == 1 and summary["scored"] == 20
+    assert len(store.predictions) == 30
+
+    store.reads.clear()
+    summary = score_table(store, artifacts.version, chunk_rows=10, rescore=True, artifacts=artifacts)
+    assert len(store.reads) == 3 and summary["scored"] == 30
+
+
+def test_pending_chunks_respects_ranges_from_a_different_chunk_size():
+    chunks = [(1, 10), (11, 20), (21, 30)]
+    assert pending_chunks(chunks, [(1, 20)]) == [(21, 30)]
+    assert pending_chunks(chunks, [(1, 15)]) == [(11, 20), (21, 30)]
+
+
+def test_worker_processes_open_their_own_connections(artifacts, tmp_path):
+    rows = housing_rows(30)
+    store = ProcessCheckingStore(rows, str(tmp_path / "predictions.jsonl"))
+
+    summary = score_table(store, artifacts.version, artifact_cache.version_uri(artifacts.version), chunk_rows=10,
+                          workers=2)
+
+    assert summary["scored"] == 30
+    with open(store.path) as f:
+        written = {housing_id: price for housing_id, _, price in map(json.loads, f)}
+    expected = predict_encoded(artifacts.encoder.encode_batch(rows), artifacts)
+    assert [written[row["id"]] for row in rows] == pytest.approx(list(expected))
@@ -0,0 +1,71 @@
+import json
+import tempfile
+import numpy as np
+import pytest
+from api.artifacts import ModelArtifacts, get_artifacts
+from api.compiled_model import compile_booster, load_compiled, max_abs_diff
+from api.predictor import predict_encoded, WARMUP_INPUTS
+
+
+@pytest.fixture(scope="module")
+def compiled_dir(tmp_path_factory):
+    return str(compile_booster(get_artifacts().booster, str(tmp_path_factory.mktemp("compiled"))))
+
+
+def test_compiled_model_matches_booster(compiled_dir):
+    booster = get_artifacts().booster
+    compiled = load_compiled(compiled_dir, booster)
+    assert compiled is not None
+
+    X = np.random.default_rng(3).normal(scale=3.0, size=(2000, booster.num_feature()))
+    X[::7, 0] = 0.0
+    assert max_abs_diff(compiled, booster, X) == 0.0
+    assert compiled.predict(X[0]).shape == (1,)
+    with pytest.raises(ValueError):
+        compiled.predict(X[:, :5])
+
+
+def test_compiled_model_for_another_booster_is_ignored(compiled_dir, tmp_path):
+    manifest_path = f"{compiled_dir}/compiled.json"
+    manifest = json.load(open(manifest_path))
+    manifest["model_sha256"] = "0" * 64
+    copy = tmp_path / "compiled"
+    copy.mkdir()
+    for name in ("model.c", "model.so"):
+        (copy / name).write_bytes(open(f"{compiled_dir}/{name}", "rb").read())
+    (copy / "compiled.json").write_text(json.dumps(manifest))
+
+    assert load_compiled(str(copy), get_artifacts().booster) is None
+    assert load_compiled(str(tmp_path / "missing"), get_artifacts().booster) is None
+
+
+def test_native_mode_prefers_the_compiled_model(compiled_dir):
+    artifacts = get_artifacts()
+    with_compiled = ModelArtifacts(artifacts.version, artifacts.checksum, artifacts.model_uri, artifacts.model,
+                                   artifacts.scaler, artifacts.selected_features,
+                                   compiled=load_compiled(compiled_dir, artifacts.booster))
+    X = artifacts.encoder.encode_batch(WARMUP_INPUTS * 4)
+
+    calls = []
+    predict = with_compiled.compiled.predict
+    with_compiled.compiled.predict = lambda X_scaled: calls.append(len(X_scaled)) or predict(X_scaled)
+
+    native = predict_encoded(X, with_compiled, mode="native")
+    assert calls == [12]
+    assert native == pytest.approx(predict_encoded(X, with_compiled, mode="booster"), rel=0, abs=1e-9)
+
+
+def test_unloadable_library_is_rebuilt_without_leaving_a_build_dir(compiled_dir, tmp_path, monkeypatch):
+    copy = tmp_path / "compiled"
+    copy.mkdir()
+    for name in ("model.c", "compiled.json"):
+        (copy / name).write_bytes(open(f"{compiled_dir}/{name}", "rb").read())
+    (copy / "model.so").write_bytes(b"built for another platform")
+    build_root = tmp_path / "tmp"
+    build_root.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(build_root))
+
+    compiled = load_compiled(str(copy), get_artifacts().booster)
+    assert compiled is not None
+    assert compiled.predict(np.zeros((2, compiled.n_features))).shape == (2,)
+    assert list(build_root.iterdir()) == []
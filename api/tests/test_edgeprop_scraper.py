@@ -0,0 +1,272 @@
+import json
+import os
+import shutil
+import subprocess
+import urllib.request
+
+import lxml.html
+import pandas as pd
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from housing_etl import scraping
+from housing_etl.fixture_server import FixtureServer, load_listings
+from housing_etl.scraping import (BED_BATH_XPATH, CARD_XPATH, DESC_XPATH, DISTRICTS, EXTRACT_LISTINGS_JS,
+                                  PAGE_TIMING_COLUMNS, PRICE_XPATH, TITLE_XPATH, checkpoint_file, extract_listings,
+                                  load_search_page, read_manifest, save_checkpoint, scrape_edgeprop_parallel,
+                                  scrape_edgeprop_properties, search_url)
+
+# 41 listings (3 pages), none (an empty page 1), 23 (2 pages) and 9; not in DISTRICTS order
+SCRAPED_DISTRICTS = ["Anson, Tanjong Pagar", "High Street, Beach Road (part)", "Middle Road, Golden Mile",
+                     "Raffles Place, Cecil, Marina, People's Park"]
+
+
+class PageElement:
+    """WebElement stand-in over an lxml element."""
+
+    def __init__(self, element):
+        self.element = element
+
+    @property
+    def text(self):
+        return self.element.text_content().strip()
+
+    def get_attribute(self, name):
+        return self.element.text_content()
+
+    def find_element(self, by, xpath):
+        found = self.element.xpath(xpath)
+        if not found:
+            raise NoSuchElementException(xpath)
+        return PageElement(found[0])
+
+    def find_elements(self, by, xpath):
+        return [PageElement(element) for element in self.element.xpath(xpath)]
+
+
+class LxmlDriver(PageElement):
+    """
+    Browserless Chrome stand-in: pages are fetched with urllib and XPath lookups
+    answered by lxml. URLs in `broken` load as a blank page that never renders.
+    """
+
+    def __init__(self, broken=()):
+        super().__init__(None)
+        self.broken = set(broken)
+        self.urls = []
+
+    def get(self, url):
+        self.urls.append(url)
+        body = b"<html><body></body></html>" if url in self.broken else urllib.request.urlopen(url).read()
+        self.element = lxml.html.fromstring(body)
+
+    def execute_script(self, script):
+        raise NotImplementedError("no JavaScript without a browser")
+
+    def quit(self):
+        pass
+
+
+# Runs a script in node against a document whose XPath results were evaluated by lxml
+NODE_DOCUMENT = """
+const page = JSON.parse(require("fs").readFileSync(0, "utf8"));
+const XPathResult = {ORDERED_NODE_SNAPSHOT_TYPE: 7};
+const document = {
+    results: page,
+    evaluate(xpath, root, resolver, type) {
+        const found = root.results[xpath];
+        if (found === undefined || type !== XPathResult.ORDERED_NODE_SNAPSHOT_TYPE) {
+            throw new Error(`unexpected lookup ${xpath}`);
+        }
+        return {snapshotLength: found.length, snapshotItem: i => found[i]};
+    },
+};
+process.stdout.write((function () { %s })());
+"""
+
+
+class NodeScriptDriver(LxmlDriver):
+    """LxmlDriver whose execute_script runs EXTRACT_LISTINGS_JS in node."""
+
+    def execute_script(self, script):
+        if script != EXTRACT_LISTINGS_JS:
+            return super().execute_script(script)
+
+        def node(element, xpaths):
+            return {"innerText": element.text_content(), "textContent": element.text_content(),
+                    "results": {xpath: [node(child, []) for child in element.xpath(xpath)] for xpath in xpaths}}
+
+        page = {xpath: [node(element, [BED_BATH_XPATH]) for element in self.element.xpath(xpath)]
+                for xpath in (TITLE_XPATH, PRICE_XPATH, DESC_XPATH, CARD_XPATH)}
+        return subprocess.run(["node", "-e", NODE_DOCUMENT % script], input=json.dumps(page), capture_output=True,
+                              text=True, check=True).stdout
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = FixtureServer()
+    yield server.start()
+    server.stop()
+
+
+def scrape(base_url, tmp_path, make_driver=LxmlDriver, **kwargs):
+    kwargs = {"n_drivers": 3, "host_min_interval": 0.0, "page_timeout": 0.1, "districts": SCRAPED_DISTRICTS, **kwargs}
+    df = scrape_edgeprop_parallel(base_url=base_url, out_path=str(tmp_path / "raw_data1.csv"),
+                                  make_driver=make_driver, **kwargs)
+    return df.drop(columns="scraped_date")
+
+
+def recording_drivers(broken=()):
+    """make_driver for the pool, and the list of drivers it made."""
+    drivers = []
+
+    def make_driver():
+        drivers.append(LxmlDriver(broken))
+        return drivers[-1]
+    return drivers, make_driver
+
+
+def fetched(drivers):
+    return sorted(url for driver in drivers for url in driver.urls)
+
+
+def test_load_search_page_tells_an_empty_page_from_a_timeout(base_url):
+    driver = LxmlDriver(broken=[search_url("Anson, Tanjong Pagar", 2, base_url)])
+    assert load_search_page(driver, search_url("Anson, Tanjong Pagar", 1, base_url), timeout=0.1)
+    assert not load_search_page(driver, search_url("Anson, Tanjong Pagar", 4, base_url), timeout=0.1)
+    with pytest.raises(TimeoutException):
+        load_search_page(driver, search_url("Anson, Tanjong Pagar", 2, base_url), timeout=0.1)
+
+
+def test_parallel_scrape_matches_serial_order_and_rows(base_url, tmp_path, monkeypatch):
+    one_driver = scrape(base_url, tmp_path, n_drivers=1)
+    pool = scrape(base_url, tmp_path)
+    assert pool.equals(one_driver)
+    listings = load_listings()
+    assert list(pool["title"]) == [listing["title"] for district in SCRAPED_DISTRICTS
+                                   for listing in listings.get(DISTRICTS[district], [])]
+
+    # Page one of every district, as the serial scraper reads it
+    monkeypatch.setattr(scraping, "new_driver", lambda *args, **kwargs: LxmlDriver())
+    monkeypatch.setattr(scraping.time, "sleep", lambda seconds: None)
+    serial = scrape_edgeprop_properties(base_url, str(tmp_path / "serial.csv")).drop(columns="scraped_date")
+    monkeypatch.undo()
+    assert scrape(base_url, tmp_path, max_pages=1, districts=None).equals(serial)
+
+
+def test_timed_out_page_is_retried_then_failed_not_taken_as_the_last_page(base_url, tmp_path):
+    broken = [search_url("Anson, Tanjong Pagar", 2, base_url)]
+    drivers, make_driver = recording_drivers(broken)
+    df = scrape(base_url, tmp_path, make_driver)
+
+    urls = fetched(drivers)
+    assert urls.count(broken[0]) == 2
+    assert search_url("Anson, Tanjong Pagar", 3, base_url) not in urls
+    clean = scrape(base_url, tmp_path)
+    anson = clean["district"] == "Anson, Tanjong Pagar"
+    assert df.equals(pd.concat([clean[anson].head(20), clean[~anson]]).reset_index(drop=True))
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the extraction script")
+def test_script_extraction_matches_xpath_on_fixture_pages(base_url, tmp_path):
+    driver = NodeScriptDriver()
+    n_rows = 0
+    for district in SCRAPED_DISTRICTS:
+        for page in range(1, 4):
+            load_search_page(driver, search_url(district, page, base_url), timeout=0.1)
+            by_xpath = extract_listings(driver, district, "xpath")
+            assert extract_listings(driver, district, "script") == by_xpath
+            n_rows += len(by_xpath[0])
+    assert n_rows > 60
+
+    assert scrape(base_url, tmp_path, NodeScriptDriver, extraction="script").equals(scrape(base_url, tmp_path))
+
+
+def test_timings_csv_has_a_row_per_page_with_its_status(base_url, tmp_path, monkeypatch):
+    broken = [search_url("Anson, Tanjong Pagar", 2, base_url)]
+    df = scrape(base_url, tmp_path, lambda: LxmlDriver(broken), retries=2)
+
+    timings = pd.read_csv(tmp_path / "raw_data1_timings.csv")
+    assert list(timings.columns) == PAGE_TIMING_COLUMNS
+    assert list(zip(timings["district"], timings["page"], timings["status"], timings["attempts"])) == [
+        ("Anson, Tanjong Pagar", 1, "ok", 1), ("Anson, Tanjong Pagar", 2, "failed", 3),
+        ("High Street, Beach Road (part)", 1, "empty", 1),
+        ("Middle Road, Golden Mile", 1, "ok", 1), ("Middle Road, Golden Mile", 2, "ok", 1),
+        ("Raffles Place, Cecil, Marina, People's Park", 1, "ok", 1),
+    ]
+    read = timings[timings["status"] != "failed"]
+    assert read["listings"].sum() == len(df)
+    assert (read[["wait_s", "load_s", "extract_s"]] >= 0).all().all()
+    assert timings.loc[timings["status"] == "failed", "load_s"].isna().all()
+
+    # The serial scraper: page one of every district, one whose connection drops failed after one attempt
+    class DroppingDriver(LxmlDriver):
+        def get(self, url):
+            if url == search_url("Jurong", 1, base_url):
+                raise WebDriverException("net::ERR_CONNECTION_RESET")
+            super().get(url)
+
+    monkeypatch.setattr(scraping, "new_driver", lambda *args, **kwargs: DroppingDriver())
+    monkeypatch.setattr(scraping.time, "sleep", lambda seconds: None)
+    scrape_edgeprop_properties(base_url, str(tmp_path / "serial.csv"), extraction="xpath")
+    timings = pd.read_csv(tmp_path / "serial_timings.csv").set_index("district")
+    assert list(timings.columns) == PAGE_TIMING_COLUMNS[1:]
+    assert list(timings.index) == list(DISTRICTS)
+    assert timings.loc["Jurong", "status"] == "failed"
+    assert set(timings.loc[["Orchard, Cairnhill, River Valley", "Seletar"], "status"]) == {"empty", "ok"}
+    assert (timings.drop(index="Jurong")["attempts"] == 1).all()
+
+
+def test_checkpointed_scrape_resumes_after_an_interrupted_run(base_url, tmp_path):
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    full = scrape(base_url, tmp_path, checkpoint_dir=checkpoint_dir)
+    assert read_manifest(checkpoint_dir)["complete"]
+
+    # Killed after page one of Anson: its later pages, Raffles Place and the manifest were never written
+    for district, page in [("Anson, Tanjong Pagar", 2), ("Anson, Tanjong Pagar", 3),
+                           ("Raffles Place, Cecil, Marina, People's Park", 1)]:
+        os.remove(checkpoint_file(checkpoint_dir, district, page))
+    os.remove(os.path.join(checkpoint_dir, "manifest.json"))
+
+    drivers, make_driver = recording_drivers()
+    resumed = scrape(base_url, tmp_path, make_driver, checkpoint_dir=checkpoint_dir)
+    assert fetched(drivers) == sorted([search_url("Anson, Tanjong Pagar", 2, base_url),
+                                       search_url("Anson, Tanjong Pagar", 3, base_url),
+                                       search_url("Raffles Place, Cecil, Marina, People's Park", 1, base_url)])
+    assert resumed.equals(full)
+    assert read_manifest(checkpoint_dir)["complete"]
+
+
+def test_checkpointed_scrape_resumes_from_a_timed_out_page(base_url, tmp_path):
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    broken = search_url("Anson, Tanjong Pagar", 2, base_url)
+    scrape(base_url, tmp_path, lambda: LxmlDriver([broken]), checkpoint_dir=checkpoint_dir)
+    manifest = read_manifest(checkpoint_dir)
+    assert not manifest["complete"]
+    assert manifest["failed"] == [["Anson, Tanjong Pagar", 2]]
+    assert not os.path.exists(checkpoint_file(checkpoint_dir, "Anson, Tanjong Pagar", 2))
+
+    drivers, make_driver = recording_drivers()
+    resumed = scrape(base_url, tmp_path, make_driver, checkpoint_dir=checkpoint_dir)
+    assert fetched(drivers) == [broken, search_url("Anson, Tanjong Pagar", 3, base_url)]
+    assert resumed.equals(scrape(base_url, tmp_path))
+    assert read_manifest(checkpoint_dir)["complete"]
+
+
+def test_force_refresh_wipes_checkpoints(base_url, tmp_path):
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    full = scrape(base_url, tmp_path, checkpoint_dir=checkpoint_dir)
+    # A stale checkpoint: page one of Anson read back with no rows
+    save_checkpoint(checkpoint_dir, "Anson, Tanjong Pagar", 1, [], 20)
+
+    drivers, make_driver = recording_drivers()
+    rebuilt = scrape(base_url, tmp_path, make_driver, checkpoint_dir=checkpoint_dir)
+    assert drivers == []
+    assert len(rebuilt) == len(full) - len(full.query("district == 'Anson, Tanjong Pagar'").head(20))
+
+    refreshed = scrape(base_url, tmp_path, make_driver, checkpoint_dir=checkpoint_dir, force_refresh=True)
+    assert fetched(drivers) == sorted(search_url(district, page, base_url) for district, page in [
+        ("Anson, Tanjong Pagar", 1), ("Anson, Tanjong Pagar", 2), ("Anson, Tanjong Pagar", 3),
+        ("High Street, Beach Road (part)", 1), ("Middle Road, Golden Mile", 1), ("Middle Road, Golden Mile", 2),
+        ("Raffles Place, Cecil, Marina, People's Park", 1)])
+    assert refreshed.equals(full)
+    assert read_manifest(checkpoint_dir)["complete"]
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from api.preprocessing import preprocess_user_input, preprocess_batch, encode_user_input, encode_batch, get_encoder
+
+
+ROWS = [
+    {"build_year": 2010, "size_sqft": 1200.0, "n_bedrooms": 3, "n_bathrooms": 2,
+     "area": "Orchard", "district": "Ardmore, Bukit Timah, Holland Road, Tanglin",
+     "region": "Central Region", "n_rooms": "HDB 4-Room"},
+    {"build_year": 1990, "size_sqft": 1000.0, "n_bedrooms": 3, "n_bathrooms": 2,
+     "area": "Queenstown", "district": "Queenstown, Tiong Bahru", "region": "Central",
+     "n_rooms": "HDB 5PA (Premium Apartment)"},
+    {"build_year": 2015, "size_sqft": 850.5, "n_bedrooms": 0, "n_bathrooms": 0,
+     "area": "Hougang", "district": "Geylang, Eunos", "region": "East",
+     "n_rooms": "HDB 3-Room"},
+    {"build_year": 1978, "size_sqft": 645.0, "n_bedrooms": 2, "n_bathrooms": 1,
+     "area": "Marine Parade", "district": "Jurong", "region": "West",
+     "n_rooms": "HDB 4-Room"},
+]
+
+
+def test_encode_user_input_matches_dataframe_bytes():
+    for row in ROWS:
+        expected = preprocess_user_input(row).to_numpy(dtype=np.float64)
+        assert encode_user_input(row).tobytes() == expected.tobytes()
+
+
+def test_encode_batch_matches_dataframe_bytes():
+    expected = preprocess_batch(ROWS).to_numpy(dtype=np.float64)
+    encoded = encode_batch(ROWS)
+    assert encoded.shape == (len(ROWS), len(get_encoder().selected_features))
+    assert encoded.tobytes() == expected.tobytes()
+
+
+def test_encode_batch_reuses_preallocated_buffer():
+    buffer = np.full((10, get_encoder().n_features), 7.0)
+    encoded = get_encoder().encode_batch(ROWS, out=buffer)
+    assert np.shares_memory(encoded, buffer)
+    assert encoded.tobytes() == encode_batch(ROWS).tobytes()
+
+
+def test_encode_columns_matches_encode_batch():
+    columns = {name: np.array([row[name] for row in ROWS])
+               for name in ("build_year", "size_sqft", "n_bedrooms", "n_bathrooms")}
+    for name in ("area", "district", "region", "n_rooms"):
+        values = sorted({row[name] for row in ROWS})
+        columns[name] = (np.array([values.index(row[name]) for row in ROWS]), values)
+    assert get_encoder().encode_columns(columns).tobytes() == encode_batch(ROWS).tobytes()
+
+
+def test_encode_missing_field():
+    row = dict(ROWS[0])
+    del row["n_bedrooms"]
+    with pytest.raises(KeyError):
+        encode_user_input(row)
@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+from housing_etl.fingerprints import commit_listing_delta, split_new_listings
+
+
+def listings(*rows):
+    return pd.DataFrame([{"title": title, "price": price, "size_sqft": "1,001 sqft", "road_name": road,
+                          "district": "Jurong"} for title, price, road in rows])
+
+
+FLAT_A = ("Blk 1 Jurong West", "S$ 450,000", "Jurong West St 41")
+FLAT_B = ("Blk 2 Jurong East", "S$ 520,000", "Jurong East Ave 1")
+FLAT_B_REPRICED = ("Blk 2 Jurong East", "S$ 499,000", "Jurong East Ave 1")
+FLAT_C = ("Blk 3 Boon Lay", "S$ 380,000", "Boon Lay Dr")
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return {"index_path": str(tmp_path / "listing_index.csv"), "delta_path": str(tmp_path / "listing_delta.csv")}
+
+
+def run_day(df, seen_date, paths, changes_path, **kwargs):
+    """split_new_listings then commit_listing_delta, as the DAG runs them for one day."""
+    new = split_new_listings(df, seen_date=seen_date, **paths, **kwargs)
+    counts = commit_listing_delta(changes_path=changes_path, **paths)
+    return new, counts
+
+
+def test_listings_are_classified_against_the_committed_index(paths, tmp_path):
+    changes_path = str(tmp_path / "listing_changes.csv")
+    new, counts = run_day(listings(FLAT_A, FLAT_B), "2025-04-01", paths, changes_path)
+    assert list(new["title"]) == [FLAT_A[0], FLAT_B[0]]
+    assert counts == {"new": 2, "changed": 0, "unchanged": 0}
+
+    # Whitespace differences don't make a listing new; a new price makes it changed
+    day2 = listings(FLAT_A, FLAT_B_REPRICED, FLAT_C)
+    day2.loc[0, "title"] = " Blk 1  Jurong West "
+    new = split_new_listings(day2, seen_date="2025-04-02", **paths)
+    assert list(new["title"]) == [FLAT_B[0], FLAT_C[0]]
+    assert list(pd.read_csv(paths["delta_path"])["change"]) == ["unchanged", "changed", "new"]
+    assert len(split_new_listings(day2, seen_date="2025-04-02", process_all=True, **paths)) == 3
+
+    # Nothing is folded into the index until the delta is committed
+    assert list(pd.read_csv(paths["index_path"])["first_seen"]) == ["2025-04-01", "2025-04-01"]
+
+
+def test_fingerprints_unseen_past_retention_are_forgotten(paths, tmp_path):
+    changes_path = str(tmp_path / "listing_changes.csv")
+    run_day(listings(FLAT_A, FLAT_C), "2025-04-01", paths, changes_path, retention_days=7)
+    run_day(listings(FLAT_C), "2025-04-05", paths, changes_path, retention_days=7)
+
+    # Seven days after it was last seen FLAT_A is still known; a day later it is new again
+    new = split_new_listings(listings(FLAT_A), seen_date="2025-04-08", retention_days=7, **paths)
+    assert new.empty
+    new = split_new_listings(listings(FLAT_A, FLAT_C), seen_date="2025-04-09", retention_days=7, **paths)
+    assert list(new["title"]) == [FLAT_A[0]]
+
+    # The expired entry is dropped from the index; FLAT_A comes back with a new first_seen
+    commit_listing_delta(changes_path=changes_path, retention_days=7, **paths)
+    index = pd.read_csv(paths["index_path"])
+    assert sorted(zip(index["first_seen"], index["last_seen"])) == [("2025-04-01", "2025-04-09"),
+                                                                    ("2025-04-09", "2025-04-09")]
+
+
+def test_rerunning_a_day_replaces_its_row_in_listing_changes(paths, tmp_path):
+    changes_path = str(tmp_path / "listing_changes.csv")
+    run_day(listings(FLAT_A, FLAT_B), "2025-04-01", paths, changes_path)
+    run_day(listings(FLAT_A), "2025-04-02", paths, changes_path)
+    run_day(listings(FLAT_A, FLAT_B_REPRICED, FLAT_C), "2025-04-02", paths, changes_path)
+
+    changes = pd.read_csv(changes_path, dtype={"date": str})
+    assert list(changes.columns) == ["date", "new", "changed", "unchanged", "total"]
+    assert changes.to_dict("records") == [
+        {"date": "2025-04-01", "new": 2, "changed": 0, "unchanged": 0, "total": 2},
+        {"date": "2025-04-02", "new": 1, "changed": 1, "unchanged": 1, "total": 3},
+    ]
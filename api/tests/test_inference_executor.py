@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import pytest
+from api.inference_executor import InferenceExecutor, ExecutorSaturatedError
+
+
+def test_run_returns_result_and_reraises():
+    executor = InferenceExecutor(max_workers=2, max_pending=4)
+
+    def fail():
+        raise ValueError("bad row")
+
+    async def scenario():
+        assert await executor.run(sum, [1, 2, 3]) == 6
+        with pytest.raises(ValueError):
+            await executor.run(fail)
+
+    asyncio.run(scenario())
+    executor.shutdown()
+    stats = executor.stats()
+    assert stats["completed"] == 1 and stats["failed"] == 1 and stats["pending"] == 0
+
+
+def test_saturated_executor_sheds_instead_of_queueing():
+    executor = InferenceExecutor(max_workers=1, max_pending=2, timeout=5)
+    release = threading.Event()
+
+    async def scenario():
+        held = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(sum, [1])
+        release.set()
+        await asyncio.gather(*held)
+        # Slots come back once the work is done
+        assert await executor.run(sum, [1]) == 1
+
+    asyncio.run(scenario())
+    executor.shutdown()
+    assert executor.stats()["rejected"] == 1
+
+
+def test_timeout_cancels_queued_job():
+    executor = InferenceExecutor(max_workers=1, max_pending=4, timeout=0.1)
+    release = threading.Event()
+    ran = []
+
+    async def scenario():
+        blocker = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.01)
+        # Queued behind the blocker: times out and is cancelled before it starts
+        with pytest.raises(TimeoutError):
+            await executor.run(ran.append, "queued")
+        release.set()
+        with pytest.raises(TimeoutError):
+            await blocker
+
+    asyncio.run(scenario())
+    executor.shutdown()
+    assert ran == []
+    assert executor.stats()["timed_out"] == 2
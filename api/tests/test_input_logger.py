@@ -0,0 +1,98 @@
+import threading
+import time
+import pytest
+from api.input_logger import InputLogger
+
+
+class RecordingLogger(InputLogger):
+    """InputLogger that keeps flushed batches in memory instead of writing to MySQL/CSV."""
+
+    def __init__(self, fail=False, write_delay=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.batches = []
+        self.fail = fail
+        self.write_delay = write_delay
+        self.release = threading.Event()
+        self.release.set()
+
+    def _write_batch(self, batch):
+        self.release.wait()
+        time.sleep(self.write_delay)
+        if self.fail:
+            raise RuntimeError("database is down")
+        self.batches.append(list(batch))
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_flushes_by_size():
+    logger = RecordingLogger(batch_size=10, flush_interval=60)
+    logger.log_rows([(i,) for i in range(25)])
+    assert wait_for(lambda: len(logger.batches) >= 2)
+    assert [len(b) for b in logger.batches[:2]] == [10, 10]
+    logger.close()
+    assert sum(len(b) for b in logger.batches) == 25
+    assert logger.stats()["written"] == 25
+
+
+def test_flushes_by_time():
+    logger = RecordingLogger(batch_size=1000, flush_interval=0.2)
+    logger.log_rows([(1,), (2,)])
+    assert wait_for(lambda: logger.batches == [[(1,), (2,)]], timeout=2)
+    logger.close()
+
+
+def test_close_drains_queue_in_order():
+    logger = RecordingLogger(batch_size=7, flush_interval=60)
+    logger.log_rows([(i,) for i in range(50)])
+    logger.close()
+    flushed = [row for batch in logger.batches for row in batch]
+    assert flushed == [(i,) for i in range(50)]
+    assert logger.stats()["queue_depth"] == 0
+
+
+def test_drop_newest_when_full():
+    logger = RecordingLogger(max_queue_size=5, batch_size=100, flush_interval=60)
+    logger.release.clear()  # hold the worker so the queue fills up
+    logger.log_rows([(i,) for i in range(20)])
+    stats = logger.stats()
+    assert stats["dropped"] >= 14
+    assert stats["enqueued"] + stats["dropped"] == 20
+    logger.release.set()
+    logger.close()
+    flushed = [row for batch in logger.batches for row in batch]
+    assert flushed == sorted(flushed)
+    assert (0,) in flushed
+
+
+def test_drop_oldest_keeps_latest_rows():
+    logger = RecordingLogger(max_queue_size=5, batch_size=100, flush_interval=60,
+                             overflow_policy="drop_oldest")
+    logger.release.clear()
+    logger.log_rows([(i,) for i in range(20)])
+    logger.release.set()
+    logger.close()
+    flushed = [row for batch in logger.batches for row in batch]
+    assert flushed[-5:] == [(i,) for i in range(15, 20)]
+    assert logger.stats()["dropped"] >= 14
+
+
+def test_failed_batches_are_counted_not_raised():
+    logger = RecordingLogger(fail=True, batch_size=3, flush_interval=60)
+    logger.log_rows([(i,) for i in range(6)])
+    logger.close()
+    stats = logger.stats()
+    assert stats["failed"] == 6
+    assert stats["written"] == 0
+
+
+def test_rejects_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        InputLogger(overflow_policy="spill_to_disk")
@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+# Imported flat, the way main.py does: importing it again as api.metrics would
+# register every metric a second time in prometheus_client's global registry
+import metrics
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = f"""
+import sys
+sys.path.insert(0, {API_DIR!r})
+from metrics import REQUESTS, STAGE_SECONDS, child
+child(REQUESTS, "/predict", "200", "1").inc()
+child(STAGE_SECONDS, "/predict", "model", "1").observe(0.002)
+"""
+
+
+def test_child_is_memoised():
+    assert metrics.child(metrics.REQUESTS, "/x", "200", "1") is metrics.child(metrics.REQUESTS, "/x", "200", "1")
+
+
+def test_publish_total_only_adds_the_increase():
+    counter = metrics.child(metrics.INPUT_LOG_ROWS, "test_outcome")
+    before = counter._value.get()
+    metrics.publish_total(counter, "test_total", 5)
+    metrics.publish_total(counter, "test_total", 5)
+    metrics.publish_total(counter, "test_total", 8)
+    assert counter._value.get() - before == 8
+
+
+def test_multiprocess_metrics_are_merged_across_workers(tmp_path):
+    # Two separate "workers" write to the same PROMETHEUS_MULTIPROC_DIR
+    env = {"PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "PATH": ""}
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", WORKER], env=env, check=True)
+
+    text = metrics.render(str(tmp_path)).decode()
+    assert 'housing_api_requests_total{endpoint="/predict",model_version="1",status="200"} 2.0' in text
+    assert 'housing_api_stage_duration_seconds_count{endpoint="/predict",model_version="1",stage="model"} 2.0' in text
@@ -0,0 +1,85 @@
+import threading
+import time
+import numpy as np
+import pytest
+from api.micro_batcher import MicroBatcher
+
+
+class RecordingModel:
+    """predict_fn that returns row sums plus a per-snapshot offset and records each call."""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, X, artifacts):
+        self.calls.append((X.shape[0], artifacts))
+        if self.fail:
+            raise RuntimeError("model exploded")
+        return X.sum(axis=1) + artifacts
+
+
+def predict_concurrently(batcher, rows, artifacts=0):
+    results = [None] * len(rows)
+    start = threading.Barrier(len(rows))
+
+    def call(i):
+        start.wait()
+        try:
+            results[i] = batcher.predict(rows[i], artifacts if not callable(artifacts) else artifacts(i))
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(rows))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_rows_share_model_calls_and_get_their_own_result():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=64, window=0.05, adaptive=False)
+    rows = [np.full((1, 3), float(i)) for i in range(16)]
+
+    results = predict_concurrently(batcher, rows)
+    batcher.stop()
+
+    assert results == [3.0 * i for i in range(16)]
+    assert len(model.calls) < 16
+    stats = batcher.stats()
+    assert stats["requests"] == 16 and stats["batches"] == len(model.calls)
+
+
+def test_max_batch_size_caps_each_call():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_batch_size=4, window=0.05, adaptive=False)
+    predict_concurrently(batcher, [np.ones((1, 2))] * 12)
+    batcher.stop()
+    assert max(size for size, _ in model.calls) <= 4
+
+
+def test_each_snapshot_is_scored_with_its_own_model():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, window=0.05, adaptive=False)
+    results = predict_concurrently(batcher, [np.ones((1, 2))] * 8, artifacts=lambda i: 100 * (i % 2))
+    batcher.stop()
+    assert results == [2.0 + 100 * (i % 2) for i in range(8)]
+    assert {artifacts for _, artifacts in model.calls} == {0, 100}
+
+
+def test_model_errors_reach_every_caller():
+    batcher = MicroBatcher(RecordingModel(fail=True), window=0.05, adaptive=False)
+    results = predict_concurrently(batcher, [np.ones((1, 2))] * 4)
+    batcher.stop()
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert batcher.stats()["failed"] == 4
+
+
+def test_adaptive_window_does_not_delay_a_lone_request():
+    batcher = MicroBatcher(RecordingModel(), window=1.0, adaptive=True)
+    start = time.perf_counter()
+    assert batcher.predict(np.ones((1, 2)), 0) == pytest.approx(2.0)
+    assert time.perf_counter() - start < 0.5
+    batcher.stop()
@@ -0,0 +1,48 @@
+import json
+import shutil
+import pytest
+from api.artifacts import ArtifactCache, get_artifacts
+from api.model_bundle import BundleIntegrityError, export_bundle, load_bundle
+from api.predictor import predict_encoded, WARMUP_INPUTS
+
+
+@pytest.fixture(scope="module")
+def bundle_root(tmp_path_factory):
+    root = tmp_path_factory.mktemp("bundles")
+    export_bundle(get_artifacts(), str(root))
+    return root
+
+
+def test_bundle_round_trip_matches_registry_model(bundle_root):
+    artifacts = get_artifacts()
+    bundled = load_bundle(str(bundle_root))
+
+    assert bundled.key == artifacts.key
+    assert bundled.booster is not None
+    X = artifacts.encoder.encode_batch(WARMUP_INPUTS * 5)
+    assert predict_encoded(X, bundled) == pytest.approx(predict_encoded(X, artifacts))
+    assert predict_encoded(X, bundled, mode="pyfunc") == pytest.approx(predict_encoded(X, artifacts))
+
+
+def test_tampered_bundle_is_rejected(bundle_root, tmp_path):
+    bundle_dir = bundle_root / get_artifacts().version
+    manifest = json.loads((bundle_dir / "manifest.json").read_text())
+    assert {"model.txt", "scaler.joblib", "selected_features.joblib"} <= set(manifest["files"])
+
+    copy = tmp_path / "7"
+    shutil.copytree(bundle_dir, copy)
+    with open(copy / "model.txt", "a") as f:
+        f.write("\n")
+
+    with pytest.raises(BundleIntegrityError):
+        load_bundle(str(tmp_path))
+
+
+def test_cache_serves_bundle_without_the_registry(bundle_root):
+    cache = ArtifactCache(tracking_uri="http://127.0.0.1:1", bundle_dir=str(bundle_root))
+
+    assert cache.refresh() is True
+    assert cache.pinned
+    assert cache.get().version == get_artifacts().version
+    # Pinned: later polls never reach the (unreachable) tracking server
+    assert cache.refresh() is False
@@ -0,0 +1,90 @@
+from api.prediction_cache import PredictionCache, canonical_key
+
+
+INPUT = {
+    "build_year": 2010, "size_sqft": 1200.0, "n_bedrooms": 3, "n_bathrooms": 2,
+    "area": "Orchard", "district": "Ardmore, Bukit Timah, Holland Road, Tanglin",
+    "region": "Central Region", "n_rooms": "HDB 4-Room"
+}
+
+
+class DictStore:
+    """In-memory stand-in for the shared tier."""
+
+    def __init__(self, fail=False):
+        self.data = {}
+        self.fail = fail
+
+    def get(self, key):
+        if self.fail:
+            raise ConnectionError("shared store down")
+        return self.data.get(key)
+
+    def set(self, key, value):
+        if self.fail:
+            raise ConnectionError("shared store down")
+        self.data[key] = value
+
+
+def test_canonical_key_ignores_field_order_and_int_float_spelling():
+    reordered = dict(reversed(list(INPUT.items())))
+    reordered["size_sqft"] = 1200
+    assert canonical_key(INPUT, ("3", "abc")) == canonical_key(reordered, ("3", "abc"))
+
+
+def test_canonical_key_changes_with_model_and_inputs():
+    key = canonical_key(INPUT, ("3", "abc"))
+    assert key != canonical_key(INPUT, ("4", "abc"))
+    assert key != canonical_key(INPUT, ("3", "def"))
+    assert key != canonical_key({**INPUT, "size_sqft": 1201.0}, ("3", "abc"))
+
+
+def test_local_tier_hits_misses_and_evictions():
+    cache = PredictionCache(maxsize=2)
+    assert cache.get("a") is None
+    cache.put("a", 1.0)
+    cache.put("b", 2.0)
+    assert cache.get("a") == 1.0  # "a" is now most recently used
+    cache.put("c", 3.0)           # evicts "b"
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (1, 2, 1, 2)
+
+
+def test_shared_tier_fills_local_tier():
+    shared = DictStore()
+    PredictionCache(maxsize=10, shared_store=shared).put("k", 42.0)
+
+    other_process = PredictionCache(maxsize=10, shared_store=shared)
+    assert other_process.get("k") == 42.0
+    assert other_process.get("k") == 42.0
+    stats = other_process.stats()
+    assert (stats["shared_hits"], stats["local_hits"]) == (1, 1)
+
+
+def test_shared_tier_errors_are_misses():
+    cache = PredictionCache(maxsize=10, shared_store=DictStore(fail=True), shared_backoff_seconds=0)
+    cache.put("k", 1.0)
+    assert cache.get("missing") is None
+    assert cache.get("k") == 1.0
+    assert cache.stats()["shared_errors"] == 2
+
+
+def test_shared_tier_is_skipped_after_an_error_until_backoff_expires():
+    now = [0.0]
+    store = DictStore(fail=True)
+    cache = PredictionCache(maxsize=10, shared_store=store, shared_backoff_seconds=30, clock=lambda: now[0])
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    cache.put("b", 2.0)
+    stats = cache.stats()
+    assert (stats["shared_errors"], stats["shared_skipped"]) == (1, 2)
+    assert stats["shared_tier_open"] is False
+
+    # Window over and the store is back: the next call probes it and it serves again
+    now[0] = 31.0
+    store.fail = False
+    store.data["c"] = 3.0
+    assert cache.get("c") == 3.0
+    assert cache.stats()["shared_tier_open"] is True
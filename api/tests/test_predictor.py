@@ -27,3 +27,16 @@ def test_predict_price_valid_input():
     # Assertions
     assert isinstance(result, float)
     assert result > 0
+
+
+def test_native_booster_matches_pyfunc():
+    import numpy as np
+    from api.artifacts import get_artifacts
+    from api.predictor import predict_encoded, WARMUP_INPUTS
+
+    artifacts = get_artifacts()
+    assert artifacts.booster is not None  # lightgbm_model is logged with mlflow.lightgbm
+    X = artifacts.encoder.encode_batch(WARMUP_INPUTS * 10)
+    native = predict_encoded(X, artifacts, mode="native")
+    pyfunc = predict_encoded(X, artifacts, mode="pyfunc")
+    assert np.array_equal(native, pyfunc)
@@ -1,5 +1,5 @@
 import pytest
-from api.preprocessing import preprocess_user_input
+from api.preprocessing import preprocess_user_input, preprocess_batch
 
 
 def test_preprocess_valid_input():
@@ -30,3 +30,30 @@ def test_preprocess_missing_field():
     }
     with pytest.raises(KeyError):
         preprocess_user_input(input_data)
+
+def test_preprocess_batch_matches_hand_computed_features():
+    rows = [
+        {"build_year": 1990, "size_sqft": 1000.0, "n_bedrooms": 3, "n_bathrooms": 2,
+         "area": "Queenstown", "district": "Queenstown, Tiong Bahru", "region": "Central",
+         "n_rooms": "HDB 4-Room"},
+        {"build_year": 2015, "size_sqft": 850.0, "n_bedrooms": 0, "n_bathrooms": 0,
+         "area": "Hougang", "district": "Geylang, Eunos", "region": "East",
+         "n_rooms": "HDB 3-Room"},
+    ]
+    # Worked out from the feature definitions; every other selected feature is 0
+    expected = [
+        {"build_year": 1990, "size_sqft": 1000.0, "size_per_room": 1000.0 / 3, "bed_bath_ratio": 1.5,
+         "is_central": 1, "is_mature_town": 1, "age_size_interaction": 35 * 1000.0,
+         "n_rooms_HDB 4-Room": 1, "district_Queenstown, Tiong Bahru": 1},
+        # Zero bedrooms/bathrooms are divided as 1
+        {"build_year": 2015, "size_sqft": 850.0, "size_per_room": 850.0, "bed_bath_ratio": 0.0,
+         "is_central": 0, "is_mature_town": 0, "age_size_interaction": 10 * 850.0,
+         "district_Geylang, Eunos": 1, "region_East": 1, "area_Hougang": 1},
+    ]
+    batch = preprocess_batch(rows)
+    assert len(batch) == 2
+    for i, (row, values) in enumerate(zip(rows, expected)):
+        assert set(values) <= set(batch.columns)
+        want = [values.get(col, 0) for col in batch.columns]
+        assert batch.iloc[i].tolist() == pytest.approx(want)
+        assert preprocess_user_input(row).iloc[0].tolist() == pytest.approx(want)
@@ -0,0 +1,50 @@
+import time
+from api.registry_poller import RegistryPoller
+
+
+class FakeCache:
+    """Stands in for ArtifactCache: refresh() reports a swap on the given calls."""
+
+    def __init__(self, swap_on=(), fail_on=()):
+        self.calls = 0
+        self.swap_on = swap_on
+        self.fail_on = fail_on
+        self.loaded = False
+
+    def refresh(self):
+        self.calls += 1
+        if self.calls in self.fail_on:
+            raise ConnectionError("registry unreachable")
+        swapped = self.calls in self.swap_on
+        self.loaded = self.loaded or swapped
+        return swapped
+
+
+def test_poll_once_counts_swaps_and_errors():
+    cache = FakeCache(swap_on=(2,), fail_on=(1,))
+    poller = RegistryPoller(cache)
+
+    poller.poll_once()
+    assert poller.last_error == "registry unreachable"
+    assert poller.swaps == 0
+
+    poller.poll_once()
+    assert poller.last_error is None
+    assert poller.swaps == 1
+
+    poller.poll_once()
+    assert poller.swaps == 1
+    assert poller.last_poll is not None
+
+
+def test_background_thread_retries_until_loaded_then_stops():
+    cache = FakeCache(swap_on=(3,), fail_on=(1,))
+    poller = RegistryPoller(cache, interval=60, retry_interval=0.01)
+    poller.start()
+    deadline = time.monotonic() + 5
+    while not cache.loaded and time.monotonic() < deadline:
+        time.sleep(0.01)
+    poller.stop()
+    assert cache.loaded
+    assert poller.swaps == 1
+    assert not poller.running
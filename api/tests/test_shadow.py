@@ -0,0 +1,77 @@
+import time
+import numpy as np
+from api.shadow import ShadowScorer
+
+
+class FakeEncoder:
+    def encode(self, input_dict):
+        return np.array([[input_dict["x"]]], dtype=float)
+
+
+class FakeArtifacts:
+    def __init__(self, version, offset):
+        self.version = version
+        self.offset = offset
+        self.encoder = FakeEncoder()
+
+
+def shifted_predict(X, artifacts):
+    return X[:, 0] + artifacts.offset
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+
+def test_deltas_are_aggregated_per_version_pair():
+    scorer = ShadowScorer(lambda: FakeArtifacts("2", 10.0), shifted_predict, sample_rate=1.0)
+    scorer.submit({"x": 100.0}, 100.0, "1")
+    scorer.submit({"x": 200.0}, 190.0, "1")
+    scorer.submit({"x": 50.0}, 50.0, "3")
+    wait_for(lambda: scorer.stats()["scored"] == 3)
+    scorer.stop()
+
+    stats = scorer.stats()
+    assert stats["shadow_version"] == "2" and stats["failed"] == 0
+    pair = scorer.stats(primary_version="1", shadow_version="2")["pairs"]
+    assert len(pair) == 1
+    assert pair[0]["count"] == 2
+    assert pair[0]["mean_delta"] == 15.0 and pair[0]["max_abs_delta"] == 20.0
+    assert pair[0]["shadow_p99_ms"] >= 0
+    assert [p["primary_version"] for p in scorer.stats(primary_version="3")["pairs"]] == ["3"]
+
+
+def test_sampling_and_full_queue_never_block():
+    def unavailable():
+        raise RuntimeError("registry down")
+
+    draws = iter([0.05, 0.5, 0.09])
+    scorer = ShadowScorer(unavailable, shifted_predict, sample_rate=0.1, max_queue_size=1,
+                          retry_interval=60, rng=lambda: next(draws))
+    assert [scorer.sample() for _ in range(3)] == [True, False, True]
+
+    # The shadow model never loads, so nothing drains the queue: the second request is dropped
+    scorer.submit({"x": 1.0}, 1.0, "1")
+    scorer.submit({"x": 2.0}, 2.0, "1")
+    scorer.stop()
+    stats = scorer.stats()
+    assert stats["submitted"] == 1 and stats["dropped"] == 1
+
+
+def test_shadow_load_failure_is_retried():
+    attempts = []
+
+    def load():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("registry down")
+        return FakeArtifacts("2", 0.0)
+
+    scorer = ShadowScorer(load, shifted_predict, retry_interval=0.01)
+    scorer.start()
+    wait_for(lambda: scorer.shadow is not None)
+    scorer.stop()
+    assert len(attempts) == 2 and scorer.last_error is None
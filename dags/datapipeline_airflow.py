@@ -1,12 +1,15 @@
+import os
 import sys
 sys.path.append("/opt/airflow")
 
 from airflow import DAG
+from airflow.exceptions import AirflowException
 from airflow.operators.python import PythonOperator
 from datetime import datetime, timedelta
 import pandas as pd
 
-from housing_etl.scraping import scrape_edgeprop_properties
+from housing_etl.scraping import prune_checkpoints, read_manifest, scrape_edgeprop_parallel
+from housing_etl.fingerprints import commit_listing_delta, split_new_listings
 from housing_etl.cleaning import clean_data
 from housing_etl.validate_and_features import validate_and_engineer_features
 from housing_etl.loading import load_to_db
@@ -14,8 +17,21 @@ from housing_etl.housekeeping import housekeeping
 
 
 SCRAPED_PATH = 'data/raw_data1.csv'
+# Only the listings that are new or changed since the last loaded run, see housing_etl.fingerprints
+NEW_LISTINGS_PATH = 'data/raw_new1.csv'
 CLEANED_PATH = 'data/cleaned_data1.csv'
 ENHANCED_PATH = 'data/enhanced_data1.csv'
+# Chrome drivers working the (district, page) queue in parallel
+SCRAPE_DRIVERS = int(os.environ.get('SCRAPE_DRIVERS', '4'))
+# "xpath" or "script" (one execute_script call per page), see housing_etl.scraping.EXTRACTORS
+SCRAPE_EXTRACTION = os.environ.get('SCRAPE_EXTRACTION', 'xpath')
+# "lean" blocks images, fonts and stylesheets and loads pages eagerly, see housing_etl.scraping.new_driver
+SCRAPE_PROFILE = os.environ.get('SCRAPE_PROFILE', 'default')
+# One directory of per-(district, page) checkpoints per logical date; the newest few are kept
+CHECKPOINT_ROOT = 'data/scrape_checkpoints'
+CHECKPOINT_RUNS_KEPT = 7
+# Re-scrape and re-process every listing; also per run with {"force_refresh": true} as the trigger conf
+SCRAPE_FORCE_REFRESH = os.environ.get('SCRAPE_FORCE_REFRESH', 'false').lower() == 'true'
 
 
 with DAG(
@@ -34,12 +50,28 @@ with DAG(
     tags=['housing', 'ETL'],
 ) as dag:
 
-    def scrape_task():
-        df = scrape_edgeprop_properties()
+    def scrape_task(ds, ti, dag_run):
+        checkpoint_dir = os.path.join(CHECKPOINT_ROOT, ds)
+        conf = (dag_run.conf or {}) if dag_run else {}
+        refresh_requested = SCRAPE_FORCE_REFRESH or bool(conf.get('force_refresh'))
+        # Only the first try may wipe checkpoints; a retry resumes from them
+        df = scrape_edgeprop_parallel(n_drivers=SCRAPE_DRIVERS, out_path=SCRAPED_PATH, extraction=SCRAPE_EXTRACTION,
+                                      profile=SCRAPE_PROFILE, checkpoint_dir=checkpoint_dir,
+                                      force_refresh=refresh_requested and ti.try_number == 1)
         df.to_csv(SCRAPED_PATH, index=False)
+        manifest = read_manifest(checkpoint_dir)
+        prune_checkpoints(CHECKPOINT_ROOT, keep=CHECKPOINT_RUNS_KEPT)
+
+        if not manifest['complete'] and ti.try_number <= ti.max_tries:
+            # Fail so the retry fetches just the missing pages; the last try goes on with what it has
+            raise AirflowException(f"{len(manifest['failed'])} pages failed, retrying: {manifest['failed']}")
+
+        # Downstream stages only see listings whose fingerprint was not loaded before
+        new_df = split_new_listings(df, seen_date=ds, process_all=refresh_requested)
+        new_df.to_csv(NEW_LISTINGS_PATH, index=False)
 
     def clean_task():
-        df = pd.read_csv(SCRAPED_PATH)
+        df = pd.read_csv(NEW_LISTINGS_PATH)
         df = clean_data(df)
         df.to_csv(CLEANED_PATH, index=False)
 
@@ -51,6 +83,8 @@ with DAG(
     def load_task():
         df = pd.read_csv(ENHANCED_PATH)
         load_to_db(df)
+        # Only now are today's fingerprints "seen": a failed load leaves them new for the next run
+        commit_listing_delta()
 
     t1 = PythonOperator(task_id='housekeeping', python_callable=housekeeping)
     t2 = PythonOperator(task_id='scrape', python_callable=scrape_task)
@@ -0,0 +1,96 @@
+# housing_etl/bench_extraction.py
+"""
+Per-page extraction time, XPath (find_elements + per-element reads) against
+one execute_script call, on fixture pages from housing_etl/fixture_server.py.
+
+One headless Chrome loads each page once, then each extractor runs --repeat
+times on the loaded page. Pages are timed only after load, so this measures
+extraction alone. The table shows the median ms per page, the WebDriver
+commands per page, and whether both extractors returned the same rows on
+every page. Needs Chrome and chromedriver, as the scrapers do.
+
+    python housing_etl/bench_extraction.py
+    python housing_etl/bench_extraction.py --pages 40 --repeat 5
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from selenium import webdriver
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from housing_etl.fixture_server import FixtureServer
+from housing_etl.scraping import (DISTRICTS, EXTRACTORS, PAGE_SIZE, chrome_options, load_search_page,
+                                  search_url)
+
+
+def fixture_pages(server, n_pages):
+    """(district, page) of the first n_pages non-empty fixture pages, districts interleaved."""
+    by_code = {code: district for district, code in DISTRICTS.items()}
+    pages = []
+    for page in range(1, 100):
+        for code, listings in server.listings.items():
+            if len(listings) > (page - 1) * PAGE_SIZE:
+                pages.append((by_code[code], page))
+        if len(pages) >= n_pages:
+            break
+    return pages[:n_pages]
+
+
+def count_commands(driver):
+    """Wrap driver.execute so every WebDriver command sent is counted in the returned dict."""
+    counter = {"commands": 0}
+    execute = driver.execute
+
+    def counting_execute(*args, **kwargs):
+        counter["commands"] += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counting_execute
+    return counter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    server = FixtureServer()
+    base_url = server.start()
+    driver = webdriver.Chrome(options=chrome_options(debugging_port=None))
+    counter = count_commands(driver)
+
+    timings = {name: [] for name in EXTRACTORS}
+    commands = {name: [] for name in EXTRACTORS}
+    rows_read = {name: 0 for name in EXTRACTORS}
+    same_rows = True
+    try:
+        for district, page in fixture_pages(server, args.pages):
+            load_search_page(driver, search_url(district, page, base_url))
+            results = {}
+            for name, extract in EXTRACTORS.items():
+                for _ in range(args.repeat):
+                    counter["commands"] = 0
+                    start = time.perf_counter()
+                    results[name] = extract(driver, district)[0]
+                    timings[name].append((time.perf_counter() - start) * 1e3)
+                    commands[name].append(counter["commands"])
+                rows_read[name] += len(results[name])
+            same_rows &= results["xpath"] == results["script"]
+    finally:
+        driver.quit()
+        server.stop()
+
+    print(f"{'extraction':<11} {'ms/page p50':>12} {'ms/page p95':>12} {'commands/page':>14} {'rows':>6}")
+    for name in EXTRACTORS:
+        p50, p95 = np.percentile(timings[name], [50, 95])
+        print(f"{name:<11} {p50:>12.1f} {p95:>12.1f} {np.mean(commands[name]):>14.0f} {rows_read[name]:>6}")
+    print(f"{'✅' if same_rows else '❌'} identical rows from both extractors on every page: {same_rows}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# housing_etl/bench_scraping.py
+"""
+Serial scraper against the driver pool, wall clock, on the local fixture site
+(housing_etl/fixture_server.py) so no request reaches edgeprop.sg.
+
+Runs:
+  serial       scrape_edgeprop_properties: one driver, page 1 of each district, 1s sleep
+  pool p1 xN   scrape_edgeprop_parallel with N drivers, page 1 only (same work as serial)
+  pool all xN  scrape_edgeprop_parallel with N drivers, every page
+  lean all xN  the same with profile="lean" (no images/fonts/css, eager page load)
+
+Each run checks its rows against the fixture listings it should have read, and
+reports what the fixture server sent: requests and MB, pages and assets alike.
+Per-page timings of the last run are in <tmp>/raw_data1_timings.csv.
+Needs Chrome and chromedriver, as the scrapers do.
+
+    python housing_etl/bench_scraping.py
+    python housing_etl/bench_scraping.py --drivers 1 2 4 8 --latency 0.5 --min-interval 0.2
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from housing_etl.fixture_server import FixtureServer
+from housing_etl.scraping import PAGE_SIZE, scrape_edgeprop_parallel, scrape_edgeprop_properties
+
+
+def expected_rows(server, max_pages):
+    return sum(min(len(listings), max_pages * PAGE_SIZE) for listings in server.listings.values())
+
+
+def run(name, server, scrape, max_pages):
+    before = server.stats()
+    start = time.perf_counter()
+    df = scrape()
+    seconds = time.perf_counter() - start
+    after = server.stats()
+    requests = sum(after["requests"].values()) - sum(before["requests"].values())
+    megabytes = (sum(after["bytes_sent"].values()) - sum(before["bytes_sent"].values())) / 1e6
+    print(f"{name:<14} {seconds:>9.1f} {len(df):>7} {expected_rows(server, max_pages):>9} {requests:>9} "
+          f"{megabytes:>7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drivers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--latency", type=float, default=0.3, help="Fixture server seconds per search page")
+    parser.add_argument("--asset-latency", type=float, default=0.05, help="Fixture server seconds per css/font/image")
+    parser.add_argument("--max-concurrent", type=int, default=4, help="host_max_concurrent for the pool")
+    parser.add_argument("--min-interval", type=float, default=0.25, help="host_min_interval for the pool")
+    parser.add_argument("--profiles", nargs="+", default=["default", "lean"], choices=["default", "lean"])
+    parser.add_argument("--skip-serial", action="store_true")
+    args = parser.parse_args()
+
+    server = FixtureServer(latency=args.latency, asset_latency=args.asset_latency)
+    base_url = server.start()
+    out_path = os.path.join(tempfile.mkdtemp(), "raw_data1.csv")
+    politeness = dict(host_max_concurrent=args.max_concurrent, host_min_interval=args.min_interval, page_timeout=3)
+
+    print(f"{'run':<14} {'seconds':>9} {'rows':>7} {'expected':>9} {'requests':>9} {'MB':>7}")
+    try:
+        if not args.skip_serial:
+            run("serial", server, lambda: scrape_edgeprop_properties(base_url, out_path), 1)
+        for n in args.drivers:
+            run(f"pool p1 x{n}", server, lambda: scrape_edgeprop_parallel(
+                n, max_pages=1, base_url=base_url, out_path=out_path, **politeness), 1)
+        for profile in args.profiles:
+            label = "pool" if profile == "default" else profile
+            for n in args.drivers:
+                run(f"{label} all x{n}", server, lambda: scrape_edgeprop_parallel(
+                    n, base_url=base_url, out_path=out_path, profile=profile, **politeness), 50)
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
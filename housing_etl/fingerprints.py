@@ -0,0 +1,114 @@
+# housing_etl/fingerprints.py
+import hashlib
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+INDEX_PATH = 'data/listing_index.csv'
+DELTA_PATH = 'data/listing_delta.csv'
+CHANGES_PATH = 'data/listing_changes.csv'
+
+# What makes a listing "the same flat" and what makes it "the same listing"
+KEY_COLUMNS = ['title', 'size_sqft', 'road_name']
+FINGERPRINT_COLUMNS = ['title', 'price', 'size_sqft', 'road_name']
+# Fingerprints not seen for this many days are forgotten, so a relisted flat counts as new again
+RETENTION_DAYS = 7
+
+INDEX_COLUMNS = ['fingerprint', 'listing_key', 'first_seen', 'last_seen']
+DELTA_COLUMNS = ['fingerprint', 'listing_key', 'change', 'seen_date']
+CHANGE_TYPES = ['new', 'changed', 'unchanged']
+
+
+def _digests(df, columns):
+    """Short sha1 per row over the raw scraped text of `columns`, whitespace-normalised."""
+    values = df[columns].fillna('').astype(str)
+    return pd.Series(
+        [hashlib.sha1('\x1f'.join(' '.join(v.split()) for v in row).encode()).hexdigest()[:16]
+         for row in values.itertuples(index=False)],
+        index=df.index, dtype=object,
+    )
+
+
+def listing_fingerprints(df):
+    return _digests(df, FINGERPRINT_COLUMNS)
+
+
+def listing_keys(df):
+    return _digests(df, KEY_COLUMNS)
+
+
+def load_index(index_path=INDEX_PATH, seen_date=None, retention_days=RETENTION_DAYS):
+    """The fingerprint index, without entries last seen more than retention_days before seen_date."""
+    if not os.path.exists(index_path):
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+    index = pd.read_csv(index_path, dtype=str)
+    if seen_date is not None:
+        cutoff = (datetime.strptime(seen_date, "%Y-%m-%d") - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+        index = index[index['last_seen'] >= cutoff]
+    return index
+
+
+def classify_listings(df, index):
+    """
+    "unchanged" if the listing's fingerprint is in the index, "changed" if only
+    its key is (same flat, e.g. a new price), otherwise "new".
+    """
+    fingerprints = listing_fingerprints(df)
+    keys = listing_keys(df)
+    change = np.where(fingerprints.isin(index['fingerprint']), 'unchanged',
+                      np.where(keys.isin(index['listing_key']), 'changed', 'new'))
+    return pd.DataFrame({'fingerprint': fingerprints, 'listing_key': keys, 'change': change}, index=df.index)
+
+
+def split_new_listings(df, index_path=INDEX_PATH, delta_path=DELTA_PATH, seen_date=None, process_all=False,
+                       retention_days=RETENTION_DAYS):
+    """
+    Raw scraped listings that are new or changed since the fingerprint index
+    was last committed (all of them with process_all). Every listing's
+    fingerprint and change type is written to delta_path for
+    commit_listing_delta once the day's rows are loaded.
+    """
+    seen_date = seen_date or datetime.now().strftime("%Y-%m-%d")
+    classes = classify_listings(df, load_index(index_path, seen_date, retention_days))
+    delta = classes.assign(seen_date=seen_date)[DELTA_COLUMNS]
+    delta.to_csv(delta_path, index=False)
+
+    counts = delta['change'].value_counts().reindex(CHANGE_TYPES, fill_value=0)
+    print(f"✅ {len(df)} listings scraped: {counts['new']} new, {counts['changed']} changed, "
+          f"{counts['unchanged']} unchanged")
+    if process_all:
+        return df
+    return df[classes['change'] != 'unchanged']
+
+
+def commit_listing_delta(index_path=INDEX_PATH, delta_path=DELTA_PATH, changes_path=CHANGES_PATH,
+                         retention_days=RETENTION_DAYS):
+    """
+    Fold the pending delta into the fingerprint index (first/last seen dates),
+    forget fingerprints unseen for retention_days, and record the day's
+    new/changed/unchanged counts in changes_path (one row per date, so a
+    re-run replaces it).
+    """
+    delta = pd.read_csv(delta_path, dtype=str)
+    if delta.empty:
+        print("⚠️ No listing delta to commit.")
+        return None
+    seen_date = delta['seen_date'].max()
+
+    seen = (delta.drop_duplicates('fingerprint')
+            .assign(first_seen=seen_date, last_seen=seen_date)[INDEX_COLUMNS])
+    index = pd.concat([load_index(index_path, seen_date, retention_days), seen], ignore_index=True)
+    index = index.groupby('fingerprint', as_index=False).agg(
+        listing_key=('listing_key', 'first'), first_seen=('first_seen', 'min'), last_seen=('last_seen', 'max'))
+    index[INDEX_COLUMNS].to_csv(index_path, index=False)
+
+    counts = delta['change'].value_counts().reindex(CHANGE_TYPES, fill_value=0)
+    day = pd.DataFrame([{'date': seen_date, **counts.to_dict(), 'total': len(delta)}])
+    if os.path.exists(changes_path):
+        history = pd.read_csv(changes_path, dtype={'date': str})
+        day = pd.concat([history[history['date'] != seen_date], day], ignore_index=True)
+    day.sort_values('date').to_csv(changes_path, index=False)
+    print(f"✅ Fingerprint index now holds {len(index)} listings; counts for {seen_date} saved to {changes_path}")
+    return counts.to_dict()
@@ -0,0 +1,188 @@
+# housing_etl/fixture_server.py
+"""
+Local stand-in for edgeprop.sg, for running the scrapers offline.
+
+Search pages are rendered from fixtures/edgeprop_listings.csv, a frozen copy of
+previously scraped listings (data/raw_data_v2.csv and data/raw_data1.csv,
+deduplicated). Each listing card uses the same markup the scraper's XPaths
+target, and the description fields appear in the order they were recorded.
+Every district is paginated PAGE_SIZE listings per page, and pages past the
+last one show the site's no-results message instead of cards. Each page also references a stylesheet, a web font and one
+image per card. These are generated static bytes, so a browser spends time and
+bandwidth on them much as it would on the real site.
+
+    python housing_etl/fixture_server.py --port 8800 --latency 0.2
+    # then scrape with base_url="http://127.0.0.1:8800"
+"""
+import argparse
+import html
+import os
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+try:
+    from housing_etl.scraping import DISTRICTS, PAGE_SIZE
+except ImportError:
+    from scraping import DISTRICTS, PAGE_SIZE
+
+LISTINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'edgeprop_listings.csv')
+DESC_FIELDS = ["hdb_type", "area", "year", "price_per_sqft", "size_sqft", "road_name"]
+ASSET_SIZES = {"css": 60_000, "font": 40_000, "image": 30_000}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>HDB for sale in {district} - EdgeProp</title>
+<link rel="stylesheet" href="/_next/static/css/app.css">
+<style>@font-face {{ font-family: Lato; src: url(/_next/static/media/lato.woff2); }} body {{ font-family: Lato; }}</style>
+</head><body>
+<div class="jsx-1 search-results">
+{cards}
+</div>
+{no_results}<div class="jsx-1 pagination">Page {page} of {n_pages}</div>
+</body></html>
+"""
+
+NO_RESULTS_HTML = """<div class="jsx-1 search-no-result"><h3>No results found</h3></div>
+"""
+
+CARD_TEMPLATE = """<div class="jsx-3303196364 listing-card">
+<img src="/images/listing-{listing_id}.jpg" alt="">
+<div class="jsx-911604640 listing-card-name"><h2>{title}</h2></div>
+<div class="jsx-911604640 listing-card-price"><a href="/listing/{listing_id}">{price}</a></div>
+{descs}
+<div class="jsx-2918323474 listing-card-detail"><span class="jsx-609329512"><span>{n_bedrooms} | {n_bathrooms}</span></span></div>
+</div>"""
+
+
+def load_listings(path=LISTINGS_PATH):
+    """Recorded listings grouped by district code, in recorded order."""
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    df["listing_id"] = range(len(df))
+    return {DISTRICTS[district]: group.to_dict("records") for district, group in df.groupby("district", sort=False)}
+
+
+def render_card(listing):
+    descs = "\n".join(
+        f'<div class="jsx-4147696354 desc-box">{html.escape(listing[field])}</div>'
+        for field in DESC_FIELDS if listing[field]
+    )
+    return CARD_TEMPLATE.format(
+        listing_id=listing["listing_id"], title=html.escape(listing["title"]), price=html.escape(listing["price"]),
+        descs=descs, n_bedrooms=html.escape(listing["n_bedrooms"]), n_bathrooms=html.escape(listing["n_bathrooms"]),
+    )
+
+
+def render_page(listings, district_code, page, page_size=PAGE_SIZE):
+    district_listings = listings.get(district_code, [])
+    on_page = district_listings[(page - 1) * page_size:page * page_size]
+    return PAGE_TEMPLATE.format(
+        district=district_code, page=page, n_pages=max(1, -(-len(district_listings) // page_size)),
+        cards="\n".join(render_card(listing) for listing in on_page),
+        no_results="" if on_page else NO_RESULTS_HTML,
+    )
+
+
+class FixtureServer:
+    """
+    Threaded HTTP server for the fixture site. `latency` seconds are added to
+    every search page and `asset_latency` to every css/font/image response.
+    Requests and bytes sent are counted per kind ("page", "css", "font",
+    "image", "other") in stats().
+    """
+
+    def __init__(self, listings_path=LISTINGS_PATH, port=0, latency=0.0, asset_latency=0.0, page_size=PAGE_SIZE):
+        self.listings = load_listings(listings_path)
+        self.latency = latency
+        self.asset_latency = asset_latency
+        self.page_size = page_size
+        self.requests = Counter()
+        self.bytes_sent = Counter()
+        self._stats_lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stats(self):
+        with self._stats_lock:
+            return {"requests": dict(self.requests), "bytes_sent": dict(self.bytes_sent)}
+
+    def respond(self, path):
+        """(kind, status, content type, body) for one GET path."""
+        parts = urlsplit(path)
+        if parts.path == "/property-search":
+            query = parse_qs(parts.query)
+            try:
+                district_code = int(query["district"][0])
+                page = int(query.get("page", ["1"])[0])
+            except (KeyError, ValueError):
+                return "page", 400, "text/plain", b"district and page are required"
+            time.sleep(self.latency)
+            body = render_page(self.listings, district_code, page, self.page_size).encode()
+            return "page", 200, "text/html; charset=utf-8", body
+        if parts.path.endswith(".css"):
+            time.sleep(self.asset_latency)
+            return "css", 200, "text/css", b"/* fixture */\n" + b" " * ASSET_SIZES["css"]
+        if parts.path.endswith(".woff2"):
+            time.sleep(self.asset_latency)
+            return "font", 200, "font/woff2", b"\0" * ASSET_SIZES["font"]
+        if parts.path.endswith(".jpg"):
+            time.sleep(self.asset_latency)
+            return "image", 200, "image/jpeg", b"\0" * ASSET_SIZES["image"]
+        return "other", 404, "text/plain", b"not found"
+
+    def _handler(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                kind, status, content_type, body = fixture.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with fixture._stats_lock:
+                    fixture.requests[kind] += 1
+                    fixture.bytes_sent[kind] += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every search page")
+    parser.add_argument("--asset-latency", type=float, default=0.0, help="Seconds added to every css/font/image")
+    args = parser.parse_args()
+
+    server = FixtureServer(port=args.port, latency=args.latency, asset_latency=args.asset_latency)
+    print(f"✅ Serving EdgeProp fixtures at {server.base_url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
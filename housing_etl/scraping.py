@@ -1,148 +1,551 @@
 # housing_etl/scraping.py
 import pandas as pd
 from datetime import datetime
+import json
+import os
+import queue
+import shutil
+import threading
 import time
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlsplit
 from selenium import webdriver
+from selenium.common.exceptions import InvalidSessionIdException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 
-def scrape_edgeprop_properties():
+SCRAPED_PATH = 'data/raw_data1.csv'
+EDGEPROP_URL = 'https://www.edgeprop.sg'
+SEARCH_PATH = '/property-search?listing_type=sale&property_type=13%2C75%2C76%2C77%2C78%2C79%2C80%2C81%2C82%2C83%2C84%2C85%2C86%2C87%2C88%2C89%2C90%2C91%2C92%2C93%2C94%2C95%2C96%2C97%2C98%2C99%2C100%2C101%2C102%2C134%2C135%2C136&district={district_code}&page={page}'
+# EdgeProp shows 20 listings per search page; a shorter page is the last one
+PAGE_SIZE = 20
+LISTING_XPATH = "//div[contains(@class, 'listing-card-name')]/h2"
+# The "no results" message EdgeProp shows instead of listing cards, e.g. past the last page
+NO_RESULTS_XPATH = "//div[contains(@class, 'search-no-result')]"
+TITLE_XPATH = '//div[@class="jsx-911604640 listing-card-name"]/h2'
+PRICE_XPATH = '//div[@class="jsx-911604640 listing-card-price"]/a'
+DESC_XPATH = '//div[contains(@class, "jsx-4147696354 desc-box")]'
+CARD_XPATH = "//div[contains(@class, 'listing-card-detail')]"
+BED_BATH_XPATH = './/span[@class="jsx-609329512"]/span'
+
+# Same XPaths evaluated in the page. innerText is what WebElement.text reads
+EXTRACT_LISTINGS_JS = """
+const all = (xpath, root) => {
+    const found = document.evaluate(xpath, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    return Array.from({length: found.snapshotLength}, (_, i) => found.snapshotItem(i));
+};
+const text = el => el.innerText.trim();
+return JSON.stringify({
+    titles: all(%s, document).map(text),
+    prices: all(%s, document).map(text),
+    descs: all(%s, document).map(text),
+    bed_baths: all(%s, document).map(card => {
+        const span = all(%s, card)[0];
+        return span ? span.textContent : null;
+    }),
+});
+""" % tuple(json.dumps(xpath) for xpath in (TITLE_XPATH, PRICE_XPATH, DESC_XPATH, CARD_XPATH, BED_BATH_XPATH))
+
+# Transfer sizes of the loaded page; blocked or cached resources count 0
+PAGE_BYTES_JS = """
+const navigation = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+return JSON.stringify({
+    document: navigation ? navigation.transferSize : null,
+    resources: resources.reduce((total, entry) => total + entry.transferSize, 0),
+    count: resources.length,
+});
+"""
+# Never requested under the "lean" profile: the scraper only reads the HTML
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.css",
+]
+
+PAGE_TIMING_COLUMNS = [
+    "district", "page", "url", "status", "attempts", "wait_s", "load_s", "extract_s", "listings",
+    "document_bytes", "resource_bytes", "resources"
+]
+
+PROPERTY_COLUMNS = [
+    "title", "price", "hdb_type", "area", "year", "price_per_sqft",
+    "size_sqft", "road_name", "n_bedrooms", "n_bathrooms", "district", "region"
+]
+
+DISTRICTS = {
+    "Raffles Place, Cecil, Marina, People's Park": 1024,
+    "Anson, Tanjong Pagar": 1025,
+    "Queenstown, Tiong Bahru": 1026,
+    "Telok Blangah, Harbourfront": 1027,
+    "Pasir Panjang, Hong Leong Garden, Clementi New Town": 1028,
+    "High Street, Beach Road (part)": 1029,
+    "Middle Road, Golden Mile": 1030,
+    "Little India": 1031,
+    "Orchard, Cairnhill, River Valley": 1032,
+    "Ardmore, Bukit Timah, Holland Road, Tanglin": 1033,
+    "Watten Estate, Novena, Thomson": 1034,
+    "Balestier, Toa Payoh, Serangoon": 1035,
+    "Macpherson, Braddell": 1036,
+    "Geylang, Eunos": 1037,
+    "Katong, Joo Chiat, Amber Road": 1038,
+    "Bedok, Upper East Coast, Eastwood, Kew Drive": 1039,
+    "Loyang, Changi": 1040,
+    "Tampines, Pasir Ris": 1041,
+    "Serangoon Garden, Hougang, Ponggol": 1042,
+    "Bishan, Ang Mo Kio": 1043,
+    "Upper Bukit Timah, Clementi Park, Ulu Pandan": 1044,
+    "Jurong": 1045,
+    "Hillview, Dairy Farm, Bukit Panjang, Choa Chu Kang": 1046,
+    "Lim Chu Kang, Tengah": 1047,
+    "Kranji, Woodgrove": 1048,
+    "Upper Thomson, Springleaf": 1049,
+    "Yishun, Sembawang": 1050,
+    "Seletar": 1051
+    }
+DISTRICT_REGION = {
+    "Raffles Place, Cecil, Marina, People's Park": "Central",
+    "Anson, Tanjong Pagar": "Central",
+    "Queenstown, Tiong Bahru": "Central",
+    "Telok Blangah, Harbourfront": "Central",
+    "High Street, Beach Road (part)": "Central",
+    "Middle Road, Golden Mile": "Central",
+    "Little India": "Central",
+    "Orchard, Cairnhill, River Valley": "Central",
+    "Ardmore, Bukit Timah, Holland Road, Tanglin": "Central",
+    "Watten Estate, Novena, Thomson": "Central",
+    "Balestier, Toa Payoh, Serangoon": "Central",
+    "Bishan, Ang Mo Kio": "Central",
+    "Macpherson, Braddell": "East",
+    "Geylang, Eunos": "East",
+    "Katong, Joo Chiat, Amber Road": "East",
+    "Bedok, Upper East Coast, Eastwood, Kew Drive": "East",
+    "Loyang, Changi": "East",
+    "Tampines, Pasir Ris": "East",
+    "Hillview, Dairy Farm, Bukit Panjang, Choa Chu Kang": "North",
+    "Kranji, Woodgrove": "North",
+    "Upper Thomson, Springleaf": "North",
+    "Yishun, Sembawang": "North",
+    "Serangoon Garden, Hougang, Ponggol": "North East",
+    "Seletar": "North East",
+    "Pasir Panjang, Hong Leong Garden, Clementi New Town": "West",
+    "Upper Bukit Timah, Clementi Park, Ulu Pandan": "West",
+    "Jurong": "West",
+    "Lim Chu Kang, Tengah": "West"
+    }
+
+
+def search_url(district, page=1, base_url=EDGEPROP_URL):
+    return base_url + SEARCH_PATH.format(district_code=DISTRICTS[district], page=page)
+
+
+def chrome_options(debugging_port=9222, profile="default"):
     options = webdriver.ChromeOptions()
     options.add_argument('--headless')  # ← important
     options.add_argument('--no-sandbox')  # ← important for Docker
     options.add_argument('--disable-dev-shm-usage')  # ← use /tmp instead of /dev/shm
     options.add_argument('--disable-gpu')  # ← optional but safe
-    options.add_argument('--remote-debugging-port=9222')  # ← useful for DevTools
+    if debugging_port:
+        # ← useful for DevTools; a fixed port only works for one browser at a time
+        options.add_argument(f'--remote-debugging-port={debugging_port}')
     options.add_argument('--disable-extensions')
     options.add_argument('--window-size=1920,1080')
+    if profile == "lean":
+        options.page_load_strategy = 'eager'  # ← return at DOMContentLoaded, not after every image
+        options.add_argument('--blink-settings=imagesEnabled=false')
+    return options
 
-    driver = webdriver.Chrome(options=options)
-
-    
-    districts = {
-        "Raffles Place, Cecil, Marina, People's Park": 1024,
-        "Anson, Tanjong Pagar": 1025,
-        "Queenstown, Tiong Bahru": 1026,
-        "Telok Blangah, Harbourfront": 1027,
-        "Pasir Panjang, Hong Leong Garden, Clementi New Town": 1028,
-        "High Street, Beach Road (part)": 1029,
-        "Middle Road, Golden Mile": 1030,
-        "Little India": 1031,
-        "Orchard, Cairnhill, River Valley": 1032,
-        "Ardmore, Bukit Timah, Holland Road, Tanglin": 1033,
-        "Watten Estate, Novena, Thomson": 1034,
-        "Balestier, Toa Payoh, Serangoon": 1035,
-        "Macpherson, Braddell": 1036,
-        "Geylang, Eunos": 1037,
-        "Katong, Joo Chiat, Amber Road": 1038,
-        "Bedok, Upper East Coast, Eastwood, Kew Drive": 1039,
-        "Loyang, Changi": 1040,
-        "Tampines, Pasir Ris": 1041,
-        "Serangoon Garden, Hougang, Ponggol": 1042,
-        "Bishan, Ang Mo Kio": 1043,
-        "Upper Bukit Timah, Clementi Park, Ulu Pandan": 1044,
-        "Jurong": 1045,
-        "Hillview, Dairy Farm, Bukit Panjang, Choa Chu Kang": 1046,
-        "Lim Chu Kang, Tengah": 1047,
-        "Kranji, Woodgrove": 1048,
-        "Upper Thomson, Springleaf": 1049,
-        "Yishun, Sembawang": 1050,
-        "Seletar": 1051
-        }
-    district_region = {
-        "Raffles Place, Cecil, Marina, People's Park": "Central",
-        "Anson, Tanjong Pagar": "Central",
-        "Queenstown, Tiong Bahru": "Central",
-        "Telok Blangah, Harbourfront": "Central",
-        "High Street, Beach Road (part)": "Central",
-        "Middle Road, Golden Mile": "Central",
-        "Little India": "Central",
-        "Orchard, Cairnhill, River Valley": "Central",
-        "Ardmore, Bukit Timah, Holland Road, Tanglin": "Central",
-        "Watten Estate, Novena, Thomson": "Central",
-        "Balestier, Toa Payoh, Serangoon": "Central",
-        "Bishan, Ang Mo Kio": "Central",
-        "Macpherson, Braddell": "East",
-        "Geylang, Eunos": "East",
-        "Katong, Joo Chiat, Amber Road": "East",
-        "Bedok, Upper East Coast, Eastwood, Kew Drive": "East",
-        "Loyang, Changi": "East",
-        "Tampines, Pasir Ris": "East",
-        "Hillview, Dairy Farm, Bukit Panjang, Choa Chu Kang": "North",
-        "Kranji, Woodgrove": "North",
-        "Upper Thomson, Springleaf": "North",
-        "Yishun, Sembawang": "North",
-        "Serangoon Garden, Hougang, Ponggol": "North East",
-        "Seletar": "North East",
-        "Pasir Panjang, Hong Leong Garden, Clementi New Town": "West",
-        "Upper Bukit Timah, Clementi Park, Ulu Pandan": "West",
-        "Jurong": "West",
-        "Lim Chu Kang, Tengah": "West"
-        }
-
-    urls = {}
-    for district, district_code in districts.items():
-        url = f'https://www.edgeprop.sg/property-search?listing_type=sale&property_type=13%2C75%2C76%2C77%2C78%2C79%2C80%2C81%2C82%2C83%2C84%2C85%2C86%2C87%2C88%2C89%2C90%2C91%2C92%2C93%2C94%2C95%2C96%2C97%2C98%2C99%2C100%2C101%2C102%2C134%2C135%2C136&district={district_code}&page={{page}}'
-        urls[district] = url
-    
-   
-    property_details = {
-        "title": [], "price": [], "hdb_type": [], "area": [], "year": [], "price_per_sqft": [],
-        "size_sqft": [], "road_name": [], "n_bedrooms": [], "n_bathrooms": [], "district": [], "region": []
+
+def new_driver(profile="default", debugging_port=None):
+    """
+    Chrome for scraping. The "lean" profile also blocks BLOCKED_URL_PATTERNS
+    (images, fonts, stylesheets) at the network layer, so they are never
+    requested, and loads pages with the eager strategy.
+    """
+    driver = webdriver.Chrome(options=chrome_options(debugging_port, profile))
+    if profile == "lean":
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
+
+
+def load_search_page(driver, url, timeout=10, poll_frequency=0.5):
+    """
+    Open one search page. True once a listing shows up, False if the page shows
+    EdgeProp's no-results message (a page past the last one). If neither appears
+    within timeout, TimeoutException is raised: a slow or broken page is not
+    treated as the end of a district.
+    """
+    driver.get(url)
+    WebDriverWait(driver, timeout, poll_frequency).until(EC.any_of(
+        EC.presence_of_element_located((By.XPATH, LISTING_XPATH)),
+        EC.presence_of_element_located((By.XPATH, NO_RESULTS_XPATH)),
+    ))
+    return bool(driver.find_elements(By.XPATH, LISTING_XPATH))
+
+
+def page_bytes(driver):
+    """Bytes the loaded page cost over the network, from the Resource Timing API (None if unavailable)."""
+    try:
+        return json.loads(driver.execute_script(PAGE_BYTES_JS))
+    except Exception:
+        return None
+
+
+def listing_row(title, price, chunk, bed, bath, district):
+    return {
+        "title": title,
+        "price": price,
+        "hdb_type": chunk[0],
+        "area": chunk[1],
+        "year": chunk[2],
+        "price_per_sqft": chunk[3] if len(chunk) > 3 else "",
+        "size_sqft": chunk[4] if len(chunk) > 4 else "",
+        "road_name": chunk[5] if len(chunk) > 5 else "",
+        "n_bedrooms": bed,
+        "n_bathrooms": bath,
+        "district": district,
+        "region": DISTRICT_REGION[district],
     }
 
-    for district, url in urls.items():
-        driver.get(url)
+
+def parse_listings(titles, prices, desc_texts, bed_baths, district):
+    """
+    Listing rows from the text of one search page: listing titles and prices,
+    every description box in page order, and the "beds | baths" text of each
+    listing card (None where a card has none). Description boxes are chunked
+    per listing at each one mentioning "HDB".
+    """
+    start_indices = [i for i, text in enumerate(desc_texts) if "HDB" in text]
+
+    rows = []
+    for i in range(min(len(titles), len(start_indices))):
+        chunk = desc_texts[start_indices[i]:start_indices[i+1] if i+1 < len(start_indices) else len(desc_texts)]
+        if len(chunk) < 5:
+            continue
+
         try:
-            WebDriverWait(driver, 10).until(EC.presence_of_element_located(
-                (By.XPATH, "//div[contains(@class, 'listing-card-name')]/h2")
-            ))
+            bed, bath = [s.strip() for s in bed_baths[i].split("|")]
         except:
             continue
 
-        titles = driver.find_elements(By.XPATH, '//div[@class="jsx-911604640 listing-card-name"]/h2')
-        prices = driver.find_elements(By.XPATH, '//div[@class="jsx-911604640 listing-card-price"]/a')
-        descs = driver.find_elements(By.XPATH, '//div[contains(@class, "jsx-4147696354 desc-box")]')
-        cards = driver.find_elements(By.XPATH, "//div[contains(@class, 'listing-card-detail')]")
+        rows.append(listing_row(titles[i], prices[i], chunk, bed, bath, district))
+    return rows
 
-        desc_texts = [el.text for el in descs]
-        start_indices = [i for i, text in enumerate(desc_texts) if "HDB" in text]
 
-        for i in range(min(len(titles), len(start_indices))):
-            chunk = desc_texts[start_indices[i]:start_indices[i+1] if i+1 < len(start_indices) else len(desc_texts)]
-            if len(chunk) < 5:
-                continue
+def extract_listings_xpath(driver, district):
+    """One WebDriver round trip per element lookup and per text read."""
+    titles = driver.find_elements(By.XPATH, TITLE_XPATH)
+    prices = driver.find_elements(By.XPATH, PRICE_XPATH)
+    descs = driver.find_elements(By.XPATH, DESC_XPATH)
+    cards = driver.find_elements(By.XPATH, CARD_XPATH)
 
-            try:
-                text = cards[i].find_element(By.XPATH, './/span[@class="jsx-609329512"]/span').get_attribute('textContent')
-                bed, bath = [s.strip() for s in text.split("|")]
-            except:
-                continue
+    def bed_bath(card):
+        try:
+            return card.find_element(By.XPATH, BED_BATH_XPATH).get_attribute('textContent')
+        except:
+            return None
 
-            property_details['title'].append(titles[i].text)
-            property_details['price'].append(prices[i].text)
-            property_details['hdb_type'].append(chunk[0])
-            property_details['area'].append(chunk[1])
-            property_details['year'].append(chunk[2])
-            property_details['price_per_sqft'].append(chunk[3] if len(chunk) > 3 else "")
-            property_details['size_sqft'].append(chunk[4] if len(chunk) > 4 else "")
-            property_details['road_name'].append(chunk[5] if len(chunk) > 5 else "")
-            property_details['n_bedrooms'].append(bed)
-            property_details['n_bathrooms'].append(bath)
-            property_details['district'].append(district)
-            property_details['region'].append(district_region[district])
+    desc_texts = [el.text for el in descs]
+    n_listings = min(len(titles), len([text for text in desc_texts if "HDB" in text]))
+    bed_baths = [bed_bath(card) for card in cards[:n_listings]]
+    rows = parse_listings([el.text for el in titles[:n_listings]], [el.text for el in prices[:n_listings]],
+                          desc_texts, bed_baths, district)
+    return rows, len(titles)
 
-        time.sleep(1)
 
-    driver.quit()
-    df = pd.DataFrame(property_details)
+def extract_listings_script(driver, district):
+    """The same lookups run inside the page by one execute_script call; its JSON is parsed here."""
+    page = json.loads(driver.execute_script(EXTRACT_LISTINGS_JS))
+    rows = parse_listings(page["titles"], page["prices"], page["descs"], page["bed_baths"], district)
+    return rows, len(page["titles"])
+
+
+EXTRACTORS = {"xpath": extract_listings_xpath, "script": extract_listings_script}
+
+
+def extract_listings(driver, district, extraction="xpath"):
+    """Listings on the loaded search page, as (rows, number of listing cards)."""
+    return EXTRACTORS[extraction](driver, district)
+
+
+def save_scraped(rows, out_path):
+    df = pd.DataFrame(rows, columns=PROPERTY_COLUMNS)
     df["scraped_date"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    #save
-    SCRAPED_PATH = 'data/raw_data1.csv'
-    df.to_csv(SCRAPED_PATH, index=False)
-    print(f"✅ Scraped {len(df)} rows and saved to {SCRAPED_PATH}")
-        
+    df.to_csv(out_path, index=False)
+    print(f"✅ Scraped {len(df)} rows and saved to {out_path}")
+    return df
+
+
+def read_page(driver, district, page, base_url=EDGEPROP_URL, extraction="xpath", profile="default",
+              timeout=10, limiter=None):
+    """
+    Load and extract one search page, optionally inside a HostLimiter slot.
+    Returns (rows, number of listing cards, timing row for PAGE_TIMING_COLUMNS).
+    """
+    url = search_url(district, page, base_url)
+    started = time.perf_counter()
+    with limiter.slot(url) if limiter is not None else nullcontext():
+        loading = time.perf_counter()
+        found = load_search_page(driver, url, timeout, 0.05 if profile == "lean" else 0.5)
+    loaded = time.perf_counter()
+    rows, n_cards = extract_listings(driver, district, extraction) if found else ([], 0)
+    extracted = time.perf_counter()
+    transferred = page_bytes(driver) or {}
+    return rows, n_cards, {
+        "district": district, "page": page, "url": url, "status": "ok" if found else "empty",
+        "wait_s": round(loading - started, 4), "load_s": round(loaded - loading, 4),
+        "extract_s": round(extracted - loaded, 4), "listings": len(rows),
+        "document_bytes": transferred.get("document"), "resource_bytes": transferred.get("resources"),
+        "resources": transferred.get("count"),
+    }
+
+
+def save_timings(timings, out_path):
+    """Per-URL timings next to the scraped CSV: data/raw_data1.csv -> data/raw_data1_timings.csv."""
+    timings_path = os.path.splitext(out_path)[0] + "_timings.csv"
+    df = pd.DataFrame(timings, columns=PAGE_TIMING_COLUMNS)
+    df.to_csv(timings_path, index=False)
+    ok = df[df["status"] != "failed"]
+    print(f"✅ Page timings saved to {timings_path}: load {ok['load_s'].sum():.1f}s, "
+          f"extract {ok['extract_s'].sum():.1f}s, waiting on politeness {ok['wait_s'].sum():.1f}s, "
+          f"{(ok['document_bytes'].sum() + ok['resource_bytes'].sum()) / 1e6:.1f} MB transferred")
     return df
+
+
+def scrape_edgeprop_properties(base_url=EDGEPROP_URL, out_path=SCRAPED_PATH, extraction="xpath", profile="default"):
+    driver = new_driver(profile, debugging_port=9222)
+
+    rows = []
+    timings = []
+    for district in DISTRICTS:
+        try:
+            page_rows, _, timing = read_page(driver, district, 1, base_url, extraction, profile)
+        except Exception:
+            timings.append({"district": district, "page": 1, "url": search_url(district, 1, base_url),
+                            "status": "failed", "attempts": 1})
+            continue
+        timings.append({**timing, "attempts": 1})
+        if timing["status"] == "empty":
+            continue
+        rows.extend(page_rows)
+
+        time.sleep(1)
+
+    driver.quit()
+    save_timings(timings, out_path)
+    return save_scraped(rows, out_path)
+
+
+class HostLimiter:
+    """
+    Per-host politeness shared by all drivers: at most max_concurrent page loads
+    in flight per host, and page loads start at least min_interval seconds apart.
+    """
+
+    def __init__(self, max_concurrent=2, min_interval=1.0):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_start = {}
+
+    @contextmanager
+    def slot(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            slots = self._slots.setdefault(host, threading.BoundedSemaphore(self.max_concurrent))
+        slots.acquire()
+        try:
+            with self._lock:
+                start = max(time.monotonic(), self._next_start.get(host, 0.0))
+                self._next_start[host] = start + self.min_interval
+            time.sleep(max(0.0, start - time.monotonic()))
+            yield
+        finally:
+            slots.release()
+
+
+MANIFEST_NAME = "manifest.json"
+
+
+def checkpoint_file(checkpoint_dir, district, page):
+    return os.path.join(checkpoint_dir, f"{DISTRICTS[district]}_{page:03d}.json")
+
+
+def write_json(path, payload):
+    """Write via a temp file and rename, so a crash never leaves half a checkpoint."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+def save_checkpoint(checkpoint_dir, district, page, rows, n_cards):
+    write_json(checkpoint_file(checkpoint_dir, district, page),
+               {"district": district, "page": page, "n_cards": n_cards, "rows": rows,
+                "scraped_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")})
+
+
+def load_checkpoints(checkpoint_dir, districts, max_pages=50):
+    """
+    Pages already read, {(district, page): (rows, n_cards)}, and the
+    (district, page) queue still to fetch. A district resumes after its last
+    consecutive checkpointed page, and is done once that page was short or
+    max_pages was reached.
+    """
+    results = {}
+    todo = []
+    for district in districts:
+        page = 1
+        while os.path.exists(checkpoint_file(checkpoint_dir, district, page)):
+            with open(checkpoint_file(checkpoint_dir, district, page)) as f:
+                checkpoint = json.load(f)
+            results[(district, page)] = (checkpoint["rows"], checkpoint["n_cards"])
+            if checkpoint["n_cards"] < PAGE_SIZE or page >= max_pages:
+                page = None
+                break
+            page += 1
+        if page is not None:
+            todo.append((district, page))
+    return results, todo
+
+
+def read_manifest(checkpoint_dir):
+    """The completion manifest of a checkpointed scrape, or None if it has not finished once."""
+    path = os.path.join(checkpoint_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def prune_checkpoints(checkpoint_root, keep=7):
+    """Drop all but the newest `keep` run directories under checkpoint_root."""
+    if not os.path.isdir(checkpoint_root):
+        return
+    runs = sorted(entry.path for entry in os.scandir(checkpoint_root) if entry.is_dir())
+    for path in runs[:-keep] if keep else runs:
+        shutil.rmtree(path)
+
+
+def scrape_edgeprop_parallel(n_drivers=4, max_pages=50, base_url=EDGEPROP_URL, out_path=SCRAPED_PATH,
+                             host_max_concurrent=2, host_min_interval=0.5, page_timeout=10, retries=1,
+                             extraction="xpath", profile="default", districts=None, make_driver=None,
+                             checkpoint_dir=None, force_refresh=False):
+    """
+    Same output as scrape_edgeprop_properties, but n_drivers browsers work
+    through a shared (district, page) queue, and every page of a district is
+    read: a full page (PAGE_SIZE listings) queues the next one, up to max_pages.
+    Page loads go through one HostLimiter (host_max_concurrent, host_min_interval).
+    A page whose load fails or times out is retried `retries` times, then
+    skipped with a warning; only a page showing EdgeProp's no-results message
+    counts as empty. Rows come out in district order, then page order, whatever order
+    the pages finished in. `extraction` picks an EXTRACTORS entry: "xpath"
+    (a WebDriver round trip per element) or "script" (one execute_script per page).
+
+    Each driver keeps one browser session for all its pages, so connections
+    and cached static files carry over; a session that dies is replaced.
+    `profile="lean"` blocks images, fonts and stylesheets and loads pages
+    eagerly (see new_driver). Per-page timings and bytes go to
+    <out_path stem>_timings.csv.
+
+    With a checkpoint_dir, every page read is saved there as it finishes, and
+    a run picks up from what is already saved (load_checkpoints), so a retry
+    only fetches the pages still missing. At the end a manifest.json records
+    whether every district was read through (read_manifest); a complete run
+    is then rebuilt from its checkpoints without starting a browser.
+    force_refresh deletes the checkpoints first and reads everything again.
+    """
+    districts = list(districts or DISTRICTS)
+    make_driver = make_driver or (lambda: new_driver(profile))
+    limiter = HostLimiter(host_max_concurrent, host_min_interval)
+
+    results = {}
+    todo = [(district, 1) for district in districts]
+    if checkpoint_dir is not None:
+        if force_refresh and os.path.isdir(checkpoint_dir):
+            shutil.rmtree(checkpoint_dir)
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        results, todo = load_checkpoints(checkpoint_dir, districts, max_pages)
+        if results:
+            print(f"✅ Resuming from {len(results)} checkpointed pages in {checkpoint_dir}, {len(todo)} districts left")
+
+    resumed = len(results)
+    work = queue.Queue()
+    for item in todo:
+        work.put(item)
+    timings = []
+    failed = []
+    done = threading.Event()
+    drivers = []
+
+    def scrape_page(slot, district, page):
+        for attempt in range(1, retries + 2):
+            try:
+                rows, n_cards, timing = read_page(drivers[slot], district, page, base_url, extraction, profile,
+                                                  page_timeout, limiter)
+                timings.append({**timing, "attempts": attempt})
+                return rows, n_cards
+            except Exception as e:
+                if isinstance(e, InvalidSessionIdException):
+                    print(f"⚠️ Browser session {slot} died, starting a new one")
+                    try:
+                        drivers[slot].quit()
+                    except Exception:
+                        pass
+                    drivers[slot] = make_driver()
+                if attempt == retries + 1:
+                    timings.append({"district": district, "page": page, "url": search_url(district, page, base_url),
+                                    "status": "failed", "attempts": attempt})
+                    raise
+                print(f"⚠️ Retrying {district} page {page}: {e}")
+
+    def worker(slot):
+        while not done.is_set():
+            try:
+                district, page = work.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                rows, n_cards = scrape_page(slot, district, page)
+                if checkpoint_dir is not None:
+                    save_checkpoint(checkpoint_dir, district, page, rows, n_cards)
+                results[(district, page)] = (rows, n_cards)
+                if n_cards >= PAGE_SIZE and page < max_pages:
+                    work.put((district, page + 1))
+            except Exception as e:
+                failed.append((district, page))
+                print(f"❌ Skipping {district} page {page}: {e}")
+            finally:
+                work.task_done()
+
+    try:
+        for _ in range(n_drivers if todo else 0):
+            drivers.append(make_driver())
+        threads = [threading.Thread(target=worker, args=(slot,), daemon=True) for slot in range(n_drivers)]
+        for thread in threads:
+            thread.start()
+        work.join()
+        done.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        done.set()
+        for driver in drivers:
+            driver.quit()
+
+    order = {district: i for i, district in enumerate(districts)}
+    rows = [row for key in sorted(results, key=lambda k: (order[k[0]], k[1])) for row in results[key][0]]
+    failed = sorted(failed, key=lambda k: (order[k[0]], k[1]))
+    if failed:
+        print(f"⚠️ {len(failed)} pages failed and were skipped: {failed}")
+    print(f"✅ Read {len(results)} pages, {len(results) - resumed} of them fetched now with {len(drivers)} drivers")
+    if checkpoint_dir is not None:
+        write_json(os.path.join(checkpoint_dir, MANIFEST_NAME), {
+            "complete": not failed, "districts": districts, "pages": len(results), "rows": len(rows),
+            "failed": failed, "finished_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        })
+    save_timings(sorted(timings, key=lambda t: (order[t["district"]], t["page"])), out_path)
+    return save_scraped(rows, out_path)
@@ -0,0 +1,17 @@
+CREATE TABLE IF NOT EXISTS predictions (
+  housing_id INT NOT NULL,
+  model_version VARCHAR(32) NOT NULL,
+  predicted_price DOUBLE NOT NULL,
+  scored_at DATETIME NOT NULL,
+  PRIMARY KEY (housing_id, model_version)
+);
+
+CREATE TABLE IF NOT EXISTS prediction_chunks (
+  model_version VARCHAR(32) NOT NULL,
+  first_id INT NOT NULL,
+  last_id INT NOT NULL,
+  scored INT NOT NULL,
+  skipped INT NOT NULL,
+  completed_at DATETIME NOT NULL,
+  PRIMARY KEY (model_version, first_id)
+);
@@ -0,0 +1,67 @@
+# input_segments.py
+"""
+Incremental loader for the API's input log (api/input_logger.py).
+
+The API writes logged prediction inputs as Parquet segments into input_log/
+and renames each one into place once it is closed. Every segment is loaded into
+input_data at most once: the segment name is recorded in input_log_segments in
+the same transaction as its rows, so a rerun only picks up new segments and a
+failed load is retried as a whole.
+"""
+import glob
+import os
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import text
+
+SEGMENT_DIR = os.environ.get("INPUT_LOG_DIR", os.path.join(os.path.dirname(__file__), "input_log"))
+
+LEDGER_DDL = """
+CREATE TABLE IF NOT EXISTS input_log_segments (
+  segment VARCHAR(255) PRIMARY KEY,
+  n_rows INT NOT NULL,
+  loaded_at DATETIME NOT NULL
+)
+"""
+
+
+def closed_segments(segment_dir=SEGMENT_DIR):
+    """Names of closed segments, oldest first (segments still being written end in .open)."""
+    return sorted(os.path.basename(path) for path in glob.glob(os.path.join(segment_dir, "input-*.parquet")))
+
+
+def loaded_segments(engine):
+    with engine.begin() as conn:
+        conn.execute(text(LEDGER_DDL))
+        return {row[0] for row in conn.execute(text("SELECT segment FROM input_log_segments"))}
+
+
+def ingest(engine, name, df):
+    """Append df to input_data and record name in the ledger, in one transaction."""
+    with engine.begin() as conn:
+        df.to_sql("input_data", con=conn, if_exists="append", index=False, chunksize=1000)
+        conn.execute(text("INSERT INTO input_log_segments (segment, n_rows, loaded_at) VALUES (:segment, :n_rows, :loaded_at)"),
+                     {"segment": name, "n_rows": len(df), "loaded_at": datetime.now()})
+
+
+def load_new_segments(engine, segment_dir=SEGMENT_DIR):
+    """Load every closed segment not loaded before. Returns (segment names loaded, rows loaded)."""
+    done = loaded_segments(engine)
+    new = [name for name in closed_segments(segment_dir) if name not in done]
+    rows = 0
+    for name in new:
+        df = pd.read_parquet(os.path.join(segment_dir, name))
+        ingest(engine, name, df)
+        rows += len(df)
+    return new, rows
+
+
+def load_csv_once(engine, path):
+    """Load a legacy input CSV (e.g. user_input_data.csv) through the same ledger, so only once."""
+    name = os.path.basename(path)
+    if not os.path.exists(path) or name in loaded_segments(engine):
+        return 0
+    df = pd.read_csv(path)
+    ingest(engine, name, df)
+    return len(df)
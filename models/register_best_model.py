@@ -130,3 +130,73 @@ print(results.head())
 
 # Optional: Save to CSV
 results.to_csv("predicted_test_only.csv", index=False)
+
+
+# ------------------- STEP 5: Compile the promoted model for CPU serving -------------------
+# The API loads "compiled/" from the run and prefers it over the booster (api/compiled_model.py)
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(BASE_DIR, "../api"))
+from artifacts import native_booster
+from compiled_model import compile_booster, generate_c, load_compiled
+
+PARITY_TOLERANCE = 1e-6  # absolute, in price units
+
+
+def seconds_per_call(predict, X, repeat):
+    for _ in range(10):
+        predict(X)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        predict(X)
+    return (time.perf_counter() - start) / repeat
+
+
+def unsupported_reason(booster):
+    """Why the compiler can't handle this booster (objective, split or tree type), or None."""
+    try:
+        generate_c(booster)
+    except NotImplementedError as e:
+        return str(e)
+    return None
+
+
+booster = native_booster(model)
+reason = unsupported_reason(booster) if booster is not None else None
+if booster is None:
+    print("⚠️ Promoted model is not a LightGBM model; skipping compilation.")
+elif reason is not None:
+    # The version is already registered and in Production; the API serves it from the booster
+    print(f"⚠️ {reason}; skipping compilation, the API will serve the booster.")
+else:
+    with tempfile.TemporaryDirectory() as tmp:
+        compiled_dir = compile_booster(booster, os.path.join(tmp, "compiled"))
+        compiled = load_compiled(compiled_dir, booster)
+        if compiled is None:
+            raise RuntimeError("Compiled model could not be loaded")
+
+        # Parity against the pyfunc predictions on the test split
+        X_test_matrix = np.ascontiguousarray(X_test_scaled, dtype=np.float64)
+        parity = float(np.max(np.abs(compiled.predict(X_test_matrix) - preds)))
+        if parity > PARITY_TOLERANCE:
+            raise RuntimeError(f"Compiled model differs from the pyfunc model by {parity} on the test split")
+
+        latency = {}
+        for label, X_bench, repeat in (("single", X_test_matrix[:1], 2000), ("test_split", X_test_matrix, 50)):
+            latency[f"booster_{label}_us"] = seconds_per_call(booster.predict, X_bench, repeat) * 1e6
+            latency[f"compiled_{label}_us"] = seconds_per_call(compiled.predict, X_bench, repeat) * 1e6
+
+        client.log_artifacts(run_id, compiled_dir, "compiled")
+
+    client.set_model_version_tag(MODEL_NAME, version, "compiled", "true")
+    client.set_model_version_tag(MODEL_NAME, version, "compiled_parity_max_abs_diff", f"{parity:.3g}")
+    for name, value in latency.items():
+        client.set_model_version_tag(MODEL_NAME, version, name, f"{value:.1f}")
+
+    print(f"✅ Compiled model logged to run {run_id} (max |diff| on {len(preds)} test rows: {parity:.3g})")
+    for label in ("single", "test_split"):
+        booster_us, compiled_us = latency[f"booster_{label}_us"], latency[f"compiled_{label}_us"]
+        print(f"   {label}: booster {booster_us:.1f} us, compiled {compiled_us:.1f} us "
+              f"({booster_us / compiled_us:.1f}x)")